@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+import os
+import json
+import hashlib
+import shutil
+
+# ===================== 路径配置 =====================
+# 数据文件目录，可用环境变量 DIANGONGBEI_DATA_DIR 修改；找不到时再在当前工作目录中查找
+DATA_DIR = os.environ.get('DIANGONGBEI_DATA_DIR', 'C:/Users/HP/Desktop')
+
+# 二进制缓存目录，可用环境变量 DIANGONGBEI_CACHE_DIR 修改
+CACHE_DIR = os.environ.get('DIANGONGBEI_CACHE_DIR',
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data_cache'))
+
+# 缓存格式版本，缓存内容的生成规则改变时加1，旧版本的缓存会自动重建
+CACHE_VERSION = 2
+
+
+def resolve_path(filename, data_dir=None):
+    """
+    查找数据文件：依次在 data_dir、DATA_DIR 和当前工作目录中查找
+    :param filename: 文件名（如 '问题一数据.xlsx'），也可直接给出完整路径
+    :return: 文件的完整路径
+    """
+    if os.path.isabs(filename) and os.path.exists(filename):
+        return filename
+    for directory in [data_dir, DATA_DIR, os.getcwd()]:
+        if directory and os.path.exists(os.path.join(directory, filename)):
+            return os.path.join(directory, filename)
+    raise FileNotFoundError(f"找不到数据文件 {filename}，请设置 DIANGONGBEI_DATA_DIR 或传入 data_dir")
+
+
+# ===================== 二进制缓存 =====================
+def _file_hash(path):
+    """计算文件内容的SHA1（修改时间变化时用来判断内容是否真的改变）"""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def _cache_folder(path, sheet_name):
+    """每个数据文件的每个工作表对应一个缓存目录"""
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{sheet_name}".encode('utf-8')).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{stem}_{key}")
+
+
+def _cache_is_valid(meta_path, path, stat):
+    """
+    判断缓存是否可用：缓存格式版本不同时重建；修改时间和大小一致直接使用；
+    修改时间变化但内容哈希一致（如文件被复制）时更新记录后继续使用
+    """
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != CACHE_VERSION:
+        return False
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return True
+    if meta['size'] == stat.st_size and meta['sha1'] == _file_hash(path):
+        meta['mtime_ns'] = stat.st_mtime_ns
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        return True
+    return False
+
+
+def _build_cache(path, sheet_name, folder, stat):
+    """解析一次Excel工作表，将全部数值列分别保存为 .npy 文件"""
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    os.makedirs(folder, exist_ok=True)
+
+    columns = []
+    for col in df.columns:
+        # 日期列经 to_numeric 会变成纳秒整数而被误当作数值列，需按类型显式跳过
+        if pd.api.types.is_datetime64_any_dtype(df[col]) or pd.api.types.is_timedelta64_dtype(df[col]):
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        if values.isna().all():  # 跳过时刻、文本等无法转换为数值的列
+            continue
+        np.save(os.path.join(folder, f"col{len(columns)}.npy"), values.values.astype(float))
+        columns.append(str(col))
+
+    meta = {'version': CACHE_VERSION, 'source': os.path.abspath(path), 'sheet_name': sheet_name, 'columns': columns,
+            'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': _file_hash(path)}
+    # 元数据最后写入，保证中途中断时不会留下不完整的缓存
+    with open(os.path.join(folder, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def load_columns(filename, columns=None, sheet_name='Sheet1', data_dir=None):
+    """
+    读取Excel数据文件的数值列（每个文件只解析一次，之后直接读取内存映射的 .npy 缓存）
+    :param filename: 文件名（如 '问题一数据.xlsx'）或完整路径
+    :param columns: 需要的列名列表，默认返回全部数值列
+    :param sheet_name: 工作表名
+    :param data_dir: 数据目录，默认使用 DATA_DIR
+    :return: {列名: 只读内存映射数组}
+    """
+    path = resolve_path(filename, data_dir)
+    stat = os.stat(path)
+    folder = _cache_folder(path, sheet_name)
+    meta_path = os.path.join(folder, 'meta.json')
+
+    if not _cache_is_valid(meta_path, path, stat):
+        _build_cache(path, sheet_name, folder, stat)
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        cached_columns = json.load(f)['columns']
+    if columns is None:
+        columns = cached_columns
+
+    data = {}
+    for col in columns:
+        if col not in cached_columns:
+            raise KeyError(f"{filename} 中没有数值列 {col}")
+        data[col] = np.load(os.path.join(folder, f"col{cached_columns.index(col)}.npy"), mmap_mode='r')
+    return data
+
+
+def load_column(filename, column, sheet_name='Sheet1', data_dir=None):
+    """读取单个数值列，返回只读内存映射数组"""
+    return load_columns(filename, [column], sheet_name, data_dir)[column]
+
+
+def clear_cache():
+    """删除全部缓存文件"""
+    if os.path.exists(CACHE_DIR):
+        shutil.rmtree(CACHE_DIR)
+
+
+# ===================== 常用数据 =====================
+def load_demand_pu():
+    """问题一数据：负荷功率（标幺值）"""
+    return load_column('问题一数据.xlsx', '负荷功率(p.u.)')
+
+
+def load_wind_pu(question):
+    """
+    风电功率（标幺值）
+    :param question: 数据所属问题，'二'、'三' 或 '五'，对应 问题二数据.xlsx 等
+    """
+    return load_column(f'问题{question}数据.xlsx', '风电功率(p.u.)')
+
+
+def load_attachment2():
+    """附件2：15天负荷与风电功率（MW），一次解析同时得到两列"""
+    data = load_columns('附件2.xlsx', ['负荷功率(MW)', '风电功率(MW)'])
+    return data['负荷功率(MW)'], data['风电功率(MW)']
\ No newline at end of file
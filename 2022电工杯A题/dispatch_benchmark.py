@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+import importlib.util
+import tracemalloc
+import platform
+import random
+import json
+import time
+import os
+
+# ===================== 路径配置 =====================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 被测算法所在脚本（按文件路径导入，脚本名以数字开头不能直接 import）
+FIRST_QUESTION_SCRIPT = os.path.join(BASE_DIR, '第一问', '2022电工杯A题第一问.py')
+PSO_SCRIPT = os.path.join(os.path.dirname(BASE_DIR), '优化算法学习', 'PSO算法', '3.2', '2022电工杯A题第一问_PSO.py')
+# 测试结果按行追加保存（JSON Lines），便于长期跟踪性能变化
+RESULT_FILE = 'dispatch_benchmark_results.jsonl'
+
+
+def load_script(name, path):
+    """按文件路径导入脚本（只执行模块级定义，不运行 main）"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ===================== 测试数据生成 =====================
+def load_units_data():
+    """加载机组参数数据（包含碳排放强度）"""
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72},
+        {'name': '机组2', 'P_max': 300, 'P_min': 90, 'a': 0.588, 'b': 65.12, 'c': 451.32, 'emission': 0.75},
+        {'name': '机组3', 'P_max': 150, 'P_min': 45, 'a': 0.785, 'b': 139.6, 'c': 1049.50, 'emission': 0.79}
+    ]
+
+
+def make_synthetic_units(num_units, seed=0):
+    """
+    生成测试用机组：不超过3台时直接使用题目机组，否则以题目三台机组为模板随机扰动参数
+    :param num_units: 机组数量
+    :param seed: 随机种子
+    :return: 机组字典列表
+    """
+    base = load_units_data()
+    if num_units <= len(base):
+        return base[:num_units]
+
+    rng = np.random.default_rng(seed)
+    template = rng.integers(0, len(base), num_units)
+    scale = rng.uniform(0.8, 1.2, (num_units, 4))
+    units = []
+    for i in range(num_units):
+        unit = base[template[i]]
+        P_max = unit['P_max'] * scale[i, 0]
+        units.append({
+            'name': f'机组{i + 1}',
+            'P_max': P_max,
+            'P_min': P_max * unit['P_min'] / unit['P_max'],
+            'a': unit['a'] * scale[i, 1],
+            'b': unit['b'] * scale[i, 2],
+            'c': unit['c'] * scale[i, 3],
+            'emission': unit['emission']
+        })
+    return units
+
+
+def make_synthetic_loads(units, num_periods, seed=0):
+    """
+    生成测试用负荷曲线：日周期正弦叠加随机波动，落在机组总出力范围的 10%~95% 之间
+    :param units: 机组字典列表
+    :param num_periods: 时段数（15分钟一个时段）
+    :return: 负荷数组 (MW)
+    """
+    rng = np.random.default_rng(seed)
+    P_min = sum(u['P_min'] for u in units)
+    P_max = sum(u['P_max'] for u in units)
+    t = np.arange(num_periods)
+    profile = 0.55 + 0.3 * np.sin(2 * np.pi * (t / 96 - 0.3)) + rng.normal(0, 0.03, num_periods)
+    return P_min + (P_max - P_min) * np.clip(profile, 0.1, 0.95)
+
+
+# ===================== 被测算法 =====================
+def build_solvers(first, pso, pso_iter=100, pso_particles=50):
+    """
+    被测算法列表
+    每个算法给出：初始化函数（不计时，如构造机组数组或调度曲线）、
+    求解函数（输入一段负荷返回 (T, 机组数) 出力）、每次调用的时段数（1 表示逐时段求解）、
+    每个时段占用的数组宽度（批量PSO为粒子数，用于控制批量大小）、
+    允许的最大机组数（超过时跳过，避免单个时段就耗时过长）
+    :param first: 第一问脚本模块
+    :param pso: PSO脚本模块
+    """
+    def solve_lambda(loads, fleet):
+        return np.array([first.economic_dispatch(load, fleet) for load in loads])
+
+    def solve_pso(loads, fleet):
+        return np.array([pso.pso_economic_dispatch(load, fleet, max_iter=pso_iter, num_particles=pso_particles)
+                         for load in loads])
+
+    def solve_pso_batch(loads, fleet):
+        return pso.pso_economic_dispatch_batch(loads, fleet, max_iter=pso_iter, num_particles=pso_particles,
+                                               seed=random.getrandbits(32))
+
+    def solve_pso_repair(loads, fleet):
+        return pso.pso_economic_dispatch_batch(loads, fleet, max_iter=30, num_particles=20,
+                                               seed=random.getrandbits(32), repair=True)
+
+    def solve_pso_sequential(loads, fleet):
+        return pso.pso_economic_dispatch_sequential(loads, fleet, max_iter=pso_iter, num_particles=pso_particles,
+                                                    seed=random.getrandbits(32))[0]
+
+    def solve_batch(loads, fleet):
+        return first.economic_dispatch_batch(loads, fleet)
+
+    def solve_curve(loads, curve):
+        return curve.dispatch(loads)
+
+    return [
+        {'name': 'lambda_iteration', 'setup': first.as_fleet, 'solve': solve_lambda, 'chunk': 1, 'width': 1,
+         'max_units': None},
+        {'name': 'pso', 'setup': pso.as_fleet, 'solve': solve_pso, 'chunk': 1, 'width': 1, 'max_units': 100},
+        {'name': 'pso_batch', 'setup': pso.as_fleet, 'solve': solve_pso_batch, 'chunk': None,
+         'width': pso_particles, 'max_units': 1000},
+        {'name': 'pso_repair', 'setup': pso.as_fleet, 'solve': solve_pso_repair, 'chunk': None, 'width': 20,
+         'max_units': 1000},
+        {'name': 'pso_sequential', 'setup': pso.as_fleet, 'solve': solve_pso_sequential, 'chunk': 96, 'width': 1,
+         'max_units': 100},
+        {'name': 'lambda_batch', 'setup': first.as_fleet, 'solve': solve_batch, 'chunk': None, 'width': 1,
+         'max_units': None},
+        {'name': 'dispatch_curve', 'setup': lambda units: first.DispatchCurve(first.as_fleet(units)),
+         'solve': solve_curve, 'chunk': None, 'width': 1, 'max_units': None}
+    ]
+
+
+# ===================== 基准测试 =====================
+def dispatch_cost(P, fleet):
+    """各时段火电运行成本之和（元），与第一问相同：1.5 倍煤耗成本"""
+    F_hourly = fleet.a * P ** 2 + fleet.b * P + fleet.c
+    return np.sum(F_hourly) * 0.25 * 0.7 * 1.5
+
+
+def chunk_bounds(num_periods, chunk):
+    """按每次调用的时段数切分整个时段，返回 [(起点, 终点)]"""
+    starts = range(0, num_periods, chunk)
+    return [(s, min(s + chunk, num_periods)) for s in starts]
+
+
+def run_solver(solver, units, loads, reference, max_cells=2_000_000, time_budget=2.0):
+    """
+    对单个算法计时并统计精度
+    批量算法每次调用处理的时段数受 max_cells（时段数×数组宽度×机组数）限制，以控制内存；
+    总耗时超过 time_budget 秒后停止，按已完成的时段数计算每秒处理时段数
+    :param solver: build_solvers() 中的一项
+    :param units: 机组字典列表
+    :param loads: 负荷数组 (MW)
+    :param reference: 第一问脚本模块（提供解析最优解的调度曲线）
+    :return: 结果字典
+    """
+    num_units = len(units)
+    result = {'solver': solver['name'], 'num_units': num_units, 'num_periods': len(loads)}
+    if solver['max_units'] is not None and num_units > solver['max_units']:
+        result.update({'status': 'skipped', 'periods_evaluated': 0})
+        return result
+
+    start = time.perf_counter()
+    model = solver['setup'](units)
+    result['setup_seconds'] = time.perf_counter() - start
+
+    chunk = solver['chunk'] or max(1, max_cells // (num_units * solver['width']))
+    bounds = chunk_bounds(len(loads), chunk)
+
+    # 计时：逐块求解直到完成或超出时间预算，只累计成本和功率偏差，不保存整个出力矩阵
+    fleet = reference.as_fleet(units)
+    curve = reference.DispatchCurve(fleet)
+    cost, optimal_cost, imbalance, done, elapsed = 0.0, 0.0, 0.0, 0, 0.0
+    for s, e in bounds:
+        start = time.perf_counter()
+        P = solver['solve'](loads[s:e], model)
+        elapsed += time.perf_counter() - start
+
+        cost += dispatch_cost(P, fleet)
+        optimal_cost += dispatch_cost(curve.dispatch(loads[s:e]), fleet)
+        imbalance = max(imbalance, float(np.max(np.abs(P.sum(axis=1) - loads[s:e]))))
+        done = e
+        if elapsed > time_budget:
+            break
+
+    # 峰值内存：单独对第一块再求解一次（tracemalloc 会拖慢计时，因此不与计时同时进行）
+    s, e = bounds[0]
+    tracemalloc.start()
+    solver['solve'](loads[s:e], model)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result.update({
+        'status': 'ok' if done == len(loads) else 'partial',
+        'periods_evaluated': done,
+        'seconds': elapsed,
+        'periods_per_second': done / elapsed if elapsed > 0 else float('inf'),
+        'peak_memory_mb': peak / 2 ** 20,
+        'cost': cost,
+        'optimal_cost': optimal_cost,
+        'cost_gap': (cost - optimal_cost) / optimal_cost,
+        'max_imbalance_mw': imbalance
+    })
+    return result
+
+
+def run_benchmark(unit_counts, period_counts, time_budget=2.0, max_cells=2_000_000, seed=2022,
+                  pso_iter=100, pso_particles=50):
+    """
+    对全部算法、机组规模和时段数的组合运行基准测试
+    :param unit_counts: 机组数量列表
+    :param period_counts: 时段数列表（96为一天，35040为一年）
+    :param time_budget: 每个组合的计时预算（秒）
+    :param max_cells: 批量算法每次调用的最大 时段数×数组宽度×机组数
+    :param seed: 随机种子（机组参数、负荷和PSO均由其确定）
+    :return: 结果 DataFrame
+    """
+    first = load_script('first_question', FIRST_QUESTION_SCRIPT)
+    pso = load_script('first_question_pso', PSO_SCRIPT)
+    solvers = build_solvers(first, pso, pso_iter, pso_particles)
+
+    rows = []
+    for num_units in unit_counts:
+        units = make_synthetic_units(num_units, seed)
+        for num_periods in period_counts:
+            loads = make_synthetic_loads(units, num_periods, seed)
+            for solver in solvers:
+                random.seed(seed)  # PSO使用标准库 random
+                row = run_solver(solver, units, loads, first, max_cells, time_budget)
+                rows.append(row)
+                if row['status'] == 'skipped':
+                    print(f"{solver['name']:>16s} | 机组 {num_units:5d} | 时段 {num_periods:6d} | 跳过")
+                else:
+                    print(f"{solver['name']:>16s} | 机组 {num_units:5d} | 时段 {num_periods:6d} | "
+                          f"{row['periods_per_second']:12.1f} 时段/秒 | 峰值内存 {row['peak_memory_mb']:8.2f} MB | "
+                          f"成本偏差 {row['cost_gap']:.2e} | 最大功率偏差 {row['max_imbalance_mw']:.2e} MW")
+    return pd.DataFrame(rows)
+
+
+def save_results(results, path=RESULT_FILE):
+    """将本次结果连同运行环境追加写入 JSON Lines 文件，每个测试组合一行"""
+    run = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor()
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in results.to_dict(orient='records'):
+            record = {k: v for k, v in record.items() if not (isinstance(v, float) and np.isnan(v))}
+            f.write(json.dumps({**run, **record}, ensure_ascii=False) + '\n')
+
+
+# ===================== 主程序 =====================
+def main():
+    # 机组规模 3~5000 台，时段数 1天(96)、15天(1440)、1年(35040)
+    unit_counts = [3, 30, 100, 1000, 5000]
+    period_counts = [96, 1440, 35040]
+
+    results = run_benchmark(unit_counts, period_counts)
+    save_results(results)
+    print(f"\n测试结果已追加保存到: {RESULT_FILE}")
+
+    # 各算法在各规模下的每秒处理时段数
+    table = results[results['status'] != 'skipped'].pivot_table(
+        index=['num_units', 'num_periods'], columns='solver', values='periods_per_second')
+    print("\n每秒处理时段数：")
+    print(table.to_string(float_format=lambda x: f"{x:.1f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
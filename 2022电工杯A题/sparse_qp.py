@@ -0,0 +1,89 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+
+# ===================== 稀疏二次规划求解 =====================
+def _max_step(v, dv):
+    """保持 v + α·dv ≥ 0 的最大步长 α（不超过1）"""
+    negative = dv < 0
+    if not negative.any():
+        return 1.0
+    return min(1.0, float(np.min(-v[negative] / dv[negative])))
+
+
+def solve_sparse_qp(q, c, A, b, G, h, x0=None, max_iter=100, tol=1e-7):
+    """
+    求解二次项为对角阵的稀疏凸二次规划（原始-对偶内点法，Mehrotra预测-校正）
+    min ½·xᵀ·diag(q)·x + cᵀx   s.t.  A x = b,  G x ≤ h
+    每次迭代对降阶KKT矩阵做一次稀疏LU分解，变量按时间顺序排列时KKT矩阵为带状，
+    计算量随时段数线性增长
+    :param q: 二次项系数（非负）
+    :param c: 一次项系数
+    :param A: 等式约束稀疏矩阵
+    :param b: 等式约束右端项
+    :param G: 不等式约束稀疏矩阵
+    :param h: 不等式约束右端项
+    :param x0: 初始点，默认为全0
+    :param max_iter: 最大迭代次数
+    :param tol: 收敛精度（残差相对于问题数据的量级）
+    :return: 最优解 x
+    :raises RuntimeError: 迭代 max_iter 次仍未收敛（通常说明问题无可行解）
+    """
+    A, G = sparse.csr_matrix(A), sparse.csr_matrix(G)
+    A_T, G_T = A.T.tocsr(), G.T.tocsr()
+    Q = sparse.diags(q)
+    N = len(c)
+
+    # 初始点：松弛变量和对偶变量取正值
+    x = np.zeros(N) if x0 is None else np.array(x0, dtype=float)
+    y = np.zeros(A.shape[0])
+    s = np.maximum(h - G @ x, 1.0)
+    z = np.ones(G.shape[0])
+    scale = 1 + max(np.abs(c).max(), np.abs(b).max(), np.abs(h).max())
+
+    for _ in range(max_iter):
+        r_dual = q * x + c + A_T @ y + G_T @ z
+        r_prim = A @ x - b
+        r_slack = G @ x + s - h
+        mu = s @ z / len(s)
+        residual = max(np.abs(r_dual).max(), np.abs(r_prim).max(), np.abs(r_slack).max())
+        if residual < tol * scale and mu < tol:
+            break
+
+        # 消去 s、z 后的降阶KKT系统：[[Q + Gᵀ W G, Aᵀ], [A, 0]]
+        W = z / s
+        H = Q + G_T @ sparse.diags(W) @ G
+        lu = splu(sparse.bmat([[H, A_T], [A, None]], format='csc'))
+
+        def newton_step(r_comp):
+            rhs = np.concatenate([-r_dual - G_T @ (W * r_slack - r_comp / s), -r_prim])
+            sol = lu.solve(rhs)
+            dx, dy = sol[:N], sol[N:]
+            dz = W * (G @ dx + r_slack) - r_comp / s
+            ds = -(r_comp + s * dz) / z
+            return dx, dy, dz, ds
+
+        # 预测步（仿射方向），由其效果确定中心化参数
+        dx, dy, dz, ds = newton_step(s * z)
+        alpha = min(_max_step(s, ds), _max_step(z, dz))
+        mu_aff = (s + alpha * ds) @ (z + alpha * dz) / len(s)
+        sigma = (mu_aff / mu) ** 3
+
+        # 校正步
+        dx, dy, dz, ds = newton_step(s * z + ds * dz - sigma * mu)
+        alpha = min(1.0, 0.99 * min(_max_step(s, ds), _max_step(z, dz)))
+        x += alpha * dx
+        y += alpha * dy
+        z += alpha * dz
+        s += alpha * ds
+    else:
+        r_dual = q * x + c + A_T @ y + G_T @ z
+        r_prim = A @ x - b
+        r_slack = G @ x + s - h
+        mu = s @ z / len(s)
+        raise RuntimeError(
+            f"二次规划迭代 {max_iter} 次未收敛：原始残差 {np.abs(r_prim).max():.3e}，"
+            f"对偶残差 {np.abs(r_dual).max():.3e}，松弛残差 {np.abs(r_slack).max():.3e}，μ = {mu:.3e}")
+
+    return x
\ No newline at end of file
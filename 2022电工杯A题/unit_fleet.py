@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+
+
+# ===================== 机组群参数 =====================
+class UnitFleet:
+    """
+    机组群参数（按列存放的NumPy数组，适用于数百至数千台机组）
+    各字段与 load_units_data() 中的字典键一一对应：name, P_max, P_min, a, b, c, emission
+    """
+    __slots__ = ('name', 'P_max', 'P_min', 'a', 'b', 'c', 'emission')
+
+    def __init__(self, name, P_max, P_min, a, b, c, emission=None):
+        self.name = np.asarray(name, dtype=object)
+        self.P_max = np.asarray(P_max, dtype=float)
+        self.P_min = np.asarray(P_min, dtype=float)
+        self.a = np.asarray(a, dtype=float)
+        self.b = np.asarray(b, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        # 未给出碳排放强度时按0处理
+        self.emission = np.zeros(len(self.a)) if emission is None else np.asarray(emission, dtype=float)
+
+    @classmethod
+    def from_units(cls, units):
+        """由机组字典列表构建"""
+        return cls(
+            name=[u['name'] for u in units],
+            P_max=[u['P_max'] for u in units],
+            P_min=[u['P_min'] for u in units],
+            a=[u['a'] for u in units],
+            b=[u['b'] for u in units],
+            c=[u['c'] for u in units],
+            emission=[u.get('emission', 0.0) for u in units]
+        )
+
+    @classmethod
+    def from_csv(cls, path):
+        """由CSV文件构建，表头与字典键相同（emission列可省略）"""
+        df = pd.read_csv(path)
+        return cls(
+            name=df['name'].values,
+            P_max=df['P_max'].values,
+            P_min=df['P_min'].values,
+            a=df['a'].values,
+            b=df['b'].values,
+            c=df['c'].values,
+            emission=df['emission'].values if 'emission' in df.columns else None
+        )
+
+    def __len__(self):
+        return len(self.a)
+
+    def subset(self, indices):
+        """按下标或布尔掩码取出部分机组"""
+        return UnitFleet(*(getattr(self, field)[indices] for field in self.__slots__))
+
+    def to_units(self):
+        """转换回机组字典列表（用于输出和绘图）"""
+        units = []
+        for i in range(len(self)):
+            unit = {'name': self.name[i]}
+            for field in self.__slots__[1:]:
+                unit[field] = float(getattr(self, field)[i])
+            units.append(unit)
+        return units
+
+
+def as_fleet(units):
+    """统一输入格式：机组字典列表或 UnitFleet 均转换为 UnitFleet"""
+    if isinstance(units, UnitFleet):
+        return units
+    return UnitFleet.from_units(units)
+
+
+# ===================== 预计算调度曲线 =====================
+class DispatchCurve:
+    """
+    系统等微增率调度曲线（按机组上下限断点预先排序）
+    二次煤耗机组的出力 P_i(λ) = clip((λ - b_i) / (2a_i), P_min, P_max) 是λ的分段线性函数，
+    断点为各机组到达上下限时的λ，因此系统总出力 D(λ) 也是分段线性且单调不减的。
+    构造时计算一次全部断点，之后任一负荷的调度只需一次二分查找加一次线性插值。
+    """
+
+    def __init__(self, units):
+        fleet = as_fleet(units)
+        self.a = fleet.a
+        self.b = fleet.b
+        self.P_min = fleet.P_min
+        self.P_max = fleet.P_max
+
+        # 各机组到达下限和上限时的微增率，合并排序后即为系统断点
+        # 越过下限断点后该机组开始随λ增加出力（斜率 +1/(2a)），越过上限断点后停止增加（斜率 -1/(2a)）
+        lambda_low = self.b + 2 * self.a * self.P_min
+        lambda_high = self.b + 2 * self.a * self.P_max
+        slope_change = np.concatenate([1 / (2 * self.a), -1 / (2 * self.a)])
+        order = np.argsort(np.concatenate([lambda_low, lambda_high]), kind='stable')
+        self.lambdas = np.concatenate([lambda_low, lambda_high])[order]
+
+        # 各断点处的系统总出力：从全部机组最小出力开始按斜率累加
+        slope = np.cumsum(slope_change[order])[:-1]
+        self.outputs = self.P_min.sum() + np.concatenate([[0.0], np.cumsum(slope * np.diff(self.lambdas))])
+
+    def generation(self, lambda_val):
+        """给定λ（标量或数组）计算各机组出力，数组输入返回 (T, 机组数)"""
+        lambda_val = np.asarray(lambda_val, dtype=float)
+        P = (lambda_val[..., None] - self.b) / (2 * self.a)
+        return np.clip(P, self.P_min, self.P_max)
+
+    def lambda_for(self, loads):
+        """二分查找负荷所在区间并线性插值得到系统λ（超出总出力范围时取端点）"""
+        loads = np.asarray(loads, dtype=float)
+        k = np.searchsorted(self.outputs, loads, side='right') - 1
+        k = np.clip(k, 0, len(self.outputs) - 2)
+
+        D_low, D_high = self.outputs[k], self.outputs[k + 1]
+        lam_low, lam_high = self.lambdas[k], self.lambdas[k + 1]
+        span = np.where(D_high > D_low, D_high - D_low, 1.0)
+        ratio = np.clip((loads - D_low) / span, 0, 1)
+        return lam_low + ratio * (lam_high - lam_low)
+
+    def dispatch(self, loads):
+        """
+        计算负荷对应的各机组出力
+        :param loads: 负荷 (MW)，标量或数组
+        :return: 标量输入返回 (机组数,)，数组输入返回 (T, 机组数)
+        """
+        return self.generation(self.lambda_for(loads))
+
+
+# ===================== 等微增率经济调度 =====================
+def calculate_lambda(load, units):
+    """
+    计算初始λ值（不考虑约束）
+    煤耗微增率方程：dF/dP = 2aP + b = λ
+    因此 P_i = (λ - b_i) / (2a_i)
+    约束：ΣP_i = load
+    推导λ的表达式：
+    load = Σ[(λ - b_i)/(2a_i)] = λ * Σ(1/(2a_i)) - Σ(b_i/(2a_i))
+    => λ = (load + Σ(b_i/(2a_i))) / Σ(1/(2a_i))
+    """
+    fleet = as_fleet(units)
+    sum_inv_2a = np.sum(1 / (2 * fleet.a))
+    sum_b_over_2a = np.sum(fleet.b / (2 * fleet.a))
+    return (load + sum_b_over_2a) / sum_inv_2a
+
+
+def update_generation(lambda_val, units):
+    """由λ（标量或数组）计算各机组出力，数组输入返回 (T, 机组数)"""
+    fleet = as_fleet(units)
+    return (np.asarray(lambda_val, dtype=float)[..., None] - fleet.b) / (2 * fleet.a)
+
+
+def economic_dispatch(load, units, max_iter=20, tol=0.01):
+    """单一时刻的经济调度，按批量调度的单时刻特例求解"""
+    return economic_dispatch_batch([load], units, max_iter, tol)[0].tolist()
+
+
+def economic_dispatch_batch(loads, units, max_iter=20, tol=0.01):
+    """
+    整个时段的批量经济调度（等微增率λ迭代：越限机组固定在上下限，剩余负荷由其余机组重算λ）
+    :param loads: 各时刻负荷数组 (MW)，长度为T（96点、1440点或全年15分钟数据均可）
+    :param units: 机组列表或 UnitFleet
+    :return: 各机组出力矩阵 (T, 机组数) 单位：MW
+    """
+    fleet = as_fleet(units)
+    loads = np.asarray(loads, dtype=float)
+    a, b = fleet.a, fleet.b
+    P_min, P_max = fleet.P_min, fleet.P_max
+    inv_2a = 1 / (2 * a)
+    b_over_2a = b / (2 * a)
+
+    T = len(loads)
+    fixed = np.zeros((T, len(fleet)), dtype=bool)  # 各时刻已固定在上下限的机组
+    active = np.ones(T, dtype=bool)  # 仍需迭代的时刻
+
+    # 不考虑约束的初始λ和出力
+    lambda_val = calculate_lambda(loads, fleet)
+    P = update_generation(lambda_val, fleet)
+
+    for _ in range(max_iter):
+        # 只检查仍在迭代且未固定的机组
+        free = active[:, None] & ~fixed
+        below = free & (P < P_min)
+        above = free & (P > P_max)
+        P = np.where(below, P_min, np.where(above, P_max, P))
+        fixed |= below | above
+
+        # 无越限且功率平衡的时刻结束迭代
+        violations = (below | above).any(axis=1)
+        balanced = ~violations & (np.abs(P.sum(axis=1) - loads) < tol)
+        adjustable = ~fixed
+        active &= ~balanced & adjustable.any(axis=1)
+        if not active.any():
+            break
+
+        # 剩余负荷由未固定机组按等微增率重新分配
+        fixed_power = np.where(fixed, P, 0.0).sum(axis=1)
+        remaining_load = np.maximum(loads - fixed_power, 0)
+        sum_inv_2a = np.where(adjustable, inv_2a, 0.0).sum(axis=1)
+        sum_b_over_2a = np.where(adjustable, b_over_2a, 0.0).sum(axis=1)
+        lambda_val = (remaining_load + sum_b_over_2a) / np.where(active, sum_inv_2a, 1.0)
+        P_adjustable = (lambda_val[:, None] - b) / (2 * a)
+        P = np.where(active[:, None] & adjustable, P_adjustable, P)
+
+    return P
+
+
+# ===================== 计及碳捕集成本的发电成本特性 =====================
+def carbon_aware_fleet(units, carbon_price):
+    """
+    将机组煤耗特性换算为计及运维和碳捕集成本的发电成本特性（元/h）
+    成本 = 1.5 × 煤价 × (aP² + bP + c) + 碳排放强度 × P × 碳捕集单价
+    即二次项和常数项按 1.5 × 煤价 缩放，一次项另加 emission × carbon_price
+    :param units: 机组列表或 UnitFleet
+    :param carbon_price: 碳捕集单价（元/吨）
+    :return: 成本系数形式的 UnitFleet
+    """
+    fleet = as_fleet(units)
+    coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
+    k = 1.5 * coal_price  # 煤耗成本 + 0.5倍运行维护成本
+
+    return UnitFleet(
+        name=fleet.name,
+        P_max=fleet.P_max,
+        P_min=fleet.P_min,
+        a=k * fleet.a,
+        b=k * fleet.b + fleet.emission * carbon_price,  # kg/kWh × MW × 元/t = 元/h
+        c=k * fleet.c,
+        emission=fleet.emission
+    )
\ No newline at end of file
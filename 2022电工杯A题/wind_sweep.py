@@ -0,0 +1,212 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+import pandas as pd
+from data_cache import load_demand_pu, load_wind_pu, load_attachment2
+from unit_fleet import as_fleet, DispatchCurve
+
+# 设置中文字体
+font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
+
+
+# ===================== 数据准备 =====================
+def load_units_data():
+    """加载机组参数数据（包含碳排放强度）"""
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72},
+        {'name': '机组2', 'P_max': 300, 'P_min': 90, 'a': 0.588, 'b': 65.12, 'c': 451.32, 'emission': 0.75},
+        {'name': '机组3', 'P_max': 150, 'P_min': 45, 'a': 0.785, 'b': 139.6, 'c': 1049.50, 'emission': 0.79}
+    ]
+
+
+def load_cases():
+    """
+    各问的机组组合与风电数据
+    :return: [(名称, 机组下标, 负荷曲线MW, 风电曲线（标幺值）, 题目中的风电装机容量MW)]
+    """
+    load_demand = load_demand_pu() * 900
+    load_7, wind_7 = load_attachment2()
+    return [
+        ('第二问', [0, 1], load_demand, load_wind_pu('二'), 300),
+        ('第三问', [0, 2], load_demand, load_wind_pu('三'), 600),
+        ('第五问', [0], load_demand, load_wind_pu('五'), 900),
+        ('第七问', [0], np.asarray(load_7), np.asarray(wind_7) / 1200, 1200)
+    ]
+
+
+# ===================== 风电装机容量扫描 =====================
+def wind_capacity_sweep(load_demand, wind_pu, capacities, units, carbon_price=60):
+    """
+    一次计算多个风电装机容量下的弃风、失负荷和成本
+    等效负荷按 (容量数, T) 矩阵一次生成，全部容量和时刻用预计算调度曲线一次调度
+    :param load_demand: 负荷曲线 (MW)，长度T
+    :param wind_pu: 风电曲线（标幺值），长度T
+    :param capacities: 风电装机容量数组 (MW)，可包含数百个容量点
+    :param units: 机组列表或 UnitFleet
+    :param carbon_price: 碳捕集单价（元/吨）
+    :return: DataFrame，每行对应一个装机容量，电量单位MWh，成本单位元
+    """
+    fleet = as_fleet(units)
+    load_demand = np.asarray(load_demand, dtype=float)
+    capacities = np.asarray(capacities, dtype=float)
+    wind_power = capacities[:, None] * np.asarray(wind_pu, dtype=float)  # (容量数, T)
+    equivalent_loads = load_demand - wind_power
+
+    # 弃风和失负荷
+    heavy_loads = np.maximum(fleet.P_min.sum() - equivalent_loads, 0)
+    light_loads = np.maximum(equivalent_loads - fleet.P_max.sum(), 0)
+
+    # 火电调度 (容量数, T, 机组数)，超出总出力范围时机组停在上下限
+    P = DispatchCurve(fleet).dispatch(equivalent_loads)
+    coal_price = 700 / 1000
+    fuel_cost = np.sum((fleet.a * P ** 2 + fleet.b * P + fleet.c) * 0.25, axis=(1, 2)) * coal_price
+    carbon_emission = np.sum(fleet.emission * P * 0.25, axis=(1, 2))
+
+    heavy_energy = heavy_loads.sum(axis=1) * 0.25
+    light_energy = light_loads.sum(axis=1) * 0.25
+    wind_energy = wind_power.sum(axis=1) * 0.25
+
+    result = pd.DataFrame({
+        'capacity': capacities,
+        'heavy_energy': heavy_energy,
+        'light_energy': light_energy,
+        'curtailment_rate': heavy_energy / np.where(wind_energy > 0, wind_energy, 1.0),
+        'thermal_cost': 1.5 * fuel_cost,  # 煤耗成本 + 0.5倍运行维护成本
+        'carbon_cost': carbon_emission * carbon_price,
+        'wind_om_cost': wind_energy * 1000 * 0.045,  # 风电运维 0.045元/kWh
+        'heavy_load_cost': heavy_energy * 1000 * 0.3,  # 弃风损失 0.3元/kWh
+        'light_load_cost': light_energy * 1000 * 8.0  # 失负荷损失 8元/kWh
+    })
+    result['total_cost'] = result[['thermal_cost', 'carbon_cost', 'wind_om_cost',
+                                   'heavy_load_cost', 'light_load_cost']].sum(axis=1)
+    result['unit_supply_cost'] = result['total_cost'] / (load_demand.sum() * 0.25 * 1000)
+    return result
+
+
+# ===================== 最大风电消纳容量 =====================
+def _max_capacity_within(thresholds, weights, budget):
+    """
+    f(C) = 0.25·Σ w·max(0, C - c) 是 C 的单调不减分段线性函数（断点为各时段阈值 c），
+    按阈值排序后求各断点处的函数值，二分查找所在线段再解一次线性方程，得到 f(C) ≤ budget 的最大 C
+    :return: 最大 C（无阈值时为 inf，budget < 0 时不存在满足条件的 C，返回 -inf）
+    """
+    if budget < 0:
+        return -np.inf
+    if len(thresholds) == 0:
+        return np.inf
+    order = np.argsort(thresholds)
+    c, w = thresholds[order], weights[order]
+    W, WC = np.cumsum(w), np.cumsum(w * c)
+    f = 0.25 * (c * W - WC)  # 各断点处的函数值
+    k = np.searchsorted(f, budget, side='right') - 1  # f[0] = 0 ≤ budget，因此 k ≥ 0
+    return (budget / 0.25 + WC[k]) / W[k]
+
+
+def hosting_capacity(load_demand, wind_pu, units, heavy_tol=0.0, light_tol=None):
+    """
+    求弃风电量不超过容许值的最大风电装机容量（逐时段闭式解，不需要重复调度）
+    时段t的等效负荷 L[t] - C·w[t] 随装机容量C单调下降：
+      C > (L[t] - ΣP_min) / w[t] 时该时段开始弃风，弃风量随C线性增加；
+      C < (L[t] - ΣP_max) / w[t] 时该时段失负荷，失负荷量随C线性减少
+    因此总弃风电量是C的单调不减分段线性函数，由排序后的阈值直接解出上限；
+    总失负荷电量单调不增，同样解出装机容量的下限
+    :param load_demand: 负荷曲线 (MW)
+    :param wind_pu: 风电曲线（标幺值）
+    :param units: 机组列表或 UnitFleet
+    :param heavy_tol: 允许的弃风电量 (MWh)
+    :param light_tol: 允许的失负荷电量 (MWh)，None 表示不考虑失负荷
+    :return: 结果字典：最大装机容量（C=0 时弃风已超过容许值则为 None）、失负荷要求的最小装机容量、
+             是否可行、起约束作用的时段
+    """
+    fleet = as_fleet(units)
+    load_demand = np.asarray(load_demand, dtype=float)
+    wind_pu = np.asarray(wind_pu, dtype=float)
+    min_output, max_output = fleet.P_min.sum(), fleet.P_max.sum()
+    windy = wind_pu > 0
+    periods = np.flatnonzero(windy)
+
+    # 弃风：无风时段的弃风与装机容量无关，先从容许值中扣除
+    fixed_heavy = np.maximum(min_output - load_demand[~windy], 0).sum() * 0.25
+    heavy_thresholds = (load_demand[windy] - min_output) / wind_pu[windy]
+    capacity = _max_capacity_within(heavy_thresholds, wind_pu[windy], heavy_tol - fixed_heavy)
+    # 上限为负说明 C=0 时弃风已超过容许值（有风时段负荷低于最小出力之和，阈值为负），无可行容量
+    if capacity < 0:
+        capacity = None
+    # 装机容量达到上限时已弃风或恰好开始弃风的时段
+    binding = periods[heavy_thresholds <= capacity + 1e-6] if capacity is not None else np.array([], dtype=int)
+
+    # 失负荷：令 C' = -C 后与弃风的形式相同
+    min_capacity, light_binding = 0.0, np.array([], dtype=int)
+    if light_tol is not None:
+        fixed_light = np.maximum(load_demand[~windy] - max_output, 0).sum() * 0.25
+        light_thresholds = (load_demand[windy] - max_output) / wind_pu[windy]
+        if fixed_light > light_tol:
+            min_capacity = np.inf
+        else:
+            min_capacity = max(-_max_capacity_within(-light_thresholds, wind_pu[windy], light_tol - fixed_light), 0.0)
+        light_binding = periods[light_thresholds >= min_capacity - 1e-6]
+
+    feasible = capacity is not None and min_capacity <= capacity
+    return {
+        'capacity': capacity,
+        'min_capacity': min_capacity,
+        'feasible': feasible,
+        'binding_periods': binding[np.argsort(heavy_thresholds[np.isin(periods, binding)])],
+        'light_binding_periods': light_binding
+    }
+
+
+# ===================== 主程序 =====================
+def main():
+    all_units = load_units_data()
+    capacities = np.arange(0, 2001, 10)  # 0~2000MW，步长10MW
+    cases = load_cases()
+
+    plt.figure(figsize=(14, 10))
+    with pd.ExcelWriter('风电装机容量扫描结果.xlsx') as writer:
+        for k, (case, unit_indices, load_demand, wind_pu, capacity) in enumerate(cases):
+            units = [all_units[i] for i in unit_indices]
+            sweep = wind_capacity_sweep(load_demand, wind_pu, capacities, units)
+            sweep.to_excel(writer, sheet_name=case, index=False)
+
+            # 单位供电成本最低的装机容量
+            best = sweep.loc[sweep['unit_supply_cost'].idxmin()]
+            current = wind_capacity_sweep(load_demand, wind_pu, [capacity], units).iloc[0]
+            print(f"\n===== {case}（{'、'.join(u['name'] for u in units)}）=====")
+            print(f"题目装机 {capacity} MW：弃风 {current['heavy_energy']:.2f} MWh，"
+                  f"失负荷 {current['light_energy']:.2f} MWh，单位供电成本 {current['unit_supply_cost']:.4f} 元/kWh")
+            print(f"单位供电成本最低的装机容量: {best['capacity']:.0f} MW，"
+                  f"单位供电成本 {best['unit_supply_cost']:.4f} 元/kWh")
+
+            # 不弃风的最大装机容量，以及弃风不超过1%负荷电量时的最大装机容量
+            hosting = hosting_capacity(load_demand, wind_pu, units)
+            tolerance = np.sum(load_demand) * 0.25 * 0.01
+            hosting_tol = hosting_capacity(load_demand, wind_pu, units, heavy_tol=tolerance, light_tol=tolerance)
+            if hosting['capacity'] is None:
+                print("即使不接入风电也会弃风")
+            else:
+                periods = ', '.join(str(t) for t in hosting['binding_periods'][:5])
+                print(f"不弃风的最大装机容量: {hosting['capacity']:.2f} MW（起约束作用的时段: {periods}）")
+            print(f"弃风、失负荷均不超过 {tolerance:.2f} MWh 时：装机容量范围 "
+                  f"{hosting_tol['min_capacity']:.2f} ~ {hosting_tol['capacity']:.2f} MW"
+                  f"{'' if hosting_tol['feasible'] else '（无可行装机容量）'}")
+
+            plt.subplot(2, 2, k + 1)
+            plt.plot(sweep['capacity'], sweep['heavy_energy'], 'c-', label='弃风电量 (MWh)')
+            plt.plot(sweep['capacity'], sweep['light_energy'], 'r-', label='失负荷电量 (MWh)')
+            plt.axvline(capacity, color='k', linestyle='--', label=f'题目装机 {capacity}MW')
+            plt.ylabel('电量 (MWh)', fontproperties=font)
+            plt.twinx()
+            plt.plot(sweep['capacity'], sweep['unit_supply_cost'], 'm-')
+            plt.ylabel('单位供电成本 (元/kWh)', fontproperties=font)
+            plt.title(f'{case}：风电装机容量扫描', fontproperties=font, fontsize=14)
+            plt.xlabel('风电装机容量 (MW)', fontproperties=font)
+
+    plt.tight_layout()
+    plt.savefig('风电装机容量扫描曲线图.png', dpi=300)
+    plt.show()
+    print("\n扫描结果已保存到: 风电装机容量扫描结果.xlsx")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
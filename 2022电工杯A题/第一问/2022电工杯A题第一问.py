@@ -3,6 +3,13 @@ import matplotlib.pyplot as plt
 from matplotlib.font_manager import FontProperties
 import math
 import pandas as pd
+import os
+import sys
+
+# 共享的数据模块和机组模块位于上级目录（2022电工杯A题/data_cache.py、unit_fleet.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu
+from unit_fleet import as_fleet, DispatchCurve, economic_dispatch, economic_dispatch_batch, carbon_aware_fleet
 
 # 设置中文字体
 font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
@@ -19,133 +26,129 @@ def load_units_data():
 
 
 def load_demand_data():
-    """从Excel文件中读取负荷数据"""
-    # 读取Excel文件
-    df = pd.read_excel('C:/Users/HP/Desktop/问题一数据.xlsx', sheet_name='Sheet1')
-    # 提取负荷功率(p.u.)列并转换为实际功率（MW）
-    load_demand = df['负荷功率(p.u.)'].values * 900
+    """读取负荷数据（问题一数据.xlsx 只解析一次，之后读取二进制缓存）"""
+    # 负荷功率(p.u.)转换为实际功率（MW）
+    load_demand = load_demand_pu() * 900
     return load_demand.tolist()
 
 
 # ===================== 火电成本计算函数 =====================
-def calculate_thermal_cost(units, P_results, carbon_price):
+def calculate_thermal_cost_components(units, P_results):
     """
-    计算火电总成本（包括运行成本和碳捕集成本）
-    :param units: 机组列表
-    :param P_results: 各机组出力结果（列表的列表）
-    :param carbon_price: 碳捕集单价（元/吨）
-    :return: (总运行成本, 总碳捕集成本) 单位：元
+    计算与碳捕集单价无关的火电成本分量（只需计算一次）
+    :param units: 机组列表或 UnitFleet
+    :param P_results: 各机组出力结果（列表的列表或 (机组数, T) 数组）
+    :return: (煤耗成本, 运行维护成本, 碳排放量) 单位：元, 元, 吨
     """
-    total_fuel_cost = 0.0  # 煤耗成本（元）
-    total_om_cost = 0.0  # 运行维护成本（元） om——Operation and Maintenance（运行和维护）
-    total_carbon_cost = 0.0  # 碳捕集成本（元）
+    fleet = as_fleet(units)
+    P = np.asarray(P_results, dtype=float)  # (机组数, T)，单位MW
 
     # 煤价（元/kg）
     coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
 
-    # 遍历每个时间点（15分钟间隔）
-    for t in range(len(P_results[0])):
-        # 遍历每台机组
-        for i, unit in enumerate(units):
-            P = P_results[i][t]  # 机组在t时刻的出力（MW）
+    # 各机组各时刻的煤耗量（kg/h），15分钟的煤耗量为其0.25倍
+    F_hourly = fleet.a[:, None] * P ** 2 + fleet.b[:, None] * P + fleet.c[:, None]
 
-            # 计算煤耗量（kg/h）
-            F_hourly = unit['a'] * P ** 2 + unit['b'] * P + unit['c']
+    # 煤耗成本（元）
+    total_fuel_cost = np.sum(F_hourly * 0.25) * coal_price
 
-            # 15分钟的煤耗量（kg）
-            F_15min = F_hourly * 0.25
+    # 运行维护成本（元）= 0.5 * 煤耗成本  om——Operation and Maintenance（运行和维护）
+    total_om_cost = 0.5 * total_fuel_cost
 
-            # 煤耗成本（元）
-            fuel_cost = F_15min * coal_price
-            total_fuel_cost += fuel_cost
+    # 碳排放量（吨）= 发电量（MWh） × 1000 kWh/MWh × 碳排放强度（kg/kWh） / 1000
+    carbon_emission = np.sum(fleet.emission * (P * 0.25).sum(axis=1))
 
-            # 运行维护成本（元）= 0.5 * 煤耗成本
-            om_cost = 0.5 * fuel_cost
-            total_om_cost += om_cost
+    return float(total_fuel_cost), float(total_om_cost), float(carbon_emission)
 
-            # 计算发电量（MWh）
-            generation_mwh = P * 0.25  # MW × 0.25h = MWh
 
-            # 计算碳排放量（kg）
-            carbon_emission = generation_mwh * 1000 * unit['emission']  # MWh × 1000 kWh/MWh × kg/kWh
-
-            # 碳捕集成本（元）
-            carbon_cost = carbon_emission * (carbon_price / 1000)  # 碳捕集单价元/吨 = 元/1000kg
-            total_carbon_cost += carbon_cost
+def calculate_thermal_cost(units, P_results, carbon_price):
+    """
+    计算火电总成本（包括运行成本和碳捕集成本）
+    :param units: 机组列表或 UnitFleet
+    :param P_results: 各机组出力结果（列表的列表或 (机组数, T) 数组）
+    :param carbon_price: 碳捕集单价（元/吨）
+    :return: (总运行成本, 总碳捕集成本) 单位：元
+    """
+    fuel_cost, om_cost, carbon_emission = calculate_thermal_cost_components(units, P_results)
 
     # 总运行成本 = 煤耗成本 + 运行维护成本
-    total_operation_cost = total_fuel_cost + total_om_cost
-
-    return total_operation_cost, total_carbon_cost
+    return fuel_cost + om_cost, carbon_emission * carbon_price
 
 
-# ===================== 核心算法 =====================
-def calculate_lambda(load, units):
+def calculate_thermal_cost_sweep(units, P_results, carbon_prices):
     """
-    计算初始λ值（不考虑约束）
-    煤耗微增率方程：dF/dP = 2aP + b = λ
-    因此 P_i = (λ - b_i) / (2a_i)
-    约束：ΣP_i = load
-    推导λ的表达式：
-    load = Σ[(λ - b_i)/(2a_i)] = λ * Σ(1/(2a_i)) - Σ(b_i/(2a_i))
-    => λ = (load + Σ(b_i/(2a_i))) / Σ(1/(2a_i))
+    一次计算多个碳捕集单价下的火电成本（煤耗、运维和碳排放量只计算一次，碳价按广播相乘）
+    :param units: 机组列表或 UnitFleet
+    :param P_results: 各机组出力结果（列表的列表或 (机组数, T) 数组）
+    :param carbon_prices: 碳捕集单价数组（元/吨），可包含数百个价格点
+    :return: DataFrame，每行对应一个碳捕集单价，成本单位：元
     """
-    sum_inv_2a = sum(1 / (2 * u['a']) for u in units)
-    sum_b_over_2a = sum(u['b'] / (2 * u['a']) for u in units)
-    return (load + sum_b_over_2a) / sum_inv_2a
-
-
-def update_generation(lambda_val, units):
-    return [(lambda_val - u['b']) / (2 * u['a']) for u in units]
-
-
-def economic_dispatch(load, units, max_iter=20, tol=0.01):
-    n = len(units)
-    fixed = [False] * n
-    P = [0.0] * n
-
-    lambda_val = calculate_lambda(load, units)
-    P = update_generation(lambda_val, units)
-
-    for _ in range(max_iter):
-        new_fixed = fixed.copy()
-        violations = False
-
-        for i, u in enumerate(units):
-            if fixed[i]:
-                continue
-
-            if P[i] < u['P_min']:
-                P[i] = u['P_min']
-                new_fixed[i] = True
-                violations = True
-            elif P[i] > u['P_max']:
-                P[i] = u['P_max']
-                new_fixed[i] = True
-                violations = True
-
-        fixed = new_fixed
-
-        if not violations:
-            if abs(sum(P) - load) < tol:
-                break
-
-        adjustable_units = [u for i, u in enumerate(units) if not fixed[i]]
-        adjustable_indices = [i for i in range(n) if not fixed[i]]
-
-        if not adjustable_units:
-            break
+    fuel_cost, om_cost, carbon_emission = calculate_thermal_cost_components(units, P_results)
+    carbon_prices = np.asarray(carbon_prices, dtype=float)
+    operation_cost = fuel_cost + om_cost
+    carbon_cost = carbon_emission * carbon_prices
+
+    return pd.DataFrame({
+        'carbon_price': carbon_prices,
+        'fuel_cost': fuel_cost,
+        'om_cost': om_cost,
+        'operation_cost': operation_cost,
+        'carbon_emission': carbon_emission,
+        'carbon_cost': carbon_cost,
+        'total_cost': operation_cost + carbon_cost
+    })
+
+
+# ===================== 计及碳捕集成本的调度 =====================
+def economic_dispatch_carbon(loads, units, carbon_prices):
+    """
+    计及碳捕集成本的经济调度，多个碳捕集单价一次求解
+    每个碳价只需构造一次调度曲线，全部时刻的调度为数组查询
+    :param loads: 各时刻负荷数组 (MW)
+    :param units: 机组列表或 UnitFleet
+    :param carbon_prices: 碳捕集单价数组（元/吨）
+    :return: 各机组出力 (碳价数, T, 机组数) 单位：MW
+    """
+    loads = np.asarray(loads, dtype=float)
+    carbon_prices = np.atleast_1d(np.asarray(carbon_prices, dtype=float))
+    fleet = as_fleet(units)
 
-        fixed_power = sum(P[i] for i in range(n) if fixed[i])
-        remaining_load = max(load - fixed_power, 0)
+    P = np.empty((len(carbon_prices), len(loads), len(fleet)))
+    for k, carbon_price in enumerate(carbon_prices):
+        P[k] = DispatchCurve(carbon_aware_fleet(fleet, carbon_price)).dispatch(loads)
+    return P
 
-        lambda_val = calculate_lambda(remaining_load, adjustable_units)
-        P_adjustable = update_generation(lambda_val, adjustable_units)
 
-        for idx, i in enumerate(adjustable_indices):
-            P[i] = P_adjustable[idx]
+def calculate_carbon_dispatch_cost(units, P_tensor, carbon_prices):
+    """
+    计算各碳捕集单价下对应调度方案的火电成本
+    :param units: 机组列表或 UnitFleet
+    :param P_tensor: economic_dispatch_carbon 的结果 (碳价数, T, 机组数)
+    :param carbon_prices: 碳捕集单价数组（元/吨）
+    :return: DataFrame，每行对应一个碳捕集单价，成本单位：元
+    """
+    fleet = as_fleet(units)
+    P = np.asarray(P_tensor, dtype=float)
+    carbon_prices = np.atleast_1d(np.asarray(carbon_prices, dtype=float))
+    coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
 
-    return P
+    # 各碳价方案的煤耗成本、运维成本（元）和碳排放量（吨）
+    F_hourly = fleet.a * P ** 2 + fleet.b * P + fleet.c
+    fuel_cost = F_hourly.sum(axis=(1, 2)) * 0.25 * coal_price
+    om_cost = 0.5 * fuel_cost
+    carbon_emission = (P * 0.25).sum(axis=1) @ fleet.emission
+    operation_cost = fuel_cost + om_cost
+    carbon_cost = carbon_emission * carbon_prices
+
+    return pd.DataFrame({
+        'carbon_price': carbon_prices,
+        'fuel_cost': fuel_cost,
+        'om_cost': om_cost,
+        'operation_cost': operation_cost,
+        'carbon_emission': carbon_emission,
+        'carbon_cost': carbon_cost,
+        'total_cost': operation_cost + carbon_cost
+    })
 
 
 # ===================== 格式化数值为三位有效数字 =====================
@@ -172,14 +175,9 @@ def main():
     # 准备时间轴
     time_points = [f"{i // 4:02d}:{15 * (i % 4):02d}" for i in range(96)]
 
-    # 初始化结果存储
-    P_results = [[] for _ in range(len(units))]
-
-    # 执行经济调度
-    for i, load in enumerate(load_demand):
-        P = economic_dispatch(load, units)
-        for j in range(len(units)):
-            P_results[j].append(P[j])
+    # 执行经济调度（全部时刻一次批量求解）
+    P_matrix = economic_dispatch_batch(load_demand, units)
+    P_results = P_matrix.T.tolist()
 
     # 可视化结果
     plt.figure(figsize=(12, 6))
@@ -209,11 +207,12 @@ def main():
     # 输出结果标题
     print("\n结果如下\n")
 
-    # 计算不同碳捕集单价下的成本
-    for carbon_price in carbon_prices:
-        # 计算火电成本
-        operation_cost, carbon_cost = calculate_thermal_cost(units, P_results, carbon_price)
+    # 一次计算全部碳捕集单价下的火电成本
+    cost_table = calculate_thermal_cost_sweep(units, P_results, carbon_prices)
 
+    # 输出不同碳捕集单价下的成本
+    for carbon_price, operation_cost, carbon_cost in zip(
+            carbon_prices, cost_table['operation_cost'], cost_table['carbon_cost']):
         # 总发电成本（元）= 火电运行成本 + 碳捕集成本
         total_generation_cost = operation_cost + carbon_cost
 
@@ -249,6 +248,18 @@ def main():
         df.to_excel(excel_path, index=False)
         print(f"机组出力数据已保存到: {excel_path}")
 
+    # 计及碳捕集成本的调度：边际成本包含碳捕集成本，机组出力随碳价调整
+    P_carbon = economic_dispatch_carbon(load_demand, units, carbon_prices)
+    carbon_table = calculate_carbon_dispatch_cost(units, P_carbon, carbon_prices)
+
+    print("\n计及碳捕集成本调度的结果如下\n")
+    for carbon_price, total_cost, base_cost in zip(
+            carbon_prices, carbon_table['total_cost'], cost_table['total_cost']):
+        print(f"当碳捕集单价为 {carbon_price} 元/t 时：")
+        print(f"  总发电成本 = {format_value(total_cost / 10000)} 万元")
+        print(f"  较按煤耗调度节省 = {(base_cost - total_cost) / 10000:.4f} 万元")
+        print()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
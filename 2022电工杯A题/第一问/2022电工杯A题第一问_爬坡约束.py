@@ -0,0 +1,236 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+import pandas as pd
+from scipy import sparse
+import os
+import sys
+
+# 共享的数据、机组和二次规划求解模块位于上级目录（2022电工杯A题/data_cache.py、unit_fleet.py、sparse_qp.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu
+from unit_fleet import as_fleet, economic_dispatch_batch, carbon_aware_fleet
+from sparse_qp import solve_sparse_qp
+
+# 设置中文字体
+font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
+
+
+# ===================== 数据准备 =====================
+def load_units_data():
+    """
+    加载机组参数数据（包含碳排放强度和爬坡速率）
+    ramp: 相邻15分钟时段间出力的最大变化量（MW），题目未给出，按约1/3%额定容量/分钟假设
+    """
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72,
+         'ramp': 30},
+        {'name': '机组2', 'P_max': 300, 'P_min': 90, 'a': 0.588, 'b': 65.12, 'c': 451.32, 'emission': 0.75,
+         'ramp': 15},
+        {'name': '机组3', 'P_max': 150, 'P_min': 45, 'a': 0.785, 'b': 139.6, 'c': 1049.50, 'emission': 0.79,
+         'ramp': 8}
+    ]
+
+
+def load_demand_data():
+    """读取负荷数据（问题一数据.xlsx 只解析一次，之后读取二进制缓存）"""
+    # 负荷功率(p.u.)转换为实际功率（MW）
+    load_demand = load_demand_pu() * 900
+    return load_demand.tolist()
+
+
+# ===================== 计及爬坡约束的多时段调度 =====================
+def calculate_dispatch_cost(units, P_matrix, carbon_price=0.0):
+    """
+    计算调度结果的发电成本（煤耗 + 运行维护 + 碳捕集）
+    :param P_matrix: 各机组出力矩阵 (T, 机组数) 单位：MW
+    :return: 总成本（元）
+    """
+    fleet = carbon_aware_fleet(units, carbon_price)
+    P = np.asarray(P_matrix, dtype=float)
+    return float(np.sum((fleet.a * P ** 2 + fleet.b * P + fleet.c) * 0.25))
+
+
+def ramp_constrained_dispatch(loads, units, ramp_rates=None, carbon_price=0.0, P_init=None, wind_power=None,
+                              curtailment_price=0.3, shedding_price=8.0, max_iter=80, tol=1e-7):
+    """
+    计及爬坡约束的多时段经济调度（全部时段耦合为一个凸二次规划，一次求解）
+    min  Σt Σi 0.25·(aP² + bP + c) + 弃风损失 + 失负荷损失
+    s.t. Σi P[t,i] + 风电[t] - 弃风[t] + 失负荷[t] = 负荷[t]
+         P_min ≤ P[t,i] ≤ P_max,  |P[t,i] - P[t-1,i]| ≤ ramp_i,  0 ≤ 弃风[t] ≤ 风电[t]
+    变量按时间顺序排列，爬坡约束只耦合相邻时段，KKT矩阵为带状稀疏矩阵；
+    用原始-对偶内点法（Mehrotra预测-校正）求解，每次迭代做一次稀疏LU分解，
+    计算量随时段数线性增长，1440点（15天）也可在秒级内完成
+    :param loads: 各时刻负荷数组 (MW)，长度为T
+    :param units: 机组列表（含 ramp 键）或 UnitFleet（此时需给出 ramp_rates）
+    :param ramp_rates: 各机组每15分钟的最大出力变化量 (MW)，默认取机组字典的 ramp
+    :param carbon_price: 碳捕集单价（元/吨），为0时即按煤耗和运维成本调度
+    :param P_init: 调度起始前一时刻的各机组出力 (MW)，不给出时首时段不受爬坡约束
+    :param wind_power: 各时刻风电可用出力 (MW)，不给出时按无风电处理（弃风量恒为0）
+    :param curtailment_price: 弃风损失单价 (元/kWh)
+    :param shedding_price: 失负荷损失单价 (元/kWh)
+    :return: (各机组出力矩阵 (T, 机组数), 弃风量 (T,), 失负荷量 (T,)) 单位：MW
+    :raises RuntimeError: 内点法迭代 max_iter 次仍未收敛（如无风电时负荷下降速度超过全部机组的爬坡能力，问题无可行解）
+    """
+    loads = np.asarray(loads, dtype=float)
+    wind_power = np.zeros(len(loads)) if wind_power is None else np.asarray(wind_power, dtype=float)
+    fleet = carbon_aware_fleet(units, carbon_price)
+    if ramp_rates is None:
+        ramp_rates = [u['ramp'] for u in units]
+    ramp = np.asarray(ramp_rates, dtype=float)
+
+    T, n = len(loads), len(fleet)
+    m = n + 2  # 每个时段的变量：n台机组出力、弃风量、失负荷量
+    N = T * m
+    t_idx = np.arange(T)
+    p_idx = (t_idx[:, None] * m + np.arange(n)).ravel()  # P[t,i] 的变量下标
+    h_idx = t_idx * m + n  # 弃风
+    l_idx = t_idx * m + n + 1  # 失负荷
+
+    # 目标函数：二次项对角阵和一次项（元/时段）
+    q = np.zeros(N)
+    q[p_idx] = np.tile(2 * fleet.a * 0.25, T)
+    cost = np.zeros(N)
+    cost[p_idx] = np.tile(fleet.b * 0.25, T)
+    cost[h_idx] = curtailment_price * 1000 * 0.25  # 元/kWh × 1000 × 0.25h = 元/(MW·时段)
+    cost[l_idx] = shedding_price * 1000 * 0.25
+
+    # 功率平衡等式约束 A x = 负荷 - 风电
+    net_loads = loads - wind_power
+    A = sparse.csr_matrix((
+        np.concatenate([np.ones(T * n), -np.ones(T), np.ones(T)]),
+        (np.concatenate([np.repeat(t_idx, n), t_idx, t_idx]), np.concatenate([p_idx, h_idx, l_idx]))
+    ), shape=(T, N))
+
+    # 不等式约束 G x ≤ g：出力上下限、弃风不超过风电出力、弃风和失负荷非负、相邻时段爬坡
+    rows, cols, vals, g = [], [], [], []
+
+    def add_rows(col_list, val_list, rhs):
+        start = sum(len(r) for r in g)
+        count = len(rhs)
+        for col, val in zip(col_list, val_list):
+            rows.append(np.arange(start, start + count))
+            cols.append(col)
+            vals.append(np.full(count, val, dtype=float))
+        g.append(np.asarray(rhs, dtype=float))
+
+    add_rows([p_idx], [1.0], np.tile(fleet.P_max, T))
+    add_rows([p_idx], [-1.0], -np.tile(fleet.P_min, T))
+    add_rows([h_idx], [1.0], wind_power)
+    add_rows([h_idx], [-1.0], np.zeros(T))
+    add_rows([l_idx], [-1.0], np.zeros(T))
+    curr, prev = p_idx[n:], p_idx[:-n]
+    ramp_t = np.tile(ramp, T - 1)
+    add_rows([curr, prev], [1.0, -1.0], ramp_t)
+    add_rows([curr, prev], [-1.0, 1.0], ramp_t)
+    if P_init is not None:
+        P_init = np.asarray(P_init, dtype=float)
+        add_rows([p_idx[:n]], [1.0], P_init + ramp)
+        add_rows([p_idx[:n]], [-1.0], ramp - P_init)
+
+    g = np.concatenate(g)
+    G = sparse.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(len(g), N))
+
+    # 初始点：出力取上下限中点
+    x0 = np.zeros(N)
+    x0[p_idx] = np.tile((fleet.P_min + fleet.P_max) / 2, T)
+    x = solve_sparse_qp(q, cost, A, net_loads, G, g, x0=x0, max_iter=max_iter, tol=tol)
+
+    # 内点法的解在边界处可能残留 1e-15 量级的负值，弃风和失负荷截断到取值范围内
+    P = x[p_idx].reshape(T, n)
+    return P, np.clip(x[h_idx], 0, wind_power), np.maximum(x[l_idx], 0)
+
+
+def check_ramp_dispatch(P_matrix, loads, units, curtailment, shedding, ramp_rates=None, P_init=None,
+                        wind_power=None, tol=1e-3):
+    """
+    校验爬坡约束调度结果：功率平衡、出力上下限、爬坡限值以及弃风、失负荷的取值范围
+    :param P_matrix: 各机组出力矩阵 (T, 机组数) 单位：MW
+    :param curtailment: 弃风量 (T,) 单位：MW
+    :param shedding: 失负荷量 (T,) 单位：MW
+    :param tol: 允许偏差 (MW)
+    :return: 各项最大偏差字典 (MW)
+    :raises ValueError: 任一约束的偏差超过 tol
+    """
+    fleet = as_fleet(units)
+    P = np.asarray(P_matrix, dtype=float)
+    loads = np.asarray(loads, dtype=float)
+    wind_power = np.zeros(len(loads)) if wind_power is None else np.asarray(wind_power, dtype=float)
+    if ramp_rates is None:
+        ramp_rates = [u['ramp'] for u in units]
+    ramp = np.asarray(ramp_rates, dtype=float)
+
+    # 相邻时段出力变化（给出起始出力时首时段也计入）
+    steps = np.diff(P, axis=0) if P_init is None else np.diff(np.vstack([P_init, P]), axis=0)
+    violations = {
+        '功率平衡': np.abs(P.sum(axis=1) + wind_power - curtailment + shedding - loads).max(),
+        '出力上下限': max(np.max(P - fleet.P_max), np.max(fleet.P_min - P), 0.0),
+        '爬坡限值': max(np.max(np.abs(steps) - ramp), 0.0) if len(steps) else 0.0,
+        '弃风范围': max(np.max(-curtailment), np.max(curtailment - wind_power), 0.0),
+        '失负荷范围': max(np.max(-shedding), 0.0)
+    }
+    failed = {key: value for key, value in violations.items() if value > tol}
+    if failed:
+        raise ValueError(f"调度结果不满足约束：{failed}")
+    return violations
+
+
+# ===================== 主程序 =====================
+def main():
+    # 加载数据
+    units = load_units_data()
+    load_demand = load_demand_data()
+
+    # 准备时间轴
+    time_points = [f"{i // 4:02d}:{15 * (i % 4):02d}" for i in range(96)]
+
+    # 不计爬坡约束：各时刻独立进行经济调度
+    P_free = economic_dispatch_batch(load_demand, units)
+
+    # 计及爬坡约束：96个时段耦合求解
+    P_ramp, heavy_loads, light_loads = ramp_constrained_dispatch(load_demand, units)
+    check_ramp_dispatch(P_ramp, load_demand, units, heavy_loads, light_loads)
+
+    ramp = np.array([u['ramp'] for u in units])
+    print("\n结果如下\n")
+    for name, P in [('不计爬坡约束', P_free), ('计及爬坡约束', P_ramp)]:
+        max_step = np.abs(np.diff(P, axis=0)).max(axis=0)
+        print(f"{name}：")
+        print(f"  发电成本 = {calculate_dispatch_cost(units, P) / 10000:.4f} 万元")
+        for j, u in enumerate(units):
+            print(f"  {u['name']} 最大出力变化 = {max_step[j]:.2f} MW（爬坡限值 {ramp[j]} MW）")
+        print()
+    print(f"计及爬坡约束后的弃风量 = {heavy_loads.sum() * 0.25:.2f} MWh，"
+          f"失负荷量 = {light_loads.sum() * 0.25:.2f} MWh")
+
+    # 可视化结果
+    plt.figure(figsize=(12, 6))
+    plt.plot(load_demand, 'k-', linewidth=2, label='系统日总负荷')
+
+    colors = ['r', 'g', 'b']
+    for j, u in enumerate(units):
+        plt.plot(P_free[:, j], colors[j] + '--', alpha=0.6, label=f"{u['name']} 不计爬坡约束")
+        plt.plot(P_ramp[:, j], colors[j] + '-', label=f"{u['name']} 计及爬坡约束")
+
+    plt.title('计及爬坡约束的机组日发电计划曲线', fontproperties=font, fontsize=16)
+    plt.ylabel('出力 (MW)', fontproperties=font)
+    plt.xlabel('时间', fontproperties=font)
+    plt.xticks(range(0, 96, 4), time_points[::4], rotation=45)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(prop=font, loc='best')
+    plt.tight_layout()
+    plt.savefig('第一问爬坡约束曲线图.png', dpi=300)
+    plt.show()
+
+    # 保存机组出力数据为Excel文件
+    data = {'时间': time_points, '系统负荷(MW)': load_demand}
+    for j, u in enumerate(units):
+        data[f"{u['name']}出力(MW)"] = P_ramp[:, j]
+    excel_path = '计及爬坡约束的机组出力数据.xlsx'
+    pd.DataFrame(data).to_excel(excel_path, index=False)
+    print(f"机组出力数据已保存到: {excel_path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
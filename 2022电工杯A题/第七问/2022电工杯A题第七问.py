@@ -1,8 +1,13 @@
 import matplotlib.pyplot as plt
 from matplotlib.font_manager import FontProperties
-import pandas as pd
 import matplotlib.dates as mdates
 from datetime import datetime, timedelta
+import os
+import sys
+
+# 共享数据模块位于上级目录（2022电工杯A题/data_cache.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_attachment2
 
 # 设置中文字体
 font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
@@ -17,16 +22,14 @@ def load_units_data():
 
 
 def load_demand_data():
-    """从Excel文件中读取15天负荷数据"""
-    df = pd.read_excel('C:/Users/HP/Desktop/附件2.xlsx', sheet_name='Sheet1')
-    load_demand = df['负荷功率(MW)'].values
+    """读取15天负荷数据（附件2.xlsx 只解析一次，之后读取二进制缓存）"""
+    load_demand, _ = load_attachment2()
     return load_demand.tolist()
 
 
 def load_wind_data():
-    """从Excel文件中读取15天风电数据（1200MW装机）"""
-    df = pd.read_excel('C:/Users/HP/Desktop/附件2.xlsx', sheet_name='Sheet1')
-    wind_power = df['风电功率(MW)'].values
+    """读取15天风电数据（1200MW装机）"""
+    _, wind_power = load_attachment2()
     return wind_power.tolist()
 
 
@@ -0,0 +1,339 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+import matplotlib.dates as mdates
+from datetime import datetime, timedelta
+import os
+import sys
+
+# 共享数据模块位于上级目录（2022电工杯A题/data_cache.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_attachment2
+
+# 设置中文字体
+font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
+
+
+# ===================== 数据准备 =====================
+def load_units_data():
+    """加载机组参数数据（只保留1号机组）"""
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72}
+    ]
+
+
+# ===================== 成本计算函数 =====================
+def calculate_thermal_cost(units, thermal_power, carbon_price):
+    total_fuel_cost = 0.0  # 煤耗成本（元）
+    total_om_cost = 0.0  # 运行维护成本（元）
+    total_carbon_cost = 0.0  # 碳捕集成本（元）
+
+    # 煤价（元/kg）
+    coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
+    unit = units[0]  # 唯一机组
+
+    # 遍历每个时间点（15分钟间隔）
+    for P in thermal_power:
+        # 计算煤耗量（kg/h）
+        F_hourly = unit['a'] * P ** 2 + unit['b'] * P + unit['c']
+
+        # 15分钟的煤耗量（kg）
+        F_15min = F_hourly * 0.25
+
+        # 煤耗成本（元）
+        fuel_cost = F_15min * coal_price
+        total_fuel_cost += fuel_cost
+
+        # 运行维护成本（元）= 0.5 * 煤耗成本
+        om_cost = 0.5 * fuel_cost
+        total_om_cost += om_cost
+
+        # 计算发电量（MWh）
+        generation_mwh = P * 0.25  # MW × 0.25h = MWh
+
+        # 计算碳排放量（kg）
+        carbon_emission = generation_mwh * 1000 * unit['emission']  # MWh × 1000 kWh/MWh × kg/kWh
+
+        # 碳捕集成本（元）
+        carbon_cost = carbon_emission * (carbon_price / 1000)  # 碳捕集单价元/吨 = 元/1000kg
+        total_carbon_cost += carbon_cost
+
+    # 总运行成本 = 煤耗成本 + 运行维护成本
+    total_operation_cost = total_fuel_cost + total_om_cost
+
+    return total_operation_cost, total_carbon_cost
+
+
+def calculate_wind_cost(wind_power, heavy_loads):
+    # 风电单位运维成本 (元/kWh)
+    wind_om_cost_per_kwh = 0.045
+
+    # 弃风损失单价 (元/kWh)
+    wind_curtailment_cost_per_kwh = 0.3
+    total_wind_om_cost = 0.0
+    total_curtailment_cost = 0.0
+
+    # 遍历每个时间点（15分钟间隔）
+    for i in range(len(wind_power)):
+        # 风电运维成本 = 实际发电量 × 单位运维成本
+        wind_generation_kwh = wind_power[i] * 0.25 * 1000  # MW × 0.25h × 1000 = kWh
+        wind_om_cost = wind_generation_kwh * wind_om_cost_per_kwh
+        total_wind_om_cost += wind_om_cost
+
+        # 弃风损失 = 弃风电量 × 弃风损失单价
+        curtailment_kwh = heavy_loads[i] * 0.25 * 1000  # MW × 0.25h × 1000 = kWh
+        curtailment_cost = curtailment_kwh * wind_curtailment_cost_per_kwh
+        total_curtailment_cost += curtailment_cost
+
+    return total_wind_om_cost, total_curtailment_cost
+
+
+def calculate_light_load_cost(light_loads):
+    # 失负荷损失单价 (元/kWh)
+    light_load_cost_per_kwh = 8.0
+
+    total_light_load_cost = 0.0
+
+    # 遍历每个时间点（15分钟间隔）
+    for light_load in light_loads:
+        # 失负荷损失 = 失负荷电量 × 失负荷损失单价
+        light_load_kwh = light_load * 0.25 * 1000  # MW × 0.25h × 1000 = kWh
+        light_load_cost = light_load_kwh * light_load_cost_per_kwh
+        total_light_load_cost += light_load_cost
+
+    return total_light_load_cost
+
+
+def calculate_energy_storage_cost(P_cap, E_cap, discharge_energy):
+    """
+    计算储能成本
+    :param P_cap: 功率容量 (MW) 是指单位时间内充放电的最大功率，对应表格中单位功率成本
+    :param E_cap: 能量容量 (MWh) 是指能够储存的最大容量，对应表格中单位能量成本
+    :param discharge_energy: 总放电能量 (MWh)
+    :return: (日均投资成本, 运维成本) 单位：元
+    """
+    # 储能成本参数（附表3）
+    power_cost_per_kw = 3000  # 单位功率成本 (元/kW)
+    energy_cost_per_kwh = 3000  # 单位能量成本 (元/kWh)
+    om_cost_per_kwh = 0.05  # 单位电量运维成本 (元/kWh)
+    lifetime_years = 10  # 运行年限
+
+    # 计算总投资成本
+    total_investment = (P_cap * 1000 * power_cost_per_kw) + (E_cap * 1000 * energy_cost_per_kwh)
+
+    # 日均投资成本 = 总投资成本 / (运行年限 * 365)
+    daily_investment_cost = total_investment / (lifetime_years * 365)
+
+    # 运维成本 = 放电电量 × 单位运维成本 （运维是指在放电过程中）
+    om_cost = discharge_energy * 1000 * om_cost_per_kwh
+
+    return daily_investment_cost, om_cost
+
+
+# ===================== 多日储能运行模拟 =====================
+def simulate_storage(heavy_loads, light_loads, P_cap, E_cap, efficiency=0.9):
+    """
+    按第五问的规则模拟储能运行（弃风时充电、失负荷时放电），储能电量跨日连续
+    :param heavy_loads: 弃风量数组 (MW)
+    :param light_loads: 失负荷量数组 (MW)
+    :param P_cap: 功率容量 (MW)
+    :param E_cap: 能量容量 (MWh)
+    :param efficiency: 充电效率
+    :return: (剩余弃风量 (MW), 剩余失负荷量 (MW), 时段末储能电量 (MWh), 总放电量 (MWh))
+    """
+    T = len(heavy_loads)
+    residual_heavy = np.array(heavy_loads, dtype=float)
+    residual_light = np.array(light_loads, dtype=float)
+    changed = (residual_heavy > 0) | (residual_light > 0)
+    energy = np.zeros(T)
+    current = 0.0
+    total_discharge = 0.0
+
+    # 只在有弃风或失负荷的时段更新储能电量
+    for i in np.flatnonzero(changed):
+        if residual_heavy[i] > 0:
+            charge = min(residual_heavy[i], P_cap, (E_cap - current) / (0.25 * efficiency))
+            current += charge * 0.25 * efficiency
+            residual_heavy[i] -= charge
+        else:
+            discharge = min(residual_light[i], P_cap, current / 0.25)
+            current -= discharge * 0.25
+            total_discharge += discharge * 0.25
+            residual_light[i] -= discharge
+        energy[i] = current
+
+    # 无充放电的时段储能电量保持不变（向前填充）
+    last_event = np.maximum.accumulate(np.where(changed, np.arange(T), 0))
+    energy = energy[last_event]
+    return residual_heavy, residual_light, energy, total_discharge
+
+
+def unmet_energy_unlimited(heavy_loads, light_loads, P_cap, efficiency=0.9):
+    """
+    能量容量不受限时的失负荷电量（O(n)，向量化）
+    储能电量为下限为0的累加过程 s[t] = max(0, s[t-1] + 充电 - 放电需求)，
+    因电量不足而缺供的电量等于 max(0, -min 前缀和)（反射累加过程的性质）
+    :return: 失负荷电量 (MWh)，包括功率容量不足和电量不足两部分
+    """
+    heavy_loads = np.asarray(heavy_loads, dtype=float)
+    light_loads = np.asarray(light_loads, dtype=float)
+    charge = np.minimum(heavy_loads, P_cap) * 0.25 * efficiency
+    demand = np.minimum(light_loads, P_cap) * 0.25
+    power_shortage = np.maximum(light_loads - P_cap, 0).sum() * 0.25
+    energy_shortage = max(0.0, -np.cumsum(charge - demand).min())
+    return power_shortage + energy_shortage
+
+
+def min_energy_capacity(heavy_loads, light_loads, P_cap, efficiency=0.9):
+    """
+    给定功率容量下，使放电需求全部得到满足的最小能量容量（O(n)，向量化）
+    倒序计算各时段开始时需要的储能电量 r[t] = max(0, r[t+1] + 放电需求[t] - 充电[t])，
+    记后缀和 D[t] = Σ(放电需求 - 充电)[t:]，则 r[t] = D[t] - min(D[t:])，最小能量容量为 max r[t]
+    :return: 最小能量容量 (MWh)
+    """
+    charge = np.minimum(np.asarray(heavy_loads, dtype=float), P_cap) * 0.25 * efficiency
+    demand = np.minimum(np.asarray(light_loads, dtype=float), P_cap) * 0.25
+    suffix = np.append(np.cumsum((demand - charge)[::-1])[::-1], 0.0)
+    required = suffix - np.minimum.accumulate(suffix[::-1])[::-1]
+    return float(required.max())
+
+
+def size_storage(heavy_loads, light_loads, shed_target=0.0, efficiency=0.9, tol=0.01):
+    """
+    求使失负荷电量不超过目标值的最小储能配置
+    1) 能量容量不受限时失负荷电量随功率容量单调不增，二分法求最小功率容量（每次 O(n) 向量化计算）
+    2) 给定功率容量，目标为0时用倒序累加公式直接求最小能量容量；
+       目标大于0时失负荷电量随能量容量单调不增，二分法求最小能量容量
+    :param shed_target: 允许的失负荷电量 (MWh)
+    :param tol: 二分法精度（MW / MWh）
+    :return: (功率容量 MW, 能量容量 MWh)；目标无法达到时返回 None
+    """
+    light_total = np.sum(light_loads) * 0.25
+    if light_total <= shed_target:
+        return 0.0, 0.0
+
+    P_high = max(np.max(heavy_loads), np.max(light_loads))
+    if unmet_energy_unlimited(heavy_loads, light_loads, P_high, efficiency) > shed_target + 1e-9:
+        return None  # 弃风电量不足以弥补失负荷
+
+    P_low = 0.0
+    while P_high - P_low > tol:
+        P_mid = (P_low + P_high) / 2
+        if unmet_energy_unlimited(heavy_loads, light_loads, P_mid, efficiency) <= shed_target + 1e-9:
+            P_high = P_mid
+        else:
+            P_low = P_mid
+    P_cap = P_high
+
+    E_high = min_energy_capacity(heavy_loads, light_loads, P_cap, efficiency)
+    if shed_target <= 0:
+        return P_cap, E_high
+
+    E_low = 0.0
+    while E_high - E_low > tol:
+        E_mid = (E_low + E_high) / 2
+        _, residual_light, _, _ = simulate_storage(heavy_loads, light_loads, P_cap, E_mid, efficiency)
+        if residual_light.sum() * 0.25 <= shed_target + 1e-9:
+            E_high = E_mid
+        else:
+            E_low = E_mid
+    return P_cap, E_high
+
+
+def evaluate_storage(load_demand, wind_power, thermal_power, heavy_loads, light_loads, units,
+                     P_cap, E_cap, carbon_price=60, efficiency=0.9):
+    """
+    多日储能运行及成本计算（成本函数与第五问相同，储能投资按天数折算）
+    :return: 结果字典：各项成本（元）、剩余弃风/失负荷电量（MWh）和储能电量曲线
+    """
+    residual_heavy, residual_light, energy, total_discharge = simulate_storage(
+        heavy_loads, light_loads, P_cap, E_cap, efficiency)
+    days = len(load_demand) / 96
+
+    operation_cost, carbon_cost = calculate_thermal_cost(units, thermal_power, carbon_price)
+    wind_om_cost, wind_heavy_load_cost = calculate_wind_cost(wind_power, residual_heavy)
+    light_load_cost = calculate_light_load_cost(residual_light)
+    daily_investment_cost, storage_om_cost = calculate_energy_storage_cost(P_cap, E_cap, total_discharge)
+
+    total_cost = (operation_cost + carbon_cost + wind_om_cost + wind_heavy_load_cost + light_load_cost +
+                  daily_investment_cost * days + storage_om_cost)
+    return {
+        'operation_cost': operation_cost, 'carbon_cost': carbon_cost, 'wind_om_cost': wind_om_cost,
+        'wind_heavy_load_cost': wind_heavy_load_cost, 'light_load_cost': light_load_cost,
+        'investment_cost': daily_investment_cost * days, 'storage_om_cost': storage_om_cost,
+        'total_cost': total_cost,
+        'unit_supply_cost': total_cost / (np.sum(load_demand) * 0.25 * 1000),
+        'heavy_energy': residual_heavy.sum() * 0.25, 'light_energy': residual_light.sum() * 0.25,
+        'energy': energy
+    }
+
+
+# ===================== 主程序 =====================
+def main():
+    # 加载数据
+    units = load_units_data()  # 只保留机组1
+    load_demand, wind_power = (np.asarray(x, dtype=float) for x in load_attachment2())
+    unit = units[0]
+    carbon_price = 60  # 单位碳捕集成本 (元/t)
+
+    # 火电按等效负荷截断在上下限，超出部分为弃风或失负荷
+    equivalent_loads = load_demand - wind_power
+    thermal_power = np.clip(equivalent_loads, unit['P_min'], unit['P_max'])
+    heavy_loads = np.maximum(unit['P_min'] - equivalent_loads, 0)
+    light_loads = np.maximum(equivalent_loads - unit['P_max'], 0)
+
+    print("\n============== 第七问15天储能配置结果 ==============")
+    print(f"无储能时：弃风量 {heavy_loads.sum() * 0.25:.2f} MWh，失负荷量 {light_loads.sum() * 0.25:.2f} MWh")
+
+    # 储能初始电量为0，首次弃风前的失负荷无法避免，以此作为失负荷目标的下限
+    P_upper = max(heavy_loads.max(), light_loads.max())
+    min_shed = unmet_energy_unlimited(heavy_loads, light_loads, P_upper)
+    print(f"配置储能后可达到的最小失负荷量: {min_shed:.2f} MWh")
+
+    # 不同失负荷目标下的最小储能配置
+    results = []
+    for shed_target in min_shed + np.array([0.0, 100.0, 500.0, 1000.0]):
+        size = size_storage(heavy_loads, light_loads, shed_target)
+        if size is None:
+            print(f"\n失负荷目标 {shed_target:.0f} MWh 无法达到")
+            continue
+        P_cap, E_cap = size
+        result = evaluate_storage(load_demand, wind_power, thermal_power, heavy_loads, light_loads, units,
+                                  P_cap, E_cap, carbon_price)
+        results.append((shed_target, result))
+
+        print(f"\n失负荷目标 ≤ {shed_target:.0f} MWh：")
+        print(f"  功率容量: {P_cap:.2f} MW, 能量容量: {E_cap:.2f} MWh")
+        print(f"  剩余弃风量: {result['heavy_energy']:.2f} MWh, 剩余失负荷量: {result['light_energy']:.2f} MWh")
+        print(f"  火电运行成本: {result['operation_cost'] / 10000:.2f} 万元")
+        print(f"  碳捕集成本: {result['carbon_cost'] / 10000:.2f} 万元")
+        print(f"  风电运维成本: {result['wind_om_cost'] / 10000:.2f} 万元")
+        print(f"  弃风损失: {result['wind_heavy_load_cost'] / 10000:.2f} 万元")
+        print(f"  失负荷损失: {result['light_load_cost'] / 10000:.2f} 万元")
+        print(f"  储能投资成本（15天）: {result['investment_cost'] / 10000:.2f} 万元")
+        print(f"  储能运维成本: {result['storage_om_cost'] / 10000:.2f} 万元")
+        print(f"  总发电成本: {result['total_cost'] / 10000:.2f} 万元")
+        print(f"  单位供电成本: {result['unit_supply_cost']:.4f} 元/kWh")
+
+    # 储能电量曲线（15天连续）
+    start_date = datetime(2020, 7, 1)
+    time_points = [start_date + timedelta(minutes=15 * i) for i in range(len(load_demand))]
+
+    plt.figure(figsize=(18, 6))
+    for shed_target, result in results:
+        plt.plot(time_points, result['energy'], linewidth=1.5, label=f'失负荷目标 ≤ {shed_target:.0f} MWh')
+    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
+    plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=2))
+    plt.gcf().autofmt_xdate()
+    plt.title('15天储能电量曲线', fontproperties=font, fontsize=16)
+    plt.ylabel('储能电量 (MWh)', fontproperties=font)
+    plt.xlabel('日期', fontproperties=font)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(prop=font, loc='best')
+    plt.tight_layout()
+    plt.savefig('第七问储能配置曲线图.png', dpi=300)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
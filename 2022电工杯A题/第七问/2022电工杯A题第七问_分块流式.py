@@ -0,0 +1,204 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+import pandas as pd
+import os
+import sys
+from datetime import datetime, timedelta
+from openpyxl import load_workbook
+
+# 共享的数据模块和机组模块位于上级目录（2022电工杯A题/data_cache.py、unit_fleet.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import resolve_path
+from unit_fleet import economic_dispatch_batch
+
+# 设置中文字体
+font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
+
+
+# ===================== 数据准备 =====================
+def load_units_data():
+    """加载机组参数数据（只保留1号机组）"""
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72}
+    ]
+
+
+def read_chunks(path, chunk_size=96 * 30, load_col='负荷功率(MW)', wind_col='风电功率(MW)'):
+    """
+    分块读取负荷和风电数据的生成器，内存占用只与块大小有关
+    CSV 文件用 pandas 分块读取；Excel 文件用 openpyxl 只读模式逐行读取
+    :param path: 数据文件路径（.csv 或 .xlsx），表头包含负荷列和风电列
+    :param chunk_size: 每块的时刻数（默认30天）
+    :return: 逐块产生 (负荷数组, 风电数组) 单位：MW，没有数据行时不产生任何块
+    """
+    if path.lower().endswith('.csv'):
+        for df in pd.read_csv(path, usecols=[load_col, wind_col], chunksize=chunk_size):
+            if len(df) == 0:  # 只有表头的文件会产生一个空块
+                continue
+            yield df[load_col].values.astype(float), df[wind_col].values.astype(float)
+        return
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:  # 空工作表
+            return
+        header = list(header)
+        load_pos, wind_pos = header.index(load_col), header.index(wind_col)
+        load_buf, wind_buf = [], []
+        for row in rows:
+            if row[load_pos] is None or row[wind_pos] is None:  # 跳过末尾空行
+                continue
+            load_buf.append(row[load_pos])
+            wind_buf.append(row[wind_pos])
+            if len(load_buf) == chunk_size:
+                yield np.array(load_buf, dtype=float), np.array(wind_buf, dtype=float)
+                load_buf, wind_buf = [], []
+        if load_buf:
+            yield np.array(load_buf, dtype=float), np.array(wind_buf, dtype=float)
+    finally:
+        workbook.close()
+
+
+# ===================== 分块流式调度 =====================
+def dispatch_chunk(load_demand, wind_power, units, carbon_price=60):
+    """
+    对一块数据进行批量调度并计算该块的各项成本
+    :param load_demand: 负荷数组 (MW)
+    :param wind_power: 风电数组 (MW)
+    :param units: 机组列表
+    :param carbon_price: 碳捕集单价（元/吨）
+    :return: (逐时刻结果 DataFrame, 该块统计量字典)
+    """
+    equivalent_loads = load_demand - wind_power
+    P_matrix = economic_dispatch_batch(equivalent_loads, units)
+
+    P_min = np.array([u['P_min'] for u in units], dtype=float)
+    P_max = np.array([u['P_max'] for u in units], dtype=float)
+    a = np.array([u['a'] for u in units])
+    b = np.array([u['b'] for u in units])
+    c = np.array([u['c'] for u in units])
+    emission = np.array([u.get('emission', 0.0) for u in units])
+
+    # 等效负荷低于最小出力之和时弃风，高于最大出力之和时失负荷
+    heavy_loads = np.maximum(P_min.sum() - equivalent_loads, 0)
+    light_loads = np.maximum(equivalent_loads - P_max.sum(), 0)
+    thermal_power = P_matrix.sum(axis=1)
+
+    # 火电成本：煤耗成本 × 1.5（含运维），碳排放量（吨）
+    coal_price = 700 / 1000
+    fuel_cost = np.sum((a * P_matrix ** 2 + b * P_matrix + c) * 0.25) * coal_price
+    carbon_emission = np.sum(emission * P_matrix * 0.25)
+
+    stats = {
+        'periods': len(load_demand),
+        'load_energy': load_demand.sum() * 0.25,  # MWh
+        'wind_energy': wind_power.sum() * 0.25,
+        'heavy_energy': heavy_loads.sum() * 0.25,
+        'light_energy': light_loads.sum() * 0.25,
+        'thermal_cost': 1.5 * fuel_cost,  # 元
+        'carbon_cost': carbon_emission * carbon_price,
+        'wind_om_cost': wind_power.sum() * 0.25 * 1000 * 0.045,  # 风电运维 0.045元/kWh
+        'heavy_load_cost': heavy_loads.sum() * 0.25 * 1000 * 0.3,  # 弃风损失 0.3元/kWh
+        'light_load_cost': light_loads.sum() * 0.25 * 1000 * 8,  # 失负荷损失 8元/kWh
+        'max_heavy_load': heavy_loads.max(),  # MW
+        'max_light_load': light_loads.max()
+    }
+
+    result = pd.DataFrame({'负荷功率(MW)': load_demand, '风电功率(MW)': wind_power})
+    for j, u in enumerate(units):
+        result[f"{u['name']}出力(MW)"] = P_matrix[:, j]
+    result['弃风量(MW)'] = heavy_loads
+    result['失负荷量(MW)'] = light_loads
+    result['功率平衡(MW)'] = thermal_power + wind_power - load_demand
+    return result, stats
+
+
+def stream_dispatch(path, units, chunk_size=96 * 30, carbon_price=60, output_dir='分块调度结果',
+                    start_date=datetime(2020, 7, 1)):
+    """
+    分块流式调度：逐块读取、批量调度并累加统计量，逐时刻结果按块追加写入磁盘
+    内存中只保留当前块和累计统计量，与序列总长度无关
+    :param path: 数据文件路径（.csv 或 .xlsx）
+    :param units: 机组列表
+    :param chunk_size: 每块的时刻数
+    :param carbon_price: 碳捕集单价（元/吨）
+    :param output_dir: 输出目录，生成逐时刻结果和逐块汇总两个CSV文件
+    :param start_date: 序列起始时刻
+    :return: 全序列累计统计量字典
+    :raises ValueError: 数据文件中没有数据行
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    detail_path = os.path.join(output_dir, '逐时刻调度结果.csv')
+    summary_path = os.path.join(output_dir, '逐块汇总结果.csv')
+
+    totals = {}
+    offset = 0
+    for k, (load_demand, wind_power) in enumerate(read_chunks(path, chunk_size)):
+        result, stats = dispatch_chunk(load_demand, wind_power, units, carbon_price)
+
+        # 逐时刻结果追加写入（只在第一块写表头）
+        times = pd.date_range(start_date + timedelta(minutes=15 * offset), periods=len(result), freq='15min')
+        result.insert(0, '时间', times)
+        result.to_csv(detail_path, mode='w' if k == 0 else 'a', header=k == 0, index=False,
+                      encoding='utf-8-sig' if k == 0 else 'utf-8')
+
+        summary = pd.DataFrame([{'块序号': k, '起始时间': times[0], **stats}])
+        summary.to_csv(summary_path, mode='w' if k == 0 else 'a', header=k == 0, index=False,
+                       encoding='utf-8-sig' if k == 0 else 'utf-8')
+
+        # 累加统计量（最大值取最大，其余求和）
+        for key, value in stats.items():
+            if key.startswith('max_'):
+                totals[key] = max(totals.get(key, 0.0), value)
+            else:
+                totals[key] = totals.get(key, 0.0) + value
+        offset += len(result)
+
+    if not totals:
+        raise ValueError(f"数据文件 {path} 中没有负荷和风电数据")
+    totals['total_cost'] = (totals['thermal_cost'] + totals['carbon_cost'] + totals['wind_om_cost'] +
+                            totals['heavy_load_cost'] + totals['light_load_cost'])
+    return totals
+
+
+# ===================== 主程序 =====================
+def main():
+    units = load_units_data()  # 只保留机组1
+    output_dir = '分块调度结果'
+
+    # 逐日分块（96点/块）流式调度15天数据；多年SCADA数据可直接换成CSV文件路径
+    totals = stream_dispatch(resolve_path('附件2.xlsx'), units, chunk_size=96, output_dir=output_dir)
+
+    print("\n结果如下\n")
+    print(f"总时刻数: {int(totals['periods'])}")
+    print(f"总负荷电量: {totals['load_energy']:.2f} MWh")
+    print(f"弃风电量: {totals['heavy_energy']:.2f} MWh（弃风率 {totals['heavy_energy'] / totals['wind_energy'] * 100:.2f}%）")
+    print(f"失负荷电量: {totals['light_energy']:.2f} MWh")
+    print(f"最大弃风功率: {totals['max_heavy_load']:.2f} MW，最大失负荷功率: {totals['max_light_load']:.2f} MW")
+    print(f"火电运行成本: {totals['thermal_cost'] / 10000:.2f} 万元")
+    print(f"碳捕集成本: {totals['carbon_cost'] / 10000:.2f} 万元")
+    print(f"风电运维成本: {totals['wind_om_cost'] / 10000:.2f} 万元")
+    print(f"弃风损失: {totals['heavy_load_cost'] / 10000:.2f} 万元")
+    print(f"失负荷损失: {totals['light_load_cost'] / 10000:.2f} 万元")
+    print(f"总成本: {totals['total_cost'] / 10000:.2f} 万元")
+
+    # 按块汇总结果绘图（每块一行，数据量很小）
+    summary = pd.read_csv(os.path.join(output_dir, '逐块汇总结果.csv'))
+    plt.figure(figsize=(14, 6))
+    plt.bar(summary['块序号'] - 0.2, summary['heavy_energy'], width=0.4, color='c', label='弃风电量')
+    plt.bar(summary['块序号'] + 0.2, summary['light_energy'], width=0.4, color='r', label='失负荷电量')
+    plt.title('逐日弃风与失负荷电量', fontproperties=font, fontsize=16)
+    plt.ylabel('电量 (MWh)', fontproperties=font)
+    plt.xlabel('天数', fontproperties=font)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(prop=font, loc='best')
+    plt.tight_layout()
+    plt.savefig('第七问分块调度统计图.png', dpi=300)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
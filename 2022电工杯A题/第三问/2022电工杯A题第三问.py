@@ -4,6 +4,12 @@ from matplotlib.font_manager import FontProperties
 import math
 import pandas as pd
 import os
+import sys
+
+# 共享的数据模块和机组模块位于上级目录（2022电工杯A题/data_cache.py、unit_fleet.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu, load_wind_pu
+from unit_fleet import economic_dispatch_batch
 
 # 设置中文字体
 font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
@@ -19,83 +25,19 @@ def load_units_data():
 
 
 def load_demand_data():
-    """从Excel文件中读取负荷数据"""
-    # 读取Excel文件
-    df = pd.read_excel('C:/Users/HP/Desktop/问题一数据.xlsx', sheet_name='Sheet1')
-    # 提取负荷功率(p.u.)列并转换为实际功率（MW）
-    load_demand = df['负荷功率(p.u.)'].values * 900
+    """读取负荷数据（问题一数据.xlsx 只解析一次，之后读取二进制缓存）"""
+    # 负荷功率(p.u.)转换为实际功率（MW）
+    load_demand = load_demand_pu() * 900
     return load_demand.tolist()
 
 
 def load_wind_data():
-    """从Excel文件中读取风电数据（600MW）"""
-    # 读取Excel文件
-    df = pd.read_excel('C:/Users/HP/Desktop/问题三数据.xlsx', sheet_name='Sheet1')
-    # 提取风电功率(p.u.)列并转换为实际功率（MW）
-    wind_power = df['风电功率(p.u.)'].values * 600
+    """读取风电数据（600MW）"""
+    # 风电功率(p.u.)转换为实际功率（MW）
+    wind_power = load_wind_pu('三') * 600
     return wind_power.tolist()
 
 
-# ===================== 核心算法 =====================
-def calculate_lambda(load, units):
-    sum_inv_2a = sum(1 / (2 * u['a']) for u in units)
-    sum_b_over_2a = sum(u['b'] / (2 * u['a']) for u in units)
-    return (load + sum_b_over_2a) / sum_inv_2a
-
-
-def update_generation(lambda_val, units):
-    return [(lambda_val - u['b']) / (2 * u['a']) for u in units]
-
-
-def economic_dispatch(load, units, max_iter=20, tol=0.01):
-    n = len(units)
-    fixed = [False] * n
-    P = [0.0] * n
-
-    lambda_val = calculate_lambda(load, units)
-    P = update_generation(lambda_val, units)
-
-    for _ in range(max_iter):
-        new_fixed = fixed.copy()
-        violations = False
-
-        for i, u in enumerate(units):
-            if fixed[i]:
-                continue
-
-            if P[i] < u['P_min']:
-                P[i] = u['P_min']
-                new_fixed[i] = True
-                violations = True
-            elif P[i] > u['P_max']:
-                P[i] = u['P_max']
-                new_fixed[i] = True
-                violations = True
-
-        fixed = new_fixed
-
-        if not violations:
-            if abs(sum(P) - load) < tol:
-                break
-
-        adjustable_units = [u for i, u in enumerate(units) if not fixed[i]]
-        adjustable_indices = [i for i in range(n) if not fixed[i]]
-
-        if not adjustable_units:
-            break
-
-        fixed_power = sum(P[i] for i in range(n) if fixed[i])
-        remaining_load = max(load - fixed_power, 0)
-
-        lambda_val = calculate_lambda(remaining_load, adjustable_units)
-        P_adjustable = update_generation(lambda_val, adjustable_units)
-
-        for idx, i in enumerate(adjustable_indices):
-            P[i] = P_adjustable[idx]
-
-    return P
-
-
 # ===================== 主程序 =====================
 def main():
     # 加载数据
@@ -107,12 +49,12 @@ def main():
     time_points = [f"{i // 4:02d}:{15 * (i % 4):02d}" for i in range(96)]
 
     # 初始化结果存储
-    P_results = [[] for _ in range(len(units))]  # 火电机组结果
     heavy_loads = [0.0] * len(wind_power)  # 弃风存储，初始化为0
     light_loads = [0.0] * len(wind_power)  # 失负荷存储，初始话为0
+    equivalent_loads = [0.0] * len(wind_power)  # 修正后的等效负荷
     power_balance = []  # 功率平衡值存储
 
-    # 执行经济调度
+    # 计算弃风、失负荷及修正后的等效负荷
     for i, load_val in enumerate(load_demand):
         # 计算等效负荷（总负荷减去风电）
         equivalent_load = load_val - wind_power[i]
@@ -133,15 +75,15 @@ def main():
             equivalent_load = max_thermal_output
             light_loads[i] = light_load
 
-        # 对火电机组进行经济调度
-        P = economic_dispatch(equivalent_load, units)
+        equivalent_loads[i] = equivalent_load
 
-        # 保存结果
-        for j in range(len(units)):
-            P_results[j].append(P[j])
+    # 对火电机组进行批量经济调度
+    P_matrix = economic_dispatch_batch(equivalent_loads, units)
+    P_results = P_matrix.T.tolist()  # 火电机组结果
 
+    for i, load_val in enumerate(load_demand):
         # 计算总发电功率（火电+风电）
-        total_generation = sum(P) + wind_power[i]
+        total_generation = P_matrix[i].sum() + wind_power[i]
 
         # 计算功率平衡（总发电 - 负荷）
         balance = total_generation - load_val
@@ -0,0 +1,267 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+from itertools import product
+import pandas as pd
+import os
+import sys
+
+# 共享的数据模块和机组模块位于上级目录（2022电工杯A题/data_cache.py、unit_fleet.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu, load_wind_pu
+from unit_fleet import DispatchCurve, carbon_aware_fleet
+
+# 设置中文字体
+font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
+
+
+# ===================== 数据准备 =====================
+def load_units_data():
+    """
+    加载机组参数数据（含机组组合参数）
+    startup_cost: 启动成本（元/次），min_up / min_down: 最小开机/停机时间（15分钟时段数）
+    题目未给出启停参数，此处为按机组容量设定的假设值
+    """
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72,
+         'startup_cost': 60000, 'min_up': 32, 'min_down': 32},
+        {'name': '机组2', 'P_max': 300, 'P_min': 90, 'a': 0.588, 'b': 65.12, 'c': 451.32, 'emission': 0.75,
+         'startup_cost': 25000, 'min_up': 16, 'min_down': 16}
+    ]
+
+
+def load_demand_data():
+    """读取负荷数据（问题一数据.xlsx 只解析一次，之后读取二进制缓存）"""
+    # 负荷功率(p.u.)转换为实际功率（MW）
+    load_demand = load_demand_pu() * 900
+    return load_demand.tolist()
+
+
+def load_wind_data():
+    """读取风电数据"""
+    # 风电功率(p.u.)转换为实际功率（MW）
+    wind_power = load_wind_pu('二') * 300
+    return wind_power.tolist()
+
+
+# ===================== 机组组合（动态规划） =====================
+def enumerate_commitment_states(units, carbon_price=0.0, max_enumerate=8):
+    """
+    生成候选开机组合
+    机组数不超过 max_enumerate 时枚举全部 2^n 种组合；
+    否则按满负荷平均成本排序的优先顺序表只保留“前k台开机”的 n+1 种组合
+    :return: 布尔矩阵 (状态数, 机组数)
+    """
+    fleet = carbon_aware_fleet(units, carbon_price)
+    n = len(fleet)
+    if n <= max_enumerate:
+        return np.array(list(product([False, True], repeat=n)), dtype=bool)
+
+    # 满负荷平均成本（元/MWh）越低越优先开机
+    full_load_cost = (fleet.a * fleet.P_max ** 2 + fleet.b * fleet.P_max + fleet.c) / fleet.P_max
+    order = np.argsort(full_load_cost)
+    states = np.zeros((n + 1, n), dtype=bool)
+    for k in range(1, n + 1):
+        states[k, order[:k]] = True
+    return states
+
+
+def calculate_state_costs(loads, units, states, carbon_price=0.0,
+                          curtailment_price=0.3, shedding_price=8.0):
+    """
+    计算每个开机组合在每个时刻的运行成本（内层经济调度使用预计算调度曲线）
+    等效负荷低于开机机组最小出力之和时弃风，高于最大出力之和时失负荷
+    :param loads: 各时刻等效负荷 (MW)
+    :param curtailment_price: 弃风损失单价 (元/kWh)
+    :param shedding_price: 失负荷损失单价 (元/kWh)
+    :return: (成本矩阵 (状态数, T) 元, 出力 (状态数, T, 机组数) MW, 弃风 (状态数, T) MW, 失负荷 (状态数, T) MW)
+    """
+    loads = np.asarray(loads, dtype=float)
+    fleet = carbon_aware_fleet(units, carbon_price)
+    S, T, n = len(states), len(loads), len(fleet)
+
+    costs = np.zeros((S, T))
+    P = np.zeros((S, T, n))
+    heavy = np.zeros((S, T))
+    light = np.zeros((S, T))
+
+    for s, on in enumerate(states):
+        if on.any():
+            committed = fleet.subset(on)
+            min_output, max_output = committed.P_min.sum(), committed.P_max.sum()
+            P_on = DispatchCurve(committed).dispatch(loads)
+            P[s][:, on] = P_on
+            # 机组发电成本（元/h × 0.25h）
+            costs[s] = (committed.a * P_on ** 2 + committed.b * P_on + committed.c).sum(axis=1) * 0.25
+        else:
+            min_output = max_output = 0.0
+
+        heavy[s] = np.maximum(min_output - loads, 0)
+        light[s] = np.maximum(loads - max_output, 0)
+
+    # 弃风损失和失负荷损失（MW × 0.25h × 1000 = kWh）
+    costs += heavy * 0.25 * 1000 * curtailment_price + light * 0.25 * 1000 * shedding_price
+    return costs, P, heavy, light
+
+
+def unit_commitment_dp(loads, units, carbon_price=0.0, max_states=64, max_enumerate=8,
+                       curtailment_price=0.3, shedding_price=8.0):
+    """
+    前向动态规划求解机组组合（计及启动成本和最小开停机时间）
+    每个开机组合只保留到达该组合的最优路径及其开停机时长（经典的近似动态规划，
+    最小开停机时间较长时可能略劣于全局最优）；
+    每个时段只保留累计成本最低的 max_states 个组合继续扩展（剪枝）
+    :param loads: 各时刻等效负荷 (MW)，可为96点或1440点
+    :param units: 含 startup_cost / min_up / min_down 的机组列表
+    :param carbon_price: 碳捕集单价（元/吨）
+    :return: 结果字典：开机状态 (T, 机组数)、出力 (T, 机组数)、弃风 (T,)、失负荷 (T,)、各项成本
+    """
+    loads = np.asarray(loads, dtype=float)
+    startup_cost = np.array([u['startup_cost'] for u in units], dtype=float)
+    min_up = np.array([u['min_up'] for u in units])
+    min_down = np.array([u['min_down'] for u in units])
+
+    states = enumerate_commitment_states(units, carbon_price, max_enumerate)
+    costs, P, heavy, light = calculate_state_costs(loads, units, states, carbon_price,
+                                                   curtailment_price, shedding_price)
+    S, T = costs.shape
+
+    # 状态转移的启动成本 (前一状态, 后一状态)
+    starting = ~states[:, None, :] & states[None, :, :]
+    stopping = states[:, None, :] & ~states[None, :, :]
+    transition_cost = (starting * startup_cost).sum(axis=2)
+
+    # 初始状态：全部机组已开机且满足最小开机时间
+    all_on = np.flatnonzero(states.all(axis=1))[0]
+    accumulated = np.full(S, np.inf)
+    accumulated[all_on] = 0.0
+    up_time = np.where(states, min_up, 0)
+    down_time = np.where(states, 0, min_down)
+
+    back_pointer = np.zeros((T, S), dtype=int)
+    for t in range(T):
+        live = np.flatnonzero(np.isfinite(accumulated))
+
+        # 最小开停机时间约束：开机需停机满 min_down，停机需开机满 min_up
+        allowed = ~((starting[live] & (down_time[live][:, None, :] < min_down)) |
+                    (stopping[live] & (up_time[live][:, None, :] < min_up))).any(axis=2)
+        total = accumulated[live][:, None] + transition_cost[live]
+        total[~allowed] = np.inf
+
+        best = np.argmin(total, axis=0)
+        prev = live[best]
+        accumulated = total[best, np.arange(S)] + costs[:, t]
+        back_pointer[t] = prev
+
+        # 更新各状态最优路径上的连续开停机时长
+        up_time = np.where(states, up_time[prev] + 1, 0)
+        down_time = np.where(states, 0, down_time[prev] + 1)
+
+        # 剪枝：只保留累计成本最低的 max_states 个状态
+        if S > max_states:
+            accumulated[np.argsort(accumulated)[max_states:]] = np.inf
+
+    # 回溯最优开机序列
+    path = np.zeros(T, dtype=int)
+    path[-1] = np.argmin(accumulated)
+    for t in range(T - 1, 0, -1):
+        path[t - 1] = back_pointer[t, path[t]]
+
+    commitment = states[path]
+    previous = np.vstack([states[all_on], commitment[:-1]])
+    startups = ~previous & commitment
+    periods = np.arange(T)
+
+    return {
+        'commitment': commitment,
+        'P': P[path, periods],
+        'heavy_loads': heavy[path, periods],
+        'light_loads': light[path, periods],
+        'operation_cost': costs[path, periods].sum(),
+        'startup_cost': (startups * startup_cost).sum(),
+        'total_cost': accumulated.min()
+    }
+
+
+# ===================== 主程序 =====================
+def main():
+    # 加载数据
+    units = load_units_data()
+    load_demand = load_demand_data()
+    wind_power = load_wind_data()  # 加载风电数据（300MW）
+    carbon_price = 60  # 碳捕集单价（元/吨）
+
+    # 准备时间轴
+    time_points = [f"{i // 4:02d}:{15 * (i % 4):02d}" for i in range(96)]
+
+    # 计算等效负荷（总负荷减去风电）
+    equivalent_loads = np.array(load_demand) - np.array(wind_power)
+
+    # 机组组合优化
+    result = unit_commitment_dp(equivalent_loads, units, carbon_price)
+
+    # 对照方案：全天两台机组均开机
+    all_on = np.ones((1, len(units)), dtype=bool)
+    base_costs, _, base_heavy, base_light = calculate_state_costs(equivalent_loads, units, all_on, carbon_price)
+
+    print("===== 机组组合优化结果 =====")
+    for j, u in enumerate(units):
+        on_periods = result['commitment'][:, j].sum()
+        print(f"{u['name']} 开机时段数: {on_periods}/96")
+    print(f"运行成本（含弃风、失负荷损失）: {result['operation_cost'] / 10000:.2f} 万元")
+    print(f"启动成本: {result['startup_cost'] / 10000:.2f} 万元")
+    print(f"总成本: {result['total_cost'] / 10000:.2f} 万元")
+    print(f"弃风量: {result['heavy_loads'].sum() * 0.25:.2f} MWh")
+    print(f"失负荷量: {result['light_loads'].sum() * 0.25:.2f} MWh")
+
+    print("\n===== 全天全部开机方案 =====")
+    print(f"总成本: {base_costs.sum() / 10000:.2f} 万元")
+    print(f"弃风量: {base_heavy.sum() * 0.25:.2f} MWh")
+    print(f"失负荷量: {base_light.sum() * 0.25:.2f} MWh")
+
+    # 可视化结果
+    plt.figure(figsize=(14, 10))
+
+    # 子图1: 发电计划曲线
+    plt.subplot(2, 1, 1)
+    plt.plot(equivalent_loads, 'k-', linewidth=2, label='等效负荷')
+    colors = ['r-', 'g-', 'b-']
+    for j, u in enumerate(units):
+        plt.plot(result['P'][:, j], colors[j], label=f"{u['name']} ({u['P_min']}-{u['P_max']}MW)")
+    plt.plot(result['heavy_loads'], 'c--', label='弃风量')
+    plt.title('机组组合优化后的发电计划曲线', fontproperties=font, fontsize=16)
+    plt.ylabel('出力 (MW)', fontproperties=font)
+    plt.xticks(range(0, 96, 4), time_points[::4], rotation=45)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(prop=font, loc='best')
+
+    # 子图2: 开停机状态
+    plt.subplot(2, 1, 2)
+    for j, u in enumerate(units):
+        plt.step(range(96), result['commitment'][:, j] + 1.5 * j, colors[j], where='post', label=u['name'])
+    plt.title('机组开停机状态', fontproperties=font, fontsize=16)
+    plt.ylabel('开机状态', fontproperties=font)
+    plt.xlabel('时间', fontproperties=font)
+    plt.xticks(range(0, 96, 4), time_points[::4], rotation=45)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(prop=font, loc='best')
+
+    plt.tight_layout()
+    plt.savefig('第二问机组组合曲线图.png', dpi=300)
+    plt.show()
+
+    # 保存机组组合结果为Excel文件
+    data = {'时间': time_points, '等效负荷(MW)': equivalent_loads}
+    for j, u in enumerate(units):
+        data[f"{u['name']}状态"] = result['commitment'][:, j].astype(int)
+        data[f"{u['name']}出力(MW)"] = result['P'][:, j]
+    data['弃风量(MW)'] = result['heavy_loads']
+    data['失负荷量(MW)'] = result['light_loads']
+
+    excel_path = '机组组合结果.xlsx'
+    pd.DataFrame(data).to_excel(excel_path, index=False)
+    print(f"机组组合结果已保存到: {excel_path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
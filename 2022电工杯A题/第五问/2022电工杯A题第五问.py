@@ -1,6 +1,12 @@
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.font_manager import FontProperties
-import pandas as pd
+import os
+import sys
+
+# 共享数据模块位于上级目录（2022电工杯A题/data_cache.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu, load_wind_pu
 
 # 设置中文字体
 font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
@@ -15,16 +21,16 @@ def load_units_data():
 
 
 def load_demand_data():
-    """从Excel文件中读取负荷数据"""
-    df = pd.read_excel('C:/Users/HP/Desktop/问题一数据.xlsx', sheet_name='Sheet1')
-    load_demand = df['负荷功率(p.u.)'].values * 900
+    """读取负荷数据（问题一数据.xlsx 只解析一次，之后读取二进制缓存）"""
+    # 负荷功率(p.u.)转换为实际功率（MW）
+    load_demand = load_demand_pu() * 900
     return load_demand.tolist()
 
 
 def load_wind_data():
-    """从Excel文件中读取风电数据（900MW）"""
-    df = pd.read_excel('C:/Users/HP/Desktop/问题五数据.xlsx', sheet_name='Sheet1')
-    wind_power = df['风电功率(p.u.)'].values * 900  # 900MW风电
+    """读取风电数据（900MW）"""
+    # 风电功率(p.u.)转换为实际功率（MW）
+    wind_power = load_wind_pu('五') * 900  # 900MW风电
     return wind_power.tolist()
 
 
@@ -183,6 +189,101 @@ def calculate_min_energy_storage(heavy_loads, light_loads, efficiency=0.9):
     return P_cap, E_cap, total_charge, total_discharge
 
 
+# ===================== 储能容量优化 =====================
+def simulate_storage_grid(heavy_loads, light_loads, P_caps, E_caps, efficiency=0.9):
+    """
+    对一组候选储能容量同时模拟储能运行（逐时段循环，全部候选容量按数组一次计算）
+    运行规则与 calculate_min_energy_storage 相同：弃风时充电，失负荷时放电，
+    但充放电功率受功率容量限制，储能电量受能量容量限制
+    :param heavy_loads: 弃风量列表 (MW)
+    :param light_loads: 失负荷量列表 (MW)
+    :param P_caps: 候选功率容量数组 (MW)
+    :param E_caps: 候选能量容量数组 (MWh)，与 P_caps 形状相同（可为网格）
+    :param efficiency: 充电效率
+    :return: (剩余弃风电量, 剩余失负荷电量, 总放电量) 单位：MWh，形状与 P_caps 相同
+    """
+    P_caps = np.asarray(P_caps, dtype=float)
+    E_caps = np.asarray(E_caps, dtype=float)
+    energy = np.zeros(np.broadcast(P_caps, E_caps).shape)  # 当前储能 (MWh)
+    absorbed = np.zeros_like(energy)  # 被储能吸收的弃风电量 (MWh)
+    total_discharge = np.zeros_like(energy)
+
+    for heavy, light in zip(heavy_loads, light_loads):
+        if heavy > 0:
+            # 充电功率不超过功率容量，储存电量不超过剩余能量容量
+            charge = np.minimum(np.minimum(heavy, P_caps) * 0.25 * efficiency, E_caps - energy)
+            energy += charge
+            absorbed += charge / efficiency
+        if light > 0:
+            discharge = np.minimum(np.minimum(light, P_caps) * 0.25, energy)
+            energy -= discharge
+            total_discharge += discharge
+
+    residual_heavy = sum(heavy_loads) * 0.25 - absorbed
+    residual_light = sum(light_loads) * 0.25 - total_discharge
+    return residual_heavy, residual_light, total_discharge
+
+
+def evaluate_storage_configs(heavy_loads, light_loads, P_caps, E_caps, fixed_cost, efficiency=0.9):
+    """
+    计算一组候选储能配置下的总成本
+    总成本 = 与储能无关的成本（火电、碳捕集、风电运维）+ 剩余弃风损失 + 剩余失负荷损失
+            + 储能日均投资成本 + 储能运维成本
+    :param P_caps: 候选功率容量数组 (MW)
+    :param E_caps: 候选能量容量数组 (MWh)
+    :param fixed_cost: 与储能配置无关的成本（元）
+    :return: (总成本数组, 各项指标字典) 单位：元 / MWh
+    """
+    residual_heavy, residual_light, discharge = simulate_storage_grid(
+        heavy_loads, light_loads, P_caps, E_caps, efficiency)
+    daily_investment_cost, storage_om_cost = calculate_energy_storage_cost(P_caps, E_caps, discharge)
+    heavy_load_cost = residual_heavy * 1000 * 0.3  # 弃风损失 0.3元/kWh
+    light_load_cost = residual_light * 1000 * 8.0  # 失负荷损失 8元/kWh
+    total_cost = fixed_cost + heavy_load_cost + light_load_cost + daily_investment_cost + storage_om_cost
+    return total_cost, {
+        'heavy_energy': residual_heavy, 'light_energy': residual_light, 'discharge': discharge,
+        'heavy_load_cost': heavy_load_cost, 'light_load_cost': light_load_cost,
+        'daily_investment_cost': daily_investment_cost, 'storage_om_cost': storage_om_cost
+    }
+
+
+def optimize_energy_storage(heavy_loads, light_loads, fixed_cost, efficiency=0.9, grid_size=101, refine=True):
+    """
+    在 (功率容量, 能量容量) 网格上搜索总成本最低的储能配置
+    先在全范围粗网格上搜索，再在最优点附近用细网格搜索一次
+    :param heavy_loads: 弃风量列表 (MW)
+    :param light_loads: 失负荷量列表 (MW)
+    :param fixed_cost: 与储能配置无关的成本（元）
+    :param grid_size: 每个方向的网格点数
+    :return: 结果字典：最优功率容量、能量容量、各项成本，以及粗网格上的总成本矩阵
+    """
+    # 搜索范围：功率不超过最大弃风/失负荷功率，能量不超过全部弃风可储存的电量
+    P_upper = max(max(heavy_loads), max(light_loads))
+    E_upper = sum(heavy_loads) * 0.25 * efficiency
+
+    P_grid = np.linspace(0, P_upper, grid_size)
+    E_grid = np.linspace(0, E_upper, grid_size)
+    P_caps, E_caps = np.meshgrid(P_grid, E_grid, indexing='ij')
+    total_cost, parts = evaluate_storage_configs(heavy_loads, light_loads, P_caps, E_caps, fixed_cost, efficiency)
+    coarse = (P_grid, E_grid, total_cost)
+
+    if refine:
+        # 在粗网格最优点两侧各一个网格步长的范围内细化
+        i, j = np.unravel_index(np.argmin(total_cost), total_cost.shape)
+        P_step, E_step = P_grid[1] - P_grid[0], E_grid[1] - E_grid[0]
+        P_fine = np.linspace(max(P_grid[i] - P_step, 0), min(P_grid[i] + P_step, P_upper), grid_size)
+        E_fine = np.linspace(max(E_grid[j] - E_step, 0), min(E_grid[j] + E_step, E_upper), grid_size)
+        P_caps, E_caps = np.meshgrid(P_fine, E_fine, indexing='ij')
+        total_cost, parts = evaluate_storage_configs(heavy_loads, light_loads, P_caps, E_caps, fixed_cost,
+                                                     efficiency)
+
+    best = np.unravel_index(np.argmin(total_cost), total_cost.shape)
+    result = {'P_cap': P_caps[best], 'E_cap': E_caps[best], 'total_cost': total_cost[best]}
+    result.update({key: value[best] for key, value in parts.items()})
+    result['coarse_grid'] = coarse
+    return result
+
+
 # ===================== 主程序 =====================
 def main():
     # 加载数据
@@ -284,6 +385,40 @@ def main():
     print(f"总发电成本: {total_generation_cost / 10000:.2f} 万元")
     print(f"单位供电成本: {unit_supply_cost:.4f} 元/kWh")
 
+    # ===================== 储能容量优化 =====================
+    # 与储能配置无关的成本（火电、碳捕集、风电运维）
+    fixed_cost = operation_cost + carbon_cost + wind_om_cost
+    best = optimize_energy_storage(heavy_loads, light_loads, fixed_cost)
+    best_unit_cost = best['total_cost'] / (total_load_energy * 1000)
+
+    # 按相同运行规则计算最小储能配置的总成本，作为对照
+    min_config_cost, _ = evaluate_storage_configs(heavy_loads, light_loads, P_cap, E_cap, fixed_cost)
+
+    print("\n============== 储能容量优化结果 ==============")
+    print(f"最优功率容量: {best['P_cap']:.2f} MW, 最优能量容量: {best['E_cap']:.2f} MWh")
+    print(f"剩余弃风量: {best['heavy_energy']:.2f} MWh, 剩余失负荷量: {best['light_energy']:.2f} MWh")
+    print(f"弃风损失: {best['heavy_load_cost'] / 10000:.2f} 万元")
+    print(f"失负荷损失: {best['light_load_cost'] / 10000:.2f} 万元")
+    print(f"储能日均投资成本: {best['daily_investment_cost'] / 10000:.2f} 万元")
+    print(f"储能运维成本: {best['storage_om_cost'] / 10000:.2f} 万元")
+    print(f"总发电成本: {best['total_cost'] / 10000:.2f} 万元"
+          f"（最小储能配置为 {min_config_cost / 10000:.2f} 万元）")
+    print(f"单位供电成本: {best_unit_cost:.4f} 元/kWh")
+
+    # 总成本随储能容量的变化
+    P_grid, E_grid, cost_grid = best['coarse_grid']
+    plt.figure(figsize=(8, 6))
+    contour = plt.contourf(E_grid, P_grid, cost_grid / 10000, levels=30, cmap='viridis')
+    plt.colorbar(contour, label='总发电成本 (万元)')
+    plt.plot(best['E_cap'], best['P_cap'], 'r*', markersize=12, label='最优配置')
+    plt.plot(E_cap, P_cap, 'wo', markersize=6, label='最小储能配置')
+    plt.title('储能容量与总发电成本', fontproperties=font, fontsize=16)
+    plt.xlabel('能量容量 (MWh)', fontproperties=font)
+    plt.ylabel('功率容量 (MW)', fontproperties=font)
+    plt.legend(prop=font, loc='best')
+    plt.tight_layout()
+    plt.savefig('第五问储能容量优化图.png', dpi=300)
+
     # ===================== 可视化结果 =====================
     plt.figure(figsize=(14, 10))
 
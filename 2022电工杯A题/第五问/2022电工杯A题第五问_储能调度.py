@@ -0,0 +1,278 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+import os
+import sys
+from scipy import sparse
+
+# 共享数据模块和二次规划求解器位于上级目录（2022电工杯A题/data_cache.py、sparse_qp.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu, load_wind_pu, load_attachment2
+from sparse_qp import solve_sparse_qp
+
+# 设置中文字体
+font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
+
+
+# ===================== 数据准备 =====================
+def load_units_data():
+    """加载机组参数数据（只保留1号机组）"""
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72}
+    ]
+
+
+# ===================== 成本计算函数 =====================
+def calculate_energy_storage_cost(P_cap, E_cap, discharge_energy):
+    """
+    计算储能成本
+    :param P_cap: 功率容量 (MW) 是指单位时间内充放电的最大功率，对应表格中单位功率成本
+    :param E_cap: 能量容量 (MWh) 是指能够储存的最大容量，对应表格中单位能量成本
+    :param discharge_energy: 总放电能量 (MWh)
+    :return: (日均投资成本, 运维成本) 单位：元
+    """
+    # 储能成本参数（附表3）
+    power_cost_per_kw = 3000  # 单位功率成本 (元/kW)
+    energy_cost_per_kwh = 3000  # 单位能量成本 (元/kWh)
+    om_cost_per_kwh = 0.05  # 单位电量运维成本 (元/kWh)
+    lifetime_years = 10  # 运行年限
+
+    # 计算总投资成本
+    total_investment = (P_cap * 1000 * power_cost_per_kw) + (E_cap * 1000 * energy_cost_per_kwh)
+
+    # 日均投资成本 = 总投资成本 / (运行年限 * 365)
+    daily_investment_cost = total_investment / (lifetime_years * 365)
+
+    # 运维成本 = 放电电量 × 单位运维成本 （运维是指在放电过程中）
+    om_cost = discharge_energy * 1000 * om_cost_per_kwh
+
+    return daily_investment_cost, om_cost
+
+
+# ===================== 储能配置计算 =====================
+def calculate_min_energy_storage(heavy_loads, light_loads, efficiency=0.9):
+    """
+    计算最小储能容量配置
+    :param heavy_loads: 弃风量列表 (MW)
+    :param light_loads: 失负荷量列表 (MW)
+    :param efficiency: 充放电效率
+    :return: (功率容量, 能量容量, 总充电量, 总放电量) 单位：MW, MWh, MWh, MWh
+    """
+    # 确定功率容量 (MW)
+    max_heavy = max(heavy_loads) if heavy_loads else 0
+    max_light = max(light_loads) if light_loads else 0
+    P_cap = max(max_heavy, max_light)
+
+    # 计算能量容量 (MWh)
+    current_energy = 0  # 当前储能 (MWh)
+    max_energy = 0  # 最大储能 (MWh)
+    total_charge = 0  # 总充电量 (MWh)
+    total_discharge = 0  # 总放电量 (MWh)
+
+    # 模拟储能运行
+    for i in range(len(heavy_loads)):
+        # 充电阶段：利用弃风充电
+        if heavy_loads[i] > 0:
+            # 实际存储能量 = 充电功率 × 时间 × 效率
+            charge_energy = heavy_loads[i] * 0.25 * efficiency
+            # 更新储能
+            current_energy += charge_energy
+            total_charge += charge_energy
+            # 更新最大储能
+            if current_energy > max_energy:
+                max_energy = current_energy
+
+        # 放电阶段：弥补失负荷
+        if light_loads[i] > 0:
+            # 实际可放电量 = min(需求功率 × 时间, 当前储能)
+            discharge_energy = min(light_loads[i] * 0.25, current_energy)
+            # 更新储能
+            current_energy -= discharge_energy
+            total_discharge += discharge_energy
+
+    # 能量容量 = 最大储能
+    E_cap = max_energy
+
+    return P_cap, E_cap, total_charge, total_discharge
+
+
+# ===================== 火电-储能联合优化调度 =====================
+def optimal_storage_schedule(load_demand, wind_power, units, P_cap, E_cap, carbon_price=60, efficiency=0.9):
+    """
+    火电-储能联合优化调度（二次规划）
+    变量（每个15分钟时段）：火电出力P、充电功率、放电功率、弃风功率、失负荷功率、时段末储能电量E
+    min  Σ 1.5×煤价×(aP²+bP+c)×0.25 + 碳捕集成本 + 弃风损失 + 失负荷损失 + 储能运维成本
+    s.t. P + 风电 - 弃风 + 放电 - 充电 + 失负荷 = 负荷
+         E[t] = E[t-1] + 充电×0.25×效率 - 放电×0.25，且 E[-1] = E[T-1]（首末储能电量相等）
+         P_min ≤ P ≤ P_max，0 ≤ 充放电 ≤ P_cap，0 ≤ E ≤ E_cap，0 ≤ 弃风 ≤ 风电，失负荷 ≥ 0
+    :param load_demand: 负荷 (MW)，96点或1440点
+    :param wind_power: 风电出力 (MW)
+    :param units: 机组列表（只含一台火电机组）
+    :param P_cap: 储能功率容量 (MW)
+    :param E_cap: 储能能量容量 (MWh)
+    :param carbon_price: 碳捕集单价（元/吨）
+    :param efficiency: 充电效率（与 calculate_min_energy_storage 相同，放电不计损耗）
+    :return: 结果字典：各变量的时间序列 (MW / MWh)
+    """
+    load_demand = np.asarray(load_demand, dtype=float)
+    wind_power = np.asarray(wind_power, dtype=float)
+    unit = units[0]
+    T = len(load_demand)
+    m = 6  # 每个时段的变量数
+    t_idx = np.arange(T)
+    P, ch, dis, cur, shed, E = (t_idx * m + k for k in range(m))
+
+    # 目标函数（元/时段）：火电成本按 1.5×煤价 计入运维，一次项另加碳捕集成本
+    k = 1.5 * 700 / 1000
+    q = np.zeros(T * m)
+    c = np.zeros(T * m)
+    q[P] = 2 * k * unit['a'] * 0.25
+    c[P] = (k * unit['b'] + unit['emission'] * carbon_price) * 0.25
+    c[cur] = 0.3 * 1000 * 0.25  # 弃风损失 0.3元/kWh
+    c[shed] = 8.0 * 1000 * 0.25  # 失负荷损失 8元/kWh
+    c[dis] = 0.05 * 1000 * 0.25  # 储能运维成本 0.05元/kWh（按放电量）
+
+    # 等式约束：功率平衡（T行）和储能电量递推（T行，首时段接末时段形成循环）
+    rows = np.concatenate([t_idx] * 5 + [T + t_idx] * 4)
+    cols = np.concatenate([P, cur, dis, ch, shed, E, np.roll(E, 1), ch, dis])
+    vals = np.concatenate([np.ones(T), -np.ones(T), np.ones(T), -np.ones(T), np.ones(T),
+                           np.ones(T), -np.ones(T), np.full(T, -0.25 * efficiency), np.full(T, 0.25)])
+    A = sparse.csr_matrix((vals, (rows, cols)), shape=(2 * T, T * m))
+    b = np.concatenate([load_demand - wind_power, np.zeros(T)])
+
+    # 不等式约束（变量上下限）：每行 ±x[col] ≤ rhs
+    bounds = [(P, 1.0, unit['P_max']), (P, -1.0, -unit['P_min']),
+              (ch, 1.0, P_cap), (ch, -1.0, 0.0), (dis, 1.0, P_cap), (dis, -1.0, 0.0),
+              (cur, 1.0, wind_power), (cur, -1.0, 0.0), (shed, -1.0, 0.0),
+              (E, 1.0, E_cap), (E, -1.0, 0.0)]
+    G = sparse.csr_matrix((
+        np.concatenate([np.full(T, sign) for _, sign, _ in bounds]),
+        (np.arange(T * len(bounds)), np.concatenate([col for col, _, _ in bounds]))
+    ), shape=(T * len(bounds), T * m))
+    h = np.concatenate([np.broadcast_to(rhs, T).astype(float) for _, _, rhs in bounds])
+
+    x = solve_sparse_qp(q, c, A, b, G, h)
+    return {'thermal_power': x[P], 'charge': x[ch], 'discharge': x[dis],
+            'heavy_loads': x[cur], 'light_loads': x[shed], 'energy': x[E]}
+
+
+def rule_based_schedule(load_demand, wind_power, units, P_cap, E_cap, efficiency=0.9):
+    """
+    原有运行规则：火电按等效负荷截断在上下限，弃风时充电、失负荷时放电
+    :return: 结果字典，键与 optimal_storage_schedule 相同
+    """
+    unit = units[0]
+    equivalent_loads = np.asarray(load_demand, dtype=float) - np.asarray(wind_power, dtype=float)
+    thermal_power = np.clip(equivalent_loads, unit['P_min'], unit['P_max'])
+    heavy_loads = np.maximum(unit['P_min'] - equivalent_loads, 0)
+    light_loads = np.maximum(equivalent_loads - unit['P_max'], 0)
+
+    energy = np.zeros(len(equivalent_loads))
+    charge = np.zeros(len(equivalent_loads))
+    discharge = np.zeros(len(equivalent_loads))
+    current = 0.0
+    for i in range(len(equivalent_loads)):
+        charge[i] = min(heavy_loads[i], P_cap, (E_cap - current) / (0.25 * efficiency))
+        discharge[i] = min(light_loads[i], P_cap, current / 0.25)
+        current += charge[i] * 0.25 * efficiency - discharge[i] * 0.25
+        energy[i] = current
+
+    return {'thermal_power': thermal_power, 'charge': charge, 'discharge': discharge,
+            'heavy_loads': heavy_loads - charge, 'light_loads': light_loads - discharge, 'energy': energy}
+
+
+def calculate_schedule_cost(schedule, wind_power, units, P_cap, E_cap, carbon_price=60):
+    """
+    计算调度结果的各项成本（与第五问单价相同），储能投资按调度天数折算
+    :return: 成本字典，单位：元
+    """
+    unit = units[0]
+    P = schedule['thermal_power']
+    fuel_cost = np.sum((unit['a'] * P ** 2 + unit['b'] * P + unit['c']) * 0.25) * 700 / 1000
+    days = len(P) / 96
+    daily_investment_cost, storage_om_cost = calculate_energy_storage_cost(
+        P_cap, E_cap, schedule['discharge'].sum() * 0.25)
+
+    costs = {
+        '火电运行成本': 1.5 * fuel_cost,
+        '碳捕集成本': np.sum(unit['emission'] * P * 0.25) * carbon_price,
+        '风电运维成本': np.sum(wind_power) * 0.25 * 1000 * 0.045,
+        '弃风损失': schedule['heavy_loads'].sum() * 0.25 * 1000 * 0.3,
+        '失负荷损失': schedule['light_loads'].sum() * 0.25 * 1000 * 8.0,
+        '储能投资成本': daily_investment_cost * days,
+        '储能运维成本': storage_om_cost
+    }
+    costs['总成本'] = sum(costs.values())
+    return costs
+
+
+# ===================== 主程序 =====================
+def main():
+    units = load_units_data()  # 只保留机组1
+    unit = units[0]
+    carbon_price = 60  # 单位碳捕集成本 (元/t)
+
+    cases = [
+        ('第五问（96点）', load_demand_pu() * 900, load_wind_pu('五') * 900),
+        ('第七问（15天1440点）', *load_attachment2())
+    ]
+
+    schedules = []
+    for name, load_demand, wind_power in cases:
+        load_demand = np.asarray(load_demand, dtype=float)
+        wind_power = np.asarray(wind_power, dtype=float)
+
+        # 储能容量取第五问的最小储能配置
+        equivalent_loads = load_demand - wind_power
+        heavy_loads = np.maximum(unit['P_min'] - equivalent_loads, 0)
+        light_loads = np.maximum(equivalent_loads - unit['P_max'], 0)
+        P_cap, E_cap, _, _ = calculate_min_energy_storage(list(heavy_loads), list(light_loads))
+
+        rule = rule_based_schedule(load_demand, wind_power, units, P_cap, E_cap)
+        optimal = optimal_storage_schedule(load_demand, wind_power, units, P_cap, E_cap, carbon_price)
+        rule_cost = calculate_schedule_cost(rule, wind_power, units, P_cap, E_cap, carbon_price)
+        optimal_cost = calculate_schedule_cost(optimal, wind_power, units, P_cap, E_cap, carbon_price)
+
+        print(f"\n============== {name} ==============")
+        print(f"储能配置: 功率容量 {P_cap:.2f} MW, 能量容量 {E_cap:.2f} MWh")
+        print(f"{'成本项':<10}{'规则调度(万元)':>14}{'优化调度(万元)':>14}")
+        for key in rule_cost:
+            print(f"{key:<10}{rule_cost[key] / 10000:>16.2f}{optimal_cost[key] / 10000:>16.2f}")
+        print(f"弃风电量: 规则调度 {rule['heavy_loads'].sum() * 0.25:.2f} MWh, "
+              f"优化调度 {optimal['heavy_loads'].sum() * 0.25:.2f} MWh")
+        print(f"失负荷电量: 规则调度 {rule['light_loads'].sum() * 0.25:.2f} MWh, "
+              f"优化调度 {optimal['light_loads'].sum() * 0.25:.2f} MWh")
+        schedules.append((load_demand, wind_power, optimal))
+
+    # 96点优化调度曲线
+    load_demand, wind_power, optimal = schedules[0]
+    time_points = [f"{i // 4:02d}:{15 * (i % 4):02d}" for i in range(96)]
+
+    plt.figure(figsize=(14, 10))
+    plt.subplot(2, 1, 1)
+    plt.plot(load_demand, 'k-', linewidth=2, label='系统日总负荷')
+    plt.plot(optimal['thermal_power'], 'r-', label=f"机组1 ({unit['P_min']}-{unit['P_max']}MW)")
+    plt.plot(wind_power - optimal['heavy_loads'], 'c-', label='风电实际出力')
+    plt.plot(optimal['discharge'] - optimal['charge'], 'g-', label='储能放电(+)/充电(-)')
+    plt.title('火电-储能联合优化调度曲线', fontproperties=font, fontsize=16)
+    plt.ylabel('出力 (MW)', fontproperties=font)
+    plt.xticks(range(0, 96, 4), time_points[::4], rotation=45)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(prop=font, loc='best')
+
+    plt.subplot(2, 1, 2)
+    plt.plot(optimal['energy'], 'b-', label='储能电量')
+    plt.title('储能电量曲线', fontproperties=font, fontsize=16)
+    plt.ylabel('电量 (MWh)', fontproperties=font)
+    plt.xlabel('时间', fontproperties=font)
+    plt.xticks(range(0, 96, 4), time_points[::4], rotation=45)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(prop=font, loc='best')
+
+    plt.tight_layout()
+    plt.savefig('第五问储能优化调度曲线图.png', dpi=300)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
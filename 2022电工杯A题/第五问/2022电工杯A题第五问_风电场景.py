@@ -0,0 +1,226 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+import pandas as pd
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# 共享的数据模块和机组模块位于上级目录（2022电工杯A题/data_cache.py、unit_fleet.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu, load_wind_pu
+from unit_fleet import economic_dispatch_batch
+
+# 设置中文字体
+font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
+
+
+# ===================== 数据准备 =====================
+def load_units_data():
+    """加载机组参数数据（包含碳排放强度）"""
+    return [
+        {'name': '机组1', 'P_max': 600, 'P_min': 180, 'a': 0.226, 'b': 30.42, 'c': 786.80, 'emission': 0.72},
+        {'name': '机组2', 'P_max': 300, 'P_min': 90, 'a': 0.588, 'b': 65.12, 'c': 451.32, 'emission': 0.75},
+        {'name': '机组3', 'P_max': 150, 'P_min': 45, 'a': 0.785, 'b': 139.6, 'c': 1049.50, 'emission': 0.79}
+    ]
+
+
+def load_cases():
+    """
+    第二、三、五问的机组与风电配置
+    :return: [(名称, 机组下标, 风电数据所属问题, 风电装机容量MW)]
+    """
+    return [
+        ('第二问', [0, 1], '二', 300),
+        ('第三问', [0, 2], '三', 600),
+        ('第五问', [0], '五', 900)
+    ]
+
+
+# ===================== 风电场景生成 =====================
+def generate_wind_scenarios(wind_pu, n_scenarios, phi=0.9, sigma=0.1, seed=None):
+    """
+    在给定风电曲线附近生成相关的风电出力场景
+    预测误差服从AR(1)过程：e[t] = φ·e[t-1] + √(1-φ²)·σ·ε[t]，平稳标准差为σ
+    :param wind_pu: 给定的风电功率曲线（标幺值），长度T
+    :param n_scenarios: 场景数
+    :param phi: 相邻15分钟误差的自相关系数
+    :param sigma: 误差标准差（标幺值）
+    :param seed: 随机种子
+    :return: 风电场景矩阵 (场景数, T)，标幺值截断在[0, 1]
+    """
+    wind_pu = np.asarray(wind_pu, dtype=float)
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((n_scenarios, len(wind_pu))) * sigma
+
+    error = np.empty_like(noise)
+    error[:, 0] = noise[:, 0]
+    scale = np.sqrt(1 - phi ** 2)
+    for t in range(1, len(wind_pu)):
+        error[:, t] = phi * error[:, t - 1] + scale * noise[:, t]
+
+    return np.clip(wind_pu + error, 0, 1)
+
+
+# ===================== 场景成本计算（批量） =====================
+def calculate_thermal_cost_batch(units, P, carbon_price):
+    """
+    批量计算火电成本
+    :param P: 各场景各时刻机组出力 (场景数, T, 机组数) 单位：MW
+    :return: (运行成本, 碳捕集成本) 各为长度为场景数的数组，单位：元
+    """
+    a = np.array([u['a'] for u in units])
+    b = np.array([u['b'] for u in units])
+    c = np.array([u['c'] for u in units])
+    emission = np.array([u['emission'] for u in units])
+    coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
+
+    fuel_cost = np.sum((a * P ** 2 + b * P + c) * 0.25, axis=(1, 2)) * coal_price
+    carbon_emission = np.sum(emission * P * 0.25, axis=(1, 2))  # 吨
+    return 1.5 * fuel_cost, carbon_emission * carbon_price
+
+
+def calculate_wind_cost_batch(wind_power, heavy_loads):
+    """
+    批量计算风电运维成本和弃风损失（与 calculate_wind_cost 单价相同）
+    :param wind_power: 风电出力 (场景数, T) 单位：MW
+    :param heavy_loads: 弃风量 (场景数, T) 单位：MW
+    :return: (风电运维成本, 弃风损失) 各为长度为场景数的数组，单位：元
+    """
+    wind_om_cost = wind_power.sum(axis=1) * 0.25 * 1000 * 0.045
+    curtailment_cost = heavy_loads.sum(axis=1) * 0.25 * 1000 * 0.3
+    return wind_om_cost, curtailment_cost
+
+
+def calculate_light_load_cost_batch(light_loads):
+    """批量计算失负荷损失（8元/kWh），返回长度为场景数的数组，单位：元"""
+    return light_loads.sum(axis=1) * 0.25 * 1000 * 8.0
+
+
+def evaluate_scenarios(load_demand, wind_power, units, carbon_price=60):
+    """
+    对一批风电场景执行 调度 → 弃风/失负荷 → 成本 的完整计算
+    :param load_demand: 负荷曲线 (MW)，长度T
+    :param wind_power: 风电场景 (场景数, T) 单位：MW
+    :param units: 机组列表
+    :param carbon_price: 碳捕集单价（元/吨）
+    :return: 各场景指标 DataFrame
+    """
+    load_demand = np.asarray(load_demand, dtype=float)
+    S, T = wind_power.shape
+    equivalent_loads = load_demand - wind_power
+
+    # 全部场景的全部时刻一次批量调度
+    P = economic_dispatch_batch(equivalent_loads.ravel(), units).reshape(S, T, len(units))
+
+    min_output = sum(u['P_min'] for u in units)
+    max_output = sum(u['P_max'] for u in units)
+    heavy_loads = np.maximum(min_output - equivalent_loads, 0)
+    light_loads = np.maximum(equivalent_loads - max_output, 0)
+
+    operation_cost, carbon_cost = calculate_thermal_cost_batch(units, P, carbon_price)
+    wind_om_cost, curtailment_cost = calculate_wind_cost_batch(wind_power, heavy_loads)
+    light_load_cost = calculate_light_load_cost_batch(light_loads)
+    total_cost = operation_cost + carbon_cost + wind_om_cost + curtailment_cost + light_load_cost
+
+    return pd.DataFrame({
+        'heavy_energy': heavy_loads.sum(axis=1) * 0.25,  # MWh
+        'curtailment_rate': heavy_loads.sum(axis=1) / np.maximum(wind_power.sum(axis=1), 1e-9),
+        'light_energy': light_loads.sum(axis=1) * 0.25,  # MWh
+        'total_cost': total_cost,  # 元
+        'unit_supply_cost': total_cost / (load_demand.sum() * 0.25 * 1000)  # 元/kWh
+    })
+
+
+# ===================== 蒙特卡洛模拟 =====================
+def _simulate_batch(args):
+    """进程池任务：生成并评估一批场景（模块级函数，便于进程间传递）"""
+    load_demand, wind_pu, capacity, units, n_scenarios, phi, sigma, carbon_price, seed = args
+    wind_power = generate_wind_scenarios(wind_pu, n_scenarios, phi, sigma, seed) * capacity
+    return evaluate_scenarios(load_demand, wind_power, units, carbon_price)
+
+
+def run_monte_carlo(load_demand, wind_pu, capacity, units, n_scenarios=5000, phi=0.9, sigma=0.1,
+                    carbon_price=60, batch_size=1000, workers=None, seed=2022):
+    """
+    蒙特卡洛风电场景分析：场景分批，各批在进程池中并行计算
+    每批的随机种子由 SeedSequence 派生，结果与进程数无关
+    :param load_demand: 负荷曲线 (MW)
+    :param wind_pu: 给定风电曲线（标幺值）
+    :param capacity: 风电装机容量 (MW)
+    :param units: 机组列表
+    :param batch_size: 每批场景数
+    :param workers: 进程数，None 为CPU核数，1 为不使用进程池
+    :return: 各场景指标 DataFrame（行数为场景数）
+    """
+    sizes = [batch_size] * (n_scenarios // batch_size)
+    if n_scenarios % batch_size:
+        sizes.append(n_scenarios % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(np.asarray(load_demand, dtype=float), np.asarray(wind_pu, dtype=float), capacity, units,
+              size, phi, sigma, carbon_price, s) for size, s in zip(sizes, seeds)]
+
+    if workers == 1 or len(tasks) == 1:
+        results = [_simulate_batch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_batch, tasks))
+
+    return pd.concat(results, ignore_index=True)
+
+
+def summarize_scenarios(results, percentiles=(5, 50, 95)):
+    """
+    统计各指标的均值、标准差和分位数
+    :param results: run_monte_carlo 返回的各场景指标
+    :return: DataFrame，每行一个指标
+    """
+    summary = pd.DataFrame({'均值': results.mean(), '标准差': results.std()})
+    for p in percentiles:
+        summary[f'P{p}'] = results.quantile(p / 100)
+    summary.index = ['弃风电量(MWh)', '弃风率', '失负荷电量(MWh)', '总成本(元)', '单位供电成本(元/kWh)']
+    return summary
+
+
+# ===================== 主程序 =====================
+def main():
+    # 加载数据
+    all_units = load_units_data()
+    load_demand = load_demand_pu() * 900
+    carbon_price = 60  # 碳捕集单价（元/吨）
+
+    plt.figure(figsize=(14, 5))
+    with pd.ExcelWriter('风电场景分析结果.xlsx') as writer:
+        for k, (case, unit_indices, question, capacity) in enumerate(load_cases()):
+            units = [all_units[i] for i in unit_indices]
+            wind_pu = load_wind_pu(question)
+
+            # 确定性结果（给定风电曲线）作为对照
+            base = evaluate_scenarios(load_demand, wind_pu[None, :] * capacity, units, carbon_price).iloc[0]
+
+            results = run_monte_carlo(load_demand, wind_pu, capacity, units, carbon_price=carbon_price)
+            summary = summarize_scenarios(results)
+            summary.to_excel(writer, sheet_name=case)
+
+            print(f"\n===== {case}（{capacity}MW风电，{len(results)}个场景）=====")
+            print(f"给定风电曲线：弃风电量 {base['heavy_energy']:.2f} MWh，失负荷电量 {base['light_energy']:.2f} MWh，"
+                  f"单位供电成本 {base['unit_supply_cost']:.4f} 元/kWh")
+            print(summary.to_string(float_format=lambda v: f'{v:.4f}'))
+
+            # 单位供电成本分布
+            plt.subplot(1, 3, k + 1)
+            plt.hist(results['unit_supply_cost'], bins=50, color='c', alpha=0.8)
+            plt.axvline(base['unit_supply_cost'], color='r', linestyle='--', label='给定风电曲线')
+            plt.title(f'{case}单位供电成本分布', fontproperties=font, fontsize=14)
+            plt.xlabel('单位供电成本 (元/kWh)', fontproperties=font)
+            plt.grid(True, linestyle='--', alpha=0.7)
+            plt.legend(prop=font, loc='best')
+
+    plt.tight_layout()
+    plt.savefig('风电场景分析分布图.png', dpi=300)
+    plt.show()
+    print("\n场景分析结果已保存到: 风电场景分析结果.xlsx")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,6 +1,13 @@
 import numpy as np
 import pandas as pd
 import math
+import os
+import sys
+
+# 共享的数据模块和机组模块位于上级目录（2022电工杯A题/data_cache.py、unit_fleet.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_cache import load_demand_pu, load_wind_pu
+from unit_fleet import economic_dispatch_batch
 
 
 # ===================== 数据准备 =====================
@@ -13,66 +20,87 @@ def load_units_data():
 
 
 def load_demand_data():
-    """从Excel文件中读取负荷数据"""
-    # 读取Excel文件
-    df = pd.read_excel('C:/Users/HP/Desktop/问题一数据.xlsx', sheet_name='Sheet1')
-    # 提取负荷功率(p.u.)列并转换为实际功率（MW）
-    load_demand = df['负荷功率(p.u.)'].values * 900
+    """读取负荷数据（问题一数据.xlsx 只解析一次，之后读取二进制缓存）"""
+    # 负荷功率(p.u.)转换为实际功率（MW）
+    load_demand = load_demand_pu() * 900
     return load_demand.tolist()
 
 
 def load_wind_data():
-    """从Excel文件中读取风电数据（600MW）"""
-    # 读取Excel文件
-    df = pd.read_excel('C:/Users/HP/Desktop/问题三数据.xlsx', sheet_name='Sheet1')
-    # 提取风电功率(p.u.)列并转换为实际功率（MW）
-    wind_power = df['风电功率(p.u.)'].values * 600
+    """读取风电数据（600MW）"""
+    # 风电功率(p.u.)转换为实际功率（MW）
+    wind_power = load_wind_pu('三') * 600
     return wind_power.tolist()
 
 
 # ===================== 火电成本计算函数 =====================
-def calculate_thermal_cost(units, P_results, carbon_price):
-    total_fuel_cost = 0.0  # 煤耗成本（元）
-    total_om_cost = 0.0  # 运行维护成本（元）
-    total_carbon_cost = 0.0  # 碳捕集成本（元）
+def calculate_thermal_cost_components(units, P_results):
+    """
+    计算与碳捕集单价无关的火电成本分量（只需计算一次）
+    :param units: 机组列表
+    :param P_results: 各机组出力结果（列表的列表或 (机组数, T) 数组）
+    :return: (煤耗成本, 运行维护成本, 碳排放量) 单位：元, 元, 吨
+    """
+    a = np.array([u['a'] for u in units])[:, None]
+    b = np.array([u['b'] for u in units])[:, None]
+    c = np.array([u['c'] for u in units])[:, None]
+    emission = np.array([u['emission'] for u in units])
+    P = np.asarray(P_results, dtype=float)  # (机组数, T)，单位MW
 
     # 煤价（元/kg）
     coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
 
-    # 遍历每个时间点（15分钟间隔）
-    for t in range(len(P_results[0])):
-        # 遍历每台机组
-        for i, unit in enumerate(units):
-            P = P_results[i][t]  # 机组在t时刻的出力（MW）
+    # 各机组各时刻的煤耗量（kg/h），15分钟的煤耗量为其0.25倍
+    F_hourly = a * P ** 2 + b * P + c
 
-            # 计算煤耗量（kg/h）
-            F_hourly = unit['a'] * P ** 2 + unit['b'] * P + unit['c']
+    # 煤耗成本（元）
+    total_fuel_cost = np.sum(F_hourly * 0.25) * coal_price
 
-            # 15分钟的煤耗量（kg）
-            F_15min = F_hourly * 0.25
+    # 运行维护成本（元）= 0.5 * 煤耗成本  om——Operation and Maintenance（运行和维护）
+    total_om_cost = 0.5 * total_fuel_cost
 
-            # 煤耗成本（元）
-            fuel_cost = F_15min * coal_price
-            total_fuel_cost += fuel_cost
+    # 碳排放量（吨）= 发电量（MWh） × 1000 kWh/MWh × 碳排放强度（kg/kWh） / 1000
+    carbon_emission = np.sum(emission * (P * 0.25).sum(axis=1))
 
-            # 运行维护成本（元）= 0.5 * 煤耗成本
-            om_cost = 0.5 * fuel_cost
-            total_om_cost += om_cost
+    return float(total_fuel_cost), float(total_om_cost), float(carbon_emission)
 
-            # 计算发电量（MWh）
-            generation_mwh = P * 0.25  # MW × 0.25h = MWh
 
-            # 计算碳排放量（kg）
-            carbon_emission = generation_mwh * 1000 * unit['emission']  # MWh × 1000 kWh/MWh × kg/kWh
-
-            # 碳捕集成本（元）
-            carbon_cost = carbon_emission * (carbon_price / 1000)  # 碳捕集单价元/吨 = 元/1000kg
-            total_carbon_cost += carbon_cost
+def calculate_thermal_cost(units, P_results, carbon_price):
+    """
+    计算火电总成本（包括运行成本和碳捕集成本）
+    :param units: 机组列表
+    :param P_results: 各机组出力结果（列表的列表或 (机组数, T) 数组）
+    :param carbon_price: 碳捕集单价（元/吨）
+    :return: (总运行成本, 总碳捕集成本) 单位：元
+    """
+    fuel_cost, om_cost, carbon_emission = calculate_thermal_cost_components(units, P_results)
 
     # 总运行成本 = 煤耗成本 + 运行维护成本
-    total_operation_cost = total_fuel_cost + total_om_cost
+    return fuel_cost + om_cost, carbon_emission * carbon_price
 
-    return total_operation_cost, total_carbon_cost
+
+def calculate_thermal_cost_sweep(units, P_results, carbon_prices):
+    """
+    一次计算多个碳捕集单价下的火电成本（煤耗、运维和碳排放量只计算一次，碳价按广播相乘）
+    :param units: 机组列表
+    :param P_results: 各机组出力结果（列表的列表或 (机组数, T) 数组）
+    :param carbon_prices: 碳捕集单价数组（元/吨），可包含数百个价格点
+    :return: DataFrame，每行对应一个碳捕集单价，成本单位：元
+    """
+    fuel_cost, om_cost, carbon_emission = calculate_thermal_cost_components(units, P_results)
+    carbon_prices = np.asarray(carbon_prices, dtype=float)
+    operation_cost = fuel_cost + om_cost
+    carbon_cost = carbon_emission * carbon_prices
+
+    return pd.DataFrame({
+        'carbon_price': carbon_prices,
+        'fuel_cost': fuel_cost,
+        'om_cost': om_cost,
+        'operation_cost': operation_cost,
+        'carbon_emission': carbon_emission,
+        'carbon_cost': carbon_cost,
+        'total_cost': operation_cost + carbon_cost
+    })
 
 
 # ===================== 风电成本计算函数 =====================
@@ -121,66 +149,6 @@ def calculate_light_load_cost(light_loads):
     return total_light_load_cost
 
 
-# ===================== 核心算法 =====================
-def calculate_lambda(load, units):
-    sum_inv_2a = sum(1 / (2 * u['a']) for u in units)
-    sum_b_over_2a = sum(u['b'] / (2 * u['a']) for u in units)
-    return (load + sum_b_over_2a) / sum_inv_2a
-
-
-def update_generation(lambda_val, units):
-    return [(lambda_val - u['b']) / (2 * u['a']) for u in units]
-
-
-def economic_dispatch(load, units, max_iter=20, tol=0.01):
-    n = len(units)
-    fixed = [False] * n
-    P = [0.0] * n
-
-    lambda_val = calculate_lambda(load, units)
-    P = update_generation(lambda_val, units)
-
-    for _ in range(max_iter):
-        new_fixed = fixed.copy()
-        violations = False
-
-        for i, u in enumerate(units):
-            if fixed[i]:
-                continue
-
-            if P[i] < u['P_min']:
-                P[i] = u['P_min']
-                new_fixed[i] = True
-                violations = True
-            elif P[i] > u['P_max']:
-                P[i] = u['P_max']
-                new_fixed[i] = True
-                violations = True
-
-        fixed = new_fixed
-
-        if not violations:
-            if abs(sum(P) - load) < tol:
-                break
-
-        adjustable_units = [u for i, u in enumerate(units) if not fixed[i]]
-        adjustable_indices = [i for i in range(n) if not fixed[i]]
-
-        if not adjustable_units:
-            break
-
-        fixed_power = sum(P[i] for i in range(n) if fixed[i])
-        remaining_load = max(load - fixed_power, 0)
-
-        lambda_val = calculate_lambda(remaining_load, adjustable_units)
-        P_adjustable = update_generation(lambda_val, adjustable_units)
-
-        for idx, i in enumerate(adjustable_indices):
-            P[i] = P_adjustable[idx]
-
-    return P
-
-
 # ===================== 主程序 =====================
 def main():
     # 加载数据
@@ -189,11 +157,11 @@ def main():
     wind_power = load_wind_data()  # 加载风电数据（600MW）
 
     # 初始化结果存储
-    P_results = [[] for _ in range(len(units))]  # 火电机组结果
     heavy_loads = [0.0] * len(wind_power)  # 弃风存储，初始化为0
     light_loads = [0.0] * len(wind_power)  # 失负荷存储，初始化为0
+    equivalent_loads = [0.0] * len(wind_power)  # 修正后的等效负荷
 
-    # 执行经济调度
+    # 计算弃风、失负荷及修正后的等效负荷
     for i, load_val in enumerate(load_demand):
         # 计算等效负荷（总负荷减去风电）
         equivalent_load = load_val - wind_power[i]
@@ -211,12 +179,10 @@ def main():
             light_loads[i] = equivalent_load - max_thermal_output
             equivalent_load = max_thermal_output
 
-        # 对火电机组进行经济调度
-        P = economic_dispatch(equivalent_load, units)
+        equivalent_loads[i] = equivalent_load
 
-        # 保存结果
-        for j in range(len(units)):
-            P_results[j].append(P[j])
+    # 对火电机组进行批量经济调度
+    P_results = economic_dispatch_batch(equivalent_loads, units).T.tolist()  # 火电机组结果
 
     # 计算总弃风量和总失负荷量
     total_heavy_load = sum(heavy_loads) * 0.25  # 转换为MWh
@@ -232,17 +198,16 @@ def main():
     # 准备结果表格
     results_table = []
 
-    # 计算不同碳捕集单价下的成本
-    for carbon_price in carbon_prices:
-        # 计算火电成本
-        operation_cost, carbon_cost = calculate_thermal_cost(units, P_results, carbon_price)
-
-        # 计算风电成本和弃风损失
-        wind_om_cost, wind_heavy_load_cost = calculate_wind_cost(wind_power, heavy_loads)
+    # 一次计算全部碳捕集单价下的火电成本
+    cost_table = calculate_thermal_cost_sweep(units, P_results, carbon_prices)
 
-        # 计算失负荷损失
-        light_load_cost = calculate_light_load_cost(light_loads)
+    # 风电成本、弃风损失和失负荷损失与碳捕集单价无关
+    wind_om_cost, wind_heavy_load_cost = calculate_wind_cost(wind_power, heavy_loads)
+    light_load_cost = calculate_light_load_cost(light_loads)
 
+    # 计算不同碳捕集单价下的成本
+    for carbon_price, operation_cost, carbon_cost in zip(
+            carbon_prices, cost_table['operation_cost'], cost_table['carbon_cost']):
         # 总发电成本（元）= 火电成本 + 风电成本 + 弃风损失 + 失负荷损失
         total_generation_cost = operation_cost + carbon_cost + wind_om_cost + wind_heavy_load_cost + light_load_cost
 
@@ -0,0 +1,97 @@
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# 工作进程中已挂载的共享数组 {名称: (SharedMemory, 只读数组)}
+_shared = {}
+
+
+# ===================== 共享内存 =====================
+class SharedArrays:
+    """
+    将只读数据数组放入共享内存，工作进程按名称挂载，不需要为每个任务序列化一次数据
+    用法：with SharedArrays({'A_load': load, ...}) as shared: parallel_best(worker, tasks, shared)
+    """
+
+    def __init__(self, arrays):
+        self.blocks = []
+        self.spec = {}
+        self.views = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array, dtype=float)
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            view[...] = array
+            view.flags.writeable = False
+            self.blocks.append(shm)
+            self.spec[name] = (shm.name, array.shape, array.dtype.str)
+            self.views[name] = (shm, view)
+
+    def close(self):
+        """释放共享内存（由创建者调用）"""
+        _shared.clear()
+        self.views = {}
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_shared(spec):
+    """工作进程初始化函数：按 SharedArrays.spec 挂载全部共享数组"""
+    for name, (shm_name, shape, dtype) in spec.items():
+        # 进程池的工作进程与主进程共用同一个 resource_tracker，共享内存最终由主进程 close() 释放
+        shm = shared_memory.SharedMemory(name=shm_name)
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        array.flags.writeable = False
+        _shared[name] = (shm, array)
+
+
+def shared_array(name):
+    """在工作进程中按名称取得共享数组"""
+    return _shared[name][1]
+
+
+# ===================== 并行搜索 =====================
+def split_tasks(items, num_chunks):
+    """
+    将有序列表切成连续的若干段
+    :return: [(段起点下标, 段内元素列表)]，下标用于归约时按原遍历顺序决定并列最优
+    """
+    num_chunks = max(1, min(num_chunks, len(items)))
+    bounds = np.linspace(0, len(items), num_chunks + 1).astype(int)
+    return [(int(s), items[s:e]) for s, e in zip(bounds[:-1], bounds[1:]) if e > s]
+
+
+def parallel_best(worker, tasks, shared, workers=None):
+    """
+    并行执行搜索任务并按组归约出最优结果
+    worker(task) 返回 [(组名, 遍历下标, 成本, 结果)]（通常是该任务内每组的最优配置）；
+    各组取成本最低者，成本相同时取遍历下标最小者，因此结果与顺序遍历完全一致，与进程数和完成顺序无关
+    :param worker: 模块级函数（工作进程需要能导入）
+    :param tasks: 任务列表
+    :param shared: SharedArrays 对象
+    :param workers: 进程数，默认为CPU核数；为1时在当前进程中顺序执行
+    :return: {组名: (遍历下标, 成本, 结果)}
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _shared.update(shared.views)
+        outputs = [worker(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_shared, initargs=(shared.spec,)) as pool:
+            outputs = list(pool.map(worker, tasks))
+
+    best = {}
+    for output in outputs:
+        for group, index, cost, result in output:
+            if group not in best or (cost, index) < (best[group][1], best[group][0]):
+                best[group] = (index, cost, result)
+    return best
\ No newline at end of file
@@ -0,0 +1,128 @@
+import numpy as np
+
+
+# ===================== 园区能源分配 =====================
+def allocate_energy(load, pv, wind):
+    """
+    园区逐时段能源分配（优先弃风：光伏先供负荷，风电再供剩余负荷，仍不足部分从主网购电）
+    全部按数组运算，输入可以是单个园区的一维曲线，也可以是 (园区数, 时段数) 等任意形状，
+    三个输入只需能相互广播（如没有风电的园区直接传 0）
+    :param load: 负荷功率 (kW)
+    :param pv: 光伏发电功率 (kW)
+    :param wind: 风电发电功率 (kW)
+    :return: 结果字典，各项形状与广播后的输入相同：
+             pv_used 光伏利用量、wind_used 风电利用量、renew_used 可再生能源利用量、
+             pv_curtail 弃光量、wind_curtail 弃风量、curtailment 总弃电量、grid_purchase 网购电量
+    """
+    load, pv, wind = np.broadcast_arrays(np.asarray(load, dtype=float),
+                                         np.asarray(pv, dtype=float),
+                                         np.asarray(wind, dtype=float))
+
+    # 1. 光伏优先供负荷
+    pv_used = np.minimum(pv, load)
+    # 2. 风电供剩余负荷
+    wind_used = np.minimum(wind, load - pv_used)
+    # 3. 剩余负荷从主网购电
+    grid_purchase = np.maximum(load - pv_used - wind_used, 0)
+
+    # 4. 弃电：多余电量先弃风电，风电不足再弃光伏
+    pv_curtail = pv - pv_used
+    wind_curtail = wind - wind_used
+
+    return {
+        'pv_used': pv_used,
+        'wind_used': wind_used,
+        'renew_used': pv_used + wind_used,
+        'pv_curtail': pv_curtail,
+        'wind_curtail': wind_curtail,
+        'curtailment': pv_curtail + wind_curtail,
+        'grid_purchase': grid_purchase
+    }
+
+
+# ===================== 储能运行模拟 =====================
+def simulate_storage(load, pv, wind, powers, capacities, soc_min=10, soc_max=90, efficiency=0.95, soc_init=90.0,
+                     clip_soc=False):
+    """
+    多组储能配置同时模拟园区运行（逐时段递推，每个时段对全部配置按数组计算）
+    运行规则：光伏、风电先供负荷；剩余可再生能源给储能充电，仍有剩余时优先弃风；
+    负荷不足部分先由储能放电补充，再从主网购电
+    :param load: 负荷功率 (kW)，长度为T
+    :param pv: 光伏发电功率 (kW)，长度为T，或各配置不同时为 (K, T)
+    :param wind: 风电发电功率 (kW)，长度为T，或各配置不同时为 (K, T)
+    :param powers: 各配置的储能功率 (kW)，长度为K
+    :param capacities: 各配置的储能容量 (kWh)，长度为K
+    :param soc_min: SOC下限 (%)
+    :param soc_max: SOC上限 (%)
+    :param efficiency: 充放电效率
+    :param soc_init: 初始SOC (%)
+    :param clip_soc: 每个时段结束后是否将SOC限制在上下限之间
+    :return: 结果字典，各项为 (K, T) 数组：pv_used、wind_used、renew_used、renew_to_storage 储能充电功率、
+             storage_discharge 储能放电功率、curtail_pv、curtail_wind、grid_purchase、soc (%)
+    """
+    powers, capacities = np.broadcast_arrays(np.asarray(powers, dtype=float), np.asarray(capacities, dtype=float))
+    K = len(powers)
+
+    # 储能之前的能源分配（风光出力相同时只算一次，结果按配置广播）
+    allocation = allocate_energy(load, pv, wind)
+    T = allocation['pv_used'].shape[-1]
+    pv_surplus = np.broadcast_to(np.asarray(pv, dtype=float) - allocation['pv_used'], (K, T))
+    wind_surplus = np.broadcast_to(np.asarray(wind, dtype=float) - allocation['wind_used'], (K, T))
+    total_surplus = pv_surplus + wind_surplus
+    load_remain = np.broadcast_to(np.asarray(load, dtype=float) - allocation['renew_used'], (K, T))
+
+    has_storage = capacities > 0
+    safe_capacity = np.where(has_storage, capacities, 1.0)
+    energy_max = soc_max / 100 * capacities
+    energy_min = soc_min / 100 * capacities
+
+    result = {key: np.zeros((K, T)) for key in
+              ['renew_to_storage', 'storage_discharge', 'curtail_pv', 'curtail_wind', 'grid_purchase', 'soc']}
+    storage_soc = np.full(K, float(soc_init))
+
+    for t in range(T):
+        # 当前储能状态 (kWh)
+        soc_kwh = np.where(has_storage, storage_soc / 100 * capacities, 0.0)
+
+        # 剩余可再生能源充电，其余弃电（优先弃风电）
+        surplus = total_surplus[:, t]
+        charging = surplus > 0
+        max_charge_kw = np.where(has_storage, np.minimum(powers, (energy_max - soc_kwh) / efficiency), 0.0)
+        charge_kw = np.where(charging, np.minimum(surplus, max_charge_kw), 0.0)
+        soc_kwh = soc_kwh + charge_kw * efficiency
+        curtail_total = surplus - charge_kw
+        wind_curtail = np.where(charging, np.minimum(wind_surplus[:, t], curtail_total), wind_surplus[:, t])
+        result['renew_to_storage'][:, t] = charge_kw
+        result['curtail_wind'][:, t] = wind_curtail
+        result['curtail_pv'][:, t] = np.where(charging, curtail_total - wind_curtail, pv_surplus[:, t])
+
+        # 负荷不足时储能放电，仍不足部分从主网购电
+        remain = load_remain[:, t]
+        max_discharge_kw = np.minimum(powers, (soc_kwh - energy_min) * efficiency)
+        discharge_kw = np.where(has_storage & (remain > 0), np.minimum(remain, max_discharge_kw), 0.0)
+        soc_kwh = soc_kwh - discharge_kw / efficiency
+        result['storage_discharge'][:, t] = discharge_kw
+        result['grid_purchase'][:, t] = np.maximum(0, remain - discharge_kw)
+
+        # 记录SOC (%)
+        storage_soc = soc_kwh / safe_capacity * 100
+        if clip_soc:
+            storage_soc = np.clip(storage_soc, soc_min, soc_max)
+        storage_soc = np.where(has_storage, storage_soc, 0.0)
+        result['soc'][:, t] = storage_soc
+
+    result['pv_used'] = np.broadcast_to(allocation['pv_used'], (K, T))
+    result['wind_used'] = np.broadcast_to(allocation['wind_used'], (K, T))
+    result['renew_used'] = np.broadcast_to(allocation['renew_used'], (K, T))
+    return result
+
+
+def storage_grid(power_range, capacity_range):
+    """
+    储能配置网格（按功率、容量的遍历顺序展开，跳过功率为0而容量大于0的无效配置）
+    :return: (功率数组, 容量数组)
+    """
+    powers, capacities = np.meshgrid(np.asarray(power_range, dtype=float), np.asarray(capacity_range, dtype=float),
+                                     indexing='ij')
+    valid = ~((powers == 0) & (capacities > 0))
+    return powers[valid], capacities[valid]
\ No newline at end of file
@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import os
+import sys
+
+# 共享的能源分配模块位于上级目录（2024电工杯A题/park_allocation.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from park_allocation import allocate_energy
 
 # 定义所有园区的装机容量（没有的设为0）
 capacities = {
@@ -35,43 +41,19 @@ for area in ['A', 'B', 'C']:
     # 总可再生能源功率
     date[f'{area}_total_power'] = date[f'{area}_pv_power'] + date[f'{area}_wind_power']
 
-# 初始化结果列
-for area in ['A', 'B', 'C']:
-    date[f'{area}_renew_used'] = 0.0  # 可再生能源实际用量
-    date[f'{area}_curtailment'] = 0.0  # 总弃电量
-    date[f'{area}_grid_purchase'] = 0.0  # 网购电量
-    date[f'{area}_curtail_pv'] = 0.0  # 光伏弃电量
-    date[f'{area}_curtail_wind'] = 0.0  # 风电弃电量
-
-# 统一计算每个园区的能源分配
-for i, row in date.iterrows():
-    for area in ['A', 'B', 'C']:
-        load = row[f'园区{area}负荷(kW)']
-        total_power = row[f'{area}_total_power']
-        pv_power = row[f'{area}_pv_power']
-        wind_power = row[f'{area}_wind_power']
-        if total_power >= load:
-            # 可再生能源满足全部负荷
-            date.at[i, f'{area}_renew_used'] = load
-            total_curtail = total_power - load
-            date.at[i, f'{area}_curtailment'] = total_curtail
-
-            # 优先弃风电：先弃风电，风电不足再弃光伏
-            wind_curtail = min(wind_power, total_curtail)
-            pv_curtail = total_curtail - wind_curtail
-
-            # 记录弃电分配
-            date.at[i, f'{area}_curtail_pv'] = pv_curtail
-            date.at[i, f'{area}_curtail_wind'] = wind_curtail
-        else:
-            # 可再生能源不足
-            date.at[i, f'{area}_renew_used'] = total_power
-            date.at[i, f'{area}_grid_purchase'] = load - total_power
-
-            # 设置弃电量为0
-            date.at[i, f'{area}_curtailment'] = 0
-            date.at[i, f'{area}_curtail_pv'] = 0
-            date.at[i, f'{area}_curtail_wind'] = 0
+# 统一计算每个园区的能源分配（三个园区一次按数组计算，优先弃风电：先弃风电，风电不足再弃光伏）
+areas = ['A', 'B', 'C']
+allocation = allocate_energy(
+    date[[f'园区{area}负荷(kW)' for area in areas]].values.T,
+    date[[f'{area}_pv_power' for area in areas]].values.T,
+    date[[f'{area}_wind_power' for area in areas]].values.T
+)
+for k, area in enumerate(areas):
+    date[f'{area}_renew_used'] = allocation['renew_used'][k]  # 可再生能源实际用量
+    date[f'{area}_curtailment'] = allocation['curtailment'][k]  # 总弃电量
+    date[f'{area}_grid_purchase'] = allocation['grid_purchase'][k]  # 网购电量
+    date[f'{area}_curtail_pv'] = allocation['pv_curtail'][k]  # 光伏弃电量
+    date[f'{area}_curtail_wind'] = allocation['wind_curtail'][k]  # 风电弃电量
 
 # 计算总量（按小时累加）
 results = {}
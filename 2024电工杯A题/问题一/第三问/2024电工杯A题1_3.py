@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import os
+import sys
+
+# 共享的能源分配与储能模拟模块位于上级目录（2024电工杯A题/park_allocation.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from park_allocation import simulate_storage, storage_grid
 
 # 定义所有园区的装机容量
 capacities = {
@@ -46,148 +52,54 @@ for area in ['A', 'B', 'C']:
 
 
 # 储能配置优化函数
-def optimize_storage(area):
-    """为指定园区寻找最优储能配置"""
-    best_cost = float('inf')
-    best_config = (0, 0)
-    best_results = None
-    best_simulation = None
-
-    # 定义遍历范围 (功率: 0-200kW, 容量: 0-400kWh)
-    power_range = range(0, 201, 20)  # 步长20kW
-    capacity_range = range(0, 401, 40)  # 步长40kWh
-
-    for power in power_range:
-        for capacity in capacity_range:
-            # 跳过无效配置
-            if power == 0 and capacity > 0:
-                continue
-
-            # 计算储能投资成本
-            storage_investment = power * storage_params['power_cost'] + capacity * storage_params['energy_cost']
-            storage_daily_cost = storage_investment / (storage_params['lifetime'] * 365)
-
-            # 初始化储能状态
-            storage_soc = 90.0  # 初始SOC 90%
-
-            # 初始化结果列
-            simulation = {
-                'renew_used': np.zeros(len(date)),
-                'renew_to_storage': np.zeros(len(date)),
-                'storage_discharge': np.zeros(len(date)),
-                'curtail_pv': np.zeros(len(date)),
-                'curtail_wind': np.zeros(len(date)),
-                'grid_purchase': np.zeros(len(date)),
-                'soc': np.zeros(len(date)),
-                'pv_used': np.zeros(len(date)),  # 新增：记录光伏利用量
-                'wind_used': np.zeros(len(date))  # 新增：记录风电利用量
-            }
-
-            # 模拟24小时运行
-            for i, row in date.iterrows():
-                load = row[f'园区{area}负荷(kW)']
-                pv_gen = row[f'{area}_pv_power']
-                wind_gen = row[f'{area}_wind_power']
-
-                # 当前储能状态 (kWh)
-                soc_kwh = storage_soc / 100 * capacity if capacity > 0 else 0
-
-                # 1. 优先使用光伏发电
-                pv_used = min(pv_gen, load)
-                load_after_pv = load - pv_used
-
-                # 2. 然后使用风电
-                wind_used = min(wind_gen, load_after_pv)
-                load_remain = load_after_pv - wind_used
-
-                renew_used = pv_used + wind_used
-                simulation['renew_used'][i] = renew_used
-                simulation['pv_used'][i] = pv_used  # 记录光伏利用量
-                simulation['wind_used'][i] = wind_used  # 记录风电利用量
-
-                # 3. 计算剩余可再生能源
-                pv_surplus = pv_gen - pv_used
-                wind_surplus = wind_gen - wind_used
-                total_surplus = pv_surplus + wind_surplus
-
-                # 4. 剩余可再生能源处理
-                if total_surplus > 0:
-                    # 计算最大充电功率
-                    max_charge_kw = min(
-                        power,
-                        (storage_params['soc_max'] / 100 * capacity - soc_kwh) / storage_params['efficiency']
-                    ) if capacity > 0 else 0
-
-                    charge_kw = min(total_surplus, max_charge_kw)
-                    charge_actual = charge_kw * storage_params['efficiency']
-
-                    # 更新SOC
-                    soc_kwh += charge_actual
-                    simulation['renew_to_storage'][i] = charge_kw
-
-                    # 弃电分配（优先弃风电）
-                    curtail_total = total_surplus - charge_kw
-                    wind_curtail = min(wind_surplus, curtail_total)
-                    pv_curtail = curtail_total - wind_curtail
-                    simulation['curtail_pv'][i] = pv_curtail
-                    simulation['curtail_wind'][i] = wind_curtail
-                else:
-                    simulation['renew_to_storage'][i] = 0
-                    simulation['curtail_pv'][i] = pv_surplus
-                    simulation['curtail_wind'][i] = wind_surplus
-
-                # 5. 储能补充
-                if load_remain > 0 and capacity > 0:
-                    # 计算最大放电功率
-                    max_discharge_kw = min(
-                        power,
-                        (soc_kwh - storage_params['soc_min'] / 100 * capacity) * storage_params['efficiency']
-                    )
-                    discharge_kw = min(load_remain, max_discharge_kw)
-                    discharge_actual = discharge_kw / storage_params['efficiency']
-
-                    # 更新SOC
-                    soc_kwh -= discharge_actual
-                    load_remain -= discharge_kw
-                    simulation['storage_discharge'][i] = discharge_kw
-                else:
-                    simulation['storage_discharge'][i] = 0
-
-                # 6. 电网补充
-                simulation['grid_purchase'][i] = max(0, load_remain)
-
-                # 7. 记录SOC
-                storage_soc = soc_kwh / capacity * 100 if capacity > 0 else 0
-                simulation['soc'][i] = storage_soc
-
-            # 计算成本
-            total_load = date[f'园区{area}负荷(kW)'].sum()
-            pv_used_total = simulation['pv_used'].sum()
-            wind_used_total = simulation['wind_used'].sum()
-
-            renew_cost = pv_used_total * electricity_prices['pv'] + wind_used_total * electricity_prices['wind']
-            grid_cost = simulation['grid_purchase'].sum() * electricity_prices['grid']
-            total_cost = renew_cost + grid_cost + storage_daily_cost
-
-            # 更新最优配置
-            if total_cost < best_cost:
-                best_cost = total_cost
-                best_config = (power, capacity)
-                best_results = {
-                    '总负荷电量(kWh)': total_load,
-                    '弃电量(kWh)': simulation['curtail_pv'].sum() + simulation['curtail_wind'].sum(),
-                    '网购电量(kWh)': simulation['grid_purchase'].sum(),
-                    '储能充入电量(kWh)': simulation['renew_to_storage'].sum(),
-                    '储能供电量(kWh)': simulation['storage_discharge'].sum(),
-                    '光伏利用量(kWh)': pv_used_total,
-                    '风电利用量(kWh)': wind_used_total,
-                    '总供电成本(元)': total_cost,
-                    '可再生能源成本(元)': renew_cost,
-                    '网购电成本(元)': grid_cost,
-                    '储能投资成本(元)': storage_investment,
-                    '储能日分摊成本(元)': storage_daily_cost
-                }
-                best_simulation = simulation.copy()
+def optimize_storage(area, power_range=range(0, 201, 20), capacity_range=range(0, 401, 40)):
+    """
+    为指定园区寻找最优储能配置
+    全部候选配置一次模拟（逐小时递推，每小时对所有配置按数组计算），网格加密后耗时基本不变
+    :param area: 园区名称 'A'、'B' 或 'C'
+    :param power_range: 储能功率遍历范围 (kW)，默认 0-200kW、步长20kW
+    :param capacity_range: 储能容量遍历范围 (kWh)，默认 0-400kWh、步长40kWh
+    """
+    # 候选配置（跳过功率为0而容量大于0的无效配置）
+    powers, capacities_kwh = storage_grid(power_range, capacity_range)
+
+    # 计算储能投资成本
+    storage_investment = powers * storage_params['power_cost'] + capacities_kwh * storage_params['energy_cost']
+    storage_daily_cost = storage_investment / (storage_params['lifetime'] * 365)
+
+    # 模拟24小时运行（初始SOC 90%）
+    simulation = simulate_storage(date[f'园区{area}负荷(kW)'].values, date[f'{area}_pv_power'].values,
+                                  date[f'{area}_wind_power'].values, powers, capacities_kwh,
+                                  soc_min=storage_params['soc_min'], soc_max=storage_params['soc_max'],
+                                  efficiency=storage_params['efficiency'], soc_init=90.0)
+
+    # 计算成本
+    total_load = date[f'园区{area}负荷(kW)'].sum()
+    pv_used_total = simulation['pv_used'].sum(axis=1)
+    wind_used_total = simulation['wind_used'].sum(axis=1)
+
+    renew_cost = pv_used_total * electricity_prices['pv'] + wind_used_total * electricity_prices['wind']
+    grid_cost = simulation['grid_purchase'].sum(axis=1) * electricity_prices['grid']
+    total_cost = renew_cost + grid_cost + storage_daily_cost
+
+    # 最优配置（成本相同时取遍历顺序中靠前的配置）
+    k = int(np.argmin(total_cost))
+    best_config = (int(powers[k]), int(capacities_kwh[k]))
+    best_simulation = {key: values[k].copy() for key, values in simulation.items()}
+    best_results = {
+        '总负荷电量(kWh)': total_load,
+        '弃电量(kWh)': best_simulation['curtail_pv'].sum() + best_simulation['curtail_wind'].sum(),
+        '网购电量(kWh)': best_simulation['grid_purchase'].sum(),
+        '储能充入电量(kWh)': best_simulation['renew_to_storage'].sum(),
+        '储能供电量(kWh)': best_simulation['storage_discharge'].sum(),
+        '光伏利用量(kWh)': pv_used_total[k],
+        '风电利用量(kWh)': wind_used_total[k],
+        '总供电成本(元)': total_cost[k],
+        '可再生能源成本(元)': renew_cost[k],
+        '网购电成本(元)': grid_cost[k],
+        '储能投资成本(元)': storage_investment[k],
+        '储能日分摊成本(元)': storage_daily_cost[k]
+    }
 
     return best_config, best_results, best_simulation
 
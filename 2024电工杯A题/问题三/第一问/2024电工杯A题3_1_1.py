@@ -1,5 +1,11 @@
 import pandas as pd
 import numpy as np
+import os
+import sys
+
+# 共享的能源分配与储能模拟模块位于上级目录（2024电工杯A题/park_allocation.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from park_allocation import allocate_energy, simulate_storage
 
 # 定义所有园区的初始装机容量
 initial_capacities = {
@@ -51,168 +57,178 @@ for area in ['A', 'B', 'C']:
     data[f'园区{area}负荷(kW)'] = data[f'园区{area}负荷(kW)'] * 1.5
 
 
+# 批量评估风光储配置
+def evaluate_configs(area, pv_caps, wind_caps, ess_powers, ess_capacities):
+    """
+    一次评估多组风光储配置（逐小时递推，每小时对全部配置按数组计算）
+    :param area: 园区名称 'A'、'B' 或 'C'
+    :param pv_caps: 各配置的光伏容量 (kW)，长度为K
+    :param wind_caps: 各配置的风电容量 (kW)，长度为K
+    :param ess_powers: 各配置的储能功率 (kW)，长度为K
+    :param ess_capacities: 各配置的储能容量 (kWh)，长度为K
+    :return: 结果字典，各项为长度K的数组，键与 optimize_area 返回的结果相同
+    """
+    pv_caps = np.asarray(pv_caps, dtype=float)
+    wind_caps = np.asarray(wind_caps, dtype=float)
+    ess_powers = np.asarray(ess_powers, dtype=float)
+    ess_capacities = np.asarray(ess_capacities, dtype=float)
+
+    # 计算投资成本
+    investment_cost = (pv_caps * cost_params['pv'] +
+                       wind_caps * cost_params['wind'] +
+                       ess_powers * cost_params['ess_power'] +
+                       ess_capacities * cost_params['ess_energy'])
+
+    # 模拟24小时运行（园区A没有风电，园区B没有光伏；初始SOC 90%，每小时结束后SOC限制在上下限之间）
+    load = data[f'园区{area}负荷(kW)'].values
+    pv_gen = pv_caps[:, None] * data[f'{area}_pv'].values if area != 'B' else np.zeros((len(pv_caps), len(data)))
+    wind_gen = wind_caps[:, None] * data[f'{area}_wind'].values if area != 'A' else np.zeros((len(wind_caps), len(data)))
+    simulation = simulate_storage(load, pv_gen, wind_gen, ess_powers, ess_capacities,
+                                  soc_min=ess_params['soc_min'], soc_max=ess_params['soc_max'],
+                                  efficiency=ess_params['efficiency'], soc_init=90.0, clip_soc=True)
+
+    total_pv_used = simulation['pv_used'].sum(axis=1)
+    total_wind_used = simulation['wind_used'].sum(axis=1)
+    grid_purchase = simulation['grid_purchase'].sum(axis=1)
+
+    # 计算运行成本
+    renew_cost = (total_pv_used * electricity_prices['pv'] +
+                  total_wind_used * electricity_prices['wind'])
+    grid_cost = grid_purchase * electricity_prices['grid']
+    daily_operation_cost = renew_cost + grid_cost
+
+    # 计算5年总成本和单位电量成本 (元/kWh)
+    total_cost = investment_cost + daily_operation_cost * 365 * payback_period
+    total_energy_supplied = data[f'园区{area}负荷(kW)'].sum() * 365 * payback_period
+    cost_per_kwh = total_cost / total_energy_supplied if total_energy_supplied > 0 else np.zeros(len(total_cost))
+
+    return {
+        'investment_cost': investment_cost,
+        'daily_operation_cost': daily_operation_cost,
+        'total_cost': total_cost,
+        'daily_pv_used': total_pv_used,
+        'daily_wind_used': total_wind_used,
+        'daily_renew_used': total_pv_used + total_wind_used,
+        'daily_grid_purchase': grid_purchase,
+        'daily_pv_curtail': simulation['curtail_pv'].sum(axis=1),
+        'daily_wind_curtail': simulation['curtail_wind'].sum(axis=1),
+        'cost_per_kwh': cost_per_kwh
+    }
+
+
+def operation_cost_floor(area, pv_caps, wind_caps, ess_powers, ess_capacities):
+    """
+    运行成本下界（不需要逐小时模拟）
+    运行成本 = 无储能时的运行成本 - 储能放电量 × 网购电价，而储能日放电量不超过
+    各小时 min(储能功率, 缺电功率) 之和，也不超过 效率 × (初始可用电量 + 效率 × 可充入的剩余电量)
+    :return: 各配置日运行成本的下界 (元)
+    """
+    pv_caps = np.asarray(pv_caps, dtype=float)
+    wind_caps = np.asarray(wind_caps, dtype=float)
+    ess_powers = np.asarray(ess_powers, dtype=float)[:, None]
+    ess_capacities = np.asarray(ess_capacities, dtype=float)
+    load = data[f'园区{area}负荷(kW)'].values
+    pv_gen = pv_caps[:, None] * data[f'{area}_pv'].values if area != 'B' else np.zeros((len(pv_caps), len(data)))
+    wind_gen = wind_caps[:, None] * data[f'{area}_wind'].values if area != 'A' else np.zeros((len(wind_caps), len(data)))
+
+    allocation = allocate_energy(load, pv_gen, wind_gen)
+    deficit = allocation['grid_purchase']
+    surplus = allocation['curtailment']
+    operation_cost = (allocation['pv_used'].sum(axis=1) * electricity_prices['pv'] +
+                      allocation['wind_used'].sum(axis=1) * electricity_prices['wind'] +
+                      deficit.sum(axis=1) * electricity_prices['grid'])
+
+    efficiency = ess_params['efficiency']
+    initial_energy = (90.0 - ess_params['soc_min']) / 100 * ess_capacities
+    discharge_max = np.minimum(np.minimum(ess_powers, deficit).sum(axis=1),
+                               efficiency * (initial_energy + efficiency * np.minimum(ess_powers, surplus).sum(axis=1)))
+    discharge_max = np.where(ess_capacities > 0, discharge_max, 0.0)
+    return operation_cost - discharge_max * electricity_prices['grid']
+
+
+def config_grid(axes):
+    """
+    由各维取值构造配置网格，跳过无效组合（光伏和风电均为0、储能有功率无容量）
+    :param axes: [光伏容量, 风电容量, 储能功率, 储能容量] 四个取值数组
+    :return: (4, K) 配置数组
+    """
+    points = np.array(np.meshgrid(*axes, indexing='ij')).reshape(4, -1)
+    valid = ~((points[0] == 0) & (points[1] == 0)) & ~((points[2] > 0) & (points[3] == 0))
+    return points[:, valid]
+
+
 # 为每个园区优化风光储配置
-def optimize_area(area):
-    """为指定园区优化风光储配置"""
+def optimize_area(area, shrink=5, keep=3, min_step=1):
+    """
+    为指定园区优化风光储配置（由粗到细的自适应网格搜索）
+    先在原搜索范围内按粗步长（光伏/风电100kW、储能50kW/100kWh）评估全部配置，
+    再以成本最低的 keep 个配置为中心、在前一层步长范围内按缩小 shrink 倍的步长加密，直至步长为 min_step；
+    投资成本加上运行成本下界（operation_cost_floor）已超过当前最优成本的配置不再模拟
+    :param area: 园区名称 'A'、'B' 或 'C'
+    :param shrink: 每层步长缩小的倍数
+    :param keep: 每层加密的中心配置数
+    :param min_step: 最终步长 (kW / kWh)
+    """
     # 获取初始容量
     pv_capacity_init = initial_capacities[area]['pv']
     wind_capacity_init = initial_capacities[area]['wind']
 
-    # 确定搜索范围
-    pv_range = range(max(0, pv_capacity_init - 200), pv_capacity_init + 500, 100) if pv_capacity_init > 0 else [0]
-    wind_range = range(max(0, wind_capacity_init - 200), wind_capacity_init + 500, 100) if wind_capacity_init > 0 else [
-        0]
-    ess_power_range = range(0, 301, 50)
-    ess_capacity_range = range(0, 601, 100)
-
-    best_cost = float('inf')
-    best_config = {}
-    best_results = {}
-
-    # 计算该园区的日总负荷电量 (kWh)
-    daily_load_total = data[f'园区{area}负荷(kW)'].sum()
-
-    # 遍历所有可能的配置组合
-    for pv_cap in pv_range:
-        for wind_cap in wind_range:
-            # 跳过无效组合
-            if pv_cap == 0 and wind_cap == 0:
+    # 确定搜索范围（与原网格相同）和初始步长
+    lows = np.array([max(0, pv_capacity_init - 200) if pv_capacity_init > 0 else 0,
+                     max(0, wind_capacity_init - 200) if wind_capacity_init > 0 else 0, 0, 0])
+    highs = np.array([pv_capacity_init + 400 if pv_capacity_init > 0 else 0,
+                      wind_capacity_init + 400 if wind_capacity_init > 0 else 0, 300, 600])
+    steps = np.array([100, 100, 50, 100])
+
+    # 第一层：粗网格全部评估
+    points = config_grid([np.arange(lo, hi + 1, step) for lo, hi, step in zip(lows, highs, steps)])
+    evaluated = evaluate_configs(area, *points)
+    costs = evaluated['total_cost']
+    k = int(np.argmin(costs))
+    best_cost = costs[k]
+    best_point = points[:, k]
+    best_results = {key: float(values[k]) for key, values in evaluated.items()}
+
+    # 逐层加密
+    while np.any(steps > min_step):
+        new_steps = np.maximum(steps // shrink, min_step)
+        centers = points[:, np.argsort(costs, kind='stable')[:keep]]
+        level_points, level_costs = [], []
+
+        for center in centers.T:
+            box_low = np.maximum(center - steps, lows)
+            box_high = np.minimum(center + steps, highs)
+            candidates = config_grid([np.arange(lo, hi + 1, step) for lo, hi, step in zip(box_low, box_high, new_steps)])
+
+            # 成本下界剪枝
+            investment_cost = (candidates[0] * cost_params['pv'] + candidates[1] * cost_params['wind'] +
+                               candidates[2] * cost_params['ess_power'] + candidates[3] * cost_params['ess_energy'])
+            cost_floor = investment_cost + operation_cost_floor(area, *candidates) * 365 * payback_period
+            candidates = candidates[:, cost_floor < best_cost]
+            if candidates.shape[1] == 0:
                 continue
 
-            for ess_power in ess_power_range:
-                for ess_capacity in ess_capacity_range:
-                    # 跳过无效储能配置
-                    if ess_power > 0 and ess_capacity == 0:
-                        continue
-
-                    # 计算投资成本
-                    investment_cost = (pv_cap * cost_params['pv'] +
-                                       wind_cap * cost_params['wind'] +
-                                       ess_power * cost_params['ess_power'] +
-                                       ess_capacity * cost_params['ess_energy'])
-
-                    # 初始化储能状态
-                    storage_soc = 90.0  # 初始SOC 90%
-
-                    # 初始化运行结果
-                    total_pv_used = 0
-                    total_wind_used = 0
-                    grid_purchase = 0
-                    pv_curtail = 0
-                    wind_curtail = 0
-
-                    # 模拟24小时运行
-                    for _, row in data.iterrows():
-                        load = row[f'园区{area}负荷(kW)']
-                        pv_gen = pv_cap * row[f'{area}_pv'] if area != 'B' else 0
-                        wind_gen = wind_cap * row[f'{area}_wind'] if area != 'A' else 0
-
-                        # 当前储能状态 (kWh)
-                        soc_kwh = storage_soc / 100 * ess_capacity if ess_capacity > 0 else 0
-
-                        # 1. 优先使用光伏发电
-                        pv_used_hr = min(pv_gen, load)
-                        load_after_pv = load - pv_used_hr
-
-                        # 2. 然后使用风电
-                        wind_used_hr = min(wind_gen, load_after_pv)
-                        load_remain = load_after_pv - wind_used_hr
-
-                        # 更新可再生能源利用量
-                        total_pv_used += pv_used_hr
-                        total_wind_used += wind_used_hr
-
-                        # 3. 计算剩余可再生能源
-                        pv_surplus = pv_gen - pv_used_hr
-                        wind_surplus = wind_gen - wind_used_hr
-                        total_surplus = pv_surplus + wind_surplus
-
-                        # 4. 如果有剩余可再生能源，尝试存入储能
-                        if total_surplus > 0 and ess_capacity > 0:
-                            # 计算最大充电功率
-                            soc_max_kwh = ess_params['soc_max'] / 100 * ess_capacity
-                            max_charge_kw = min(
-                                ess_power,
-                                (soc_max_kwh - soc_kwh) / ess_params['efficiency']
-                            )
-                            charge_kw = min(total_surplus, max_charge_kw)
-                            charge_actual = charge_kw * ess_params['efficiency']
-
-                            # 更新SOC
-                            soc_kwh += charge_actual
-
-                            # 计算弃电（优先弃风）
-                            curtail_total = total_surplus - charge_kw
-                            wind_curtail_hr = min(wind_surplus, curtail_total)
-                            pv_curtail_hr = curtail_total - wind_curtail_hr
-
-                            # 累加弃电量
-                            wind_curtail += wind_curtail_hr
-                            pv_curtail += pv_curtail_hr
-                        else:
-                            # 没有储能或没有剩余可再生能源时，全部弃电
-                            wind_curtail += wind_surplus
-                            pv_curtail += pv_surplus
-
-                        # 5. 如果负荷仍有剩余，尝试从储能放电
-                        if load_remain > 0 and ess_capacity > 0:
-                            # 计算最大放电功率
-                            soc_min_kwh = ess_params['soc_min'] / 100 * ess_capacity
-                            max_discharge_kw = min(
-                                ess_power,
-                                (soc_kwh - soc_min_kwh) * ess_params['efficiency']
-                            )
-                            discharge_kw = min(load_remain, max_discharge_kw)
-                            discharge_actual = discharge_kw / ess_params['efficiency']
-
-                            # 更新SOC
-                            soc_kwh -= discharge_actual
-                            load_remain -= discharge_kw
-
-                        # 6. 剩余负荷由电网补充
-                        grid_purchase += max(0, load_remain)
-
-                        # 7. 更新储能状态
-                        if ess_capacity > 0:
-                            storage_soc = soc_kwh / ess_capacity * 100
-                            # 确保SOC在范围内
-                            storage_soc = max(ess_params['soc_min'], min(ess_params['soc_max'], storage_soc))
-
-                    # 计算运行成本
-                    renew_cost = (total_pv_used * electricity_prices['pv'] +
-                                  total_wind_used * electricity_prices['wind'])
-                    grid_cost = grid_purchase * electricity_prices['grid']
-                    daily_operation_cost = renew_cost + grid_cost
-
-                    # 计算5年总成本
-                    total_cost = investment_cost + daily_operation_cost * 365 * payback_period
-
-                    # 计算单位电量成本 (元/kWh)
-                    total_energy_supplied = daily_load_total * 365 * payback_period
-                    cost_per_kwh = total_cost / total_energy_supplied if total_energy_supplied > 0 else 0
-
-                    # 更新最优配置
-                    if total_cost < best_cost:
-                        best_cost = total_cost
-                        best_config = {
-                            'pv_capacity': pv_cap,
-                            'wind_capacity': wind_cap,
-                            'ess_power': ess_power,
-                            'ess_capacity': ess_capacity
-                        }
-                        best_results = {
-                            'investment_cost': investment_cost,
-                            'daily_operation_cost': daily_operation_cost,
-                            'total_cost': total_cost,
-                            'daily_pv_used': total_pv_used,
-                            'daily_wind_used': total_wind_used,
-                            'daily_renew_used': total_pv_used + total_wind_used,
-                            'daily_grid_purchase': grid_purchase,
-                            'daily_pv_curtail': pv_curtail,
-                            'daily_wind_curtail': wind_curtail,
-                            'cost_per_kwh': cost_per_kwh
-                        }
-
+            evaluated = evaluate_configs(area, *candidates)
+            k = int(np.argmin(evaluated['total_cost']))
+            if evaluated['total_cost'][k] < best_cost:
+                best_cost = evaluated['total_cost'][k]
+                best_point = candidates[:, k]
+                best_results = {key: float(values[k]) for key, values in evaluated.items()}
+            level_points.append(candidates)
+            level_costs.append(evaluated['total_cost'])
+
+        steps = new_steps
+        if not level_points:
+            break
+        points = np.hstack(level_points)
+        costs = np.concatenate(level_costs)
+
+    best_config = {
+        'pv_capacity': int(best_point[0]),
+        'wind_capacity': int(best_point[1]),
+        'ess_power': int(best_point[2]),
+        'ess_capacity': int(best_point[3])
+    }
     return best_config, best_results
 
 
@@ -1,5 +1,11 @@
 import pandas as pd
 import numpy as np
+import os
+import sys
+
+# 共享的并行搜索模块位于上级目录（2024电工杯A题/parallel_search.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from parallel_search import SharedArrays, parallel_best, shared_array, split_tasks
 
 # 定义所有园区的初始装机容量
 initial_capacities = {
@@ -45,52 +51,244 @@ payback_period = 5
 # 每月天数（平年）
 month_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
 
-# 读取负荷数据
-load_data = pd.read_excel('C:/Users/HP/Desktop/附件1：各园区典型日负荷数据.xlsx')
-
-# 最大负荷增长50%
-for area in ['A', 'B', 'C']:
-    load_data[f'园区{area}负荷(kW)'] = load_data[f'园区{area}负荷(kW)'] * 1.5
-
-# 读取全年12个月风光数据
-renewable_data = pd.read_excel('C:/Users/HP/Desktop/附件3：12个月各园区典型日风光发电数据_原.xlsx', skiprows=3,
-                               header=None)
-
-# 为每个园区构建12个月的风光数据
-area_data = {}
 areas = ['A', 'B', 'C']
 
-# 处理12个月的数据
-for area in areas:
-    area_data[area] = {'pv': np.zeros((12, 24)), 'wind': np.zeros((12, 24))}
-
-for month in range(12):
-    column = 1 + month * 4  # 每月4列数据
-
-    # 园区A光伏 (第1列)
-    area_data['A']['pv'][month] = pd.to_numeric(
-        renewable_data.iloc[1:25, column], errors='coerce'
-    ).fillna(0).values
-
-    # 园区B风电 (第2列)
-    area_data['B']['wind'][month] = pd.to_numeric(
-        renewable_data.iloc[1:25, column + 1], errors='coerce'
-    ).fillna(0).values
 
-    # 园区C风电 (第3列)
-    area_data['C']['wind'][month] = pd.to_numeric(
-        renewable_data.iloc[1:25, column + 2], errors='coerce'
-    ).fillna(0).values
+# 读取数据（放在函数中，并行计算的工作进程导入本文件时不会重复读取Excel）
+def load_input_data():
+    """
+    读取典型日负荷和全年12个月风光数据
+    :return: (负荷数据 DataFrame, {园区: {'pv': (12, 24), 'wind': (12, 24)}})
+    """
+    # 读取负荷数据
+    load_data = pd.read_excel('C:/Users/HP/Desktop/附件1：各园区典型日负荷数据.xlsx')
 
-    # 园区C光伏 (第4列)
-    area_data['C']['pv'][month] = pd.to_numeric(
-        renewable_data.iloc[1:25, column + 3], errors='coerce'
-    ).fillna(0).values
-
-
-# 优化函数
-def optimize_area_full_year(area):
-    """为指定园区优化风光储配置（全年分时电价）"""
+    # 最大负荷增长50%
+    for area in ['A', 'B', 'C']:
+        load_data[f'园区{area}负荷(kW)'] = load_data[f'园区{area}负荷(kW)'] * 1.5
+
+    # 读取全年12个月风光数据
+    renewable_data = pd.read_excel('C:/Users/HP/Desktop/附件3：12个月各园区典型日风光发电数据_原.xlsx', skiprows=3,
+                                   header=None)
+
+    # 为每个园区构建12个月的风光数据
+    area_data = {}
+    for area in areas:
+        area_data[area] = {'pv': np.zeros((12, 24)), 'wind': np.zeros((12, 24))}
+
+    # 处理12个月的数据
+    for month in range(12):
+        column = 1 + month * 4  # 每月4列数据
+
+        # 园区A光伏 (第1列)
+        area_data['A']['pv'][month] = pd.to_numeric(
+            renewable_data.iloc[1:25, column], errors='coerce'
+        ).fillna(0).values
+
+        # 园区B风电 (第2列)
+        area_data['B']['wind'][month] = pd.to_numeric(
+            renewable_data.iloc[1:25, column + 1], errors='coerce'
+        ).fillna(0).values
+
+        # 园区C风电 (第3列)
+        area_data['C']['wind'][month] = pd.to_numeric(
+            renewable_data.iloc[1:25, column + 2], errors='coerce'
+        ).fillna(0).values
+
+        # 园区C光伏 (第4列)
+        area_data['C']['pv'][month] = pd.to_numeric(
+            renewable_data.iloc[1:25, column + 3], errors='coerce'
+        ).fillna(0).values
+
+    return load_data, area_data
+
+
+# 全年运行模拟
+def simulate_full_year(load_profile, area_pv, area_wind, pv_cap, wind_cap, ess_power, ess_capacity,
+                       steady_state=True):
+    """
+    按月典型日逐小时模拟一种配置的全年运行（每月第一天SOC从90%开始）
+    同一个月每天的风光负荷曲线相同，一天的运行过程只取决于日初SOC；某天的日初SOC与之前某天完全相同时，
+    之后各天按周期重复，剩余天数直接重放周期内记录的逐小时运行量，不再逐小时模拟（通常只需模拟每月前几天），
+    累加顺序与逐日模拟相同，结果逐位一致
+    :param load_profile: 典型日负荷 (kW)，长度24
+    :param area_pv: 12个月光伏出力标幺值，(12, 24)，没有光伏的园区为0
+    :param area_wind: 12个月风电出力标幺值，(12, 24)，没有风电的园区为0
+    :param steady_state: 是否启用周期稳态加速，False 时逐日逐小时完整模拟
+    :return: (年可再生能源利用量, 年光伏利用量, 年风电利用量, 年购电成本, 年弃光电量, 年弃风电量)
+    """
+    # 初始化运行结果
+    total_renew_used = 0
+    total_pv_used = 0
+    total_wind_used = 0
+    total_grid_cost = 0
+    total_pv_curtail = 0
+    total_wind_curtail = 0
+
+    # 全年模拟
+    for month in range(12):
+        # 初始化储能状态（每月第一天从90%开始）
+        storage_soc = 90.0
+
+        # 获取当月的典型日风光数据
+        pv_data = area_pv[month]
+        wind_data = area_wind[month]
+
+        # 周期稳态检测：{日初SOC: 第几天}，以及每天各项的逐次累加量
+        day_start_soc = {}
+        day_records = []
+
+        # 模拟该月每天运行
+        for day in range(month_days[month]):
+            # 日初SOC与之前某天相同，从那天起运行过程按周期重复，剩余天数重放周期内的累加量
+            if steady_state and storage_soc in day_start_soc:
+                cycle = day_records[day_start_soc[storage_soc]:]
+                full_cycles, extra_days = divmod(month_days[month] - day, len(cycle))
+                totals = [total_renew_used, total_pv_used, total_wind_used,
+                          total_grid_cost, total_pv_curtail, total_wind_curtail]
+                for k in range(len(totals)):
+                    cycle_increments = [value for record in cycle for value in record[k]]
+                    extra_increments = [value for record in cycle[:extra_days] for value in record[k]]
+                    # add.accumulate 按顺序逐项相加，与逐小时 += 的舍入完全相同
+                    totals[k] = np.add.accumulate(
+                        [totals[k]] + cycle_increments * full_cycles + extra_increments)[-1]
+                (total_renew_used, total_pv_used, total_wind_used,
+                 total_grid_cost, total_pv_curtail, total_wind_curtail) = totals
+                break
+            day_start_soc[storage_soc] = day
+
+            # 当天各项的逐次累加量
+            day_renew_used = []
+            day_pv_used = []
+            day_wind_used = []
+            day_grid_cost = []
+            day_pv_curtail = []
+            day_wind_curtail = []
+
+            # 模拟24小时运行
+            for hour in range(24):
+                # 获取当前小时负荷
+                load = load_profile[hour]
+
+                # 计算可再生能源出力
+                pv_gen = pv_cap * pv_data[hour]
+                wind_gen = wind_cap * wind_data[hour]
+
+                # 当前储能状态 (kWh)
+                soc_kwh = storage_soc / 100 * ess_capacity if ess_capacity > 0 else 0
+
+                # 获取当前电价
+                grid_price = get_grid_price(hour)
+
+                # 1. 优先使用光伏发电
+                pv_used_hr = min(pv_gen, load)
+                load_after_pv = load - pv_used_hr
+
+                # 2. 然后使用风电
+                wind_used_hr = min(wind_gen, load_after_pv)
+                load_remain = load_after_pv - wind_used_hr
+
+                # 更新可再生能源利用量
+                total_renew_used += pv_used_hr + wind_used_hr
+                total_pv_used += pv_used_hr
+                total_wind_used += wind_used_hr
+                day_renew_used.append(pv_used_hr + wind_used_hr)
+                day_pv_used.append(pv_used_hr)
+                day_wind_used.append(wind_used_hr)
+
+                # 3. 计算剩余可再生能源
+                pv_surplus = pv_gen - pv_used_hr
+                wind_surplus = wind_gen - wind_used_hr
+                total_surplus = pv_surplus + wind_surplus
+
+                # 4. 如果有剩余可再生能源，尝试存入储能
+                if total_surplus > 0 and ess_capacity > 0:
+                    # 计算最大充电功率
+                    soc_max_kwh = ess_params['soc_max'] / 100 * ess_capacity
+                    max_charge_kw = min(
+                        ess_power,
+                        (soc_max_kwh - soc_kwh) / ess_params['efficiency']
+                    )
+                    charge_kw = min(total_surplus, max_charge_kw)
+                    charge_actual = charge_kw * ess_params['efficiency']
+
+                    # 更新SOC
+                    soc_kwh += charge_actual
+
+                    # 计算弃电（优先弃风，因为风电成本更高）
+                    curtail_total = total_surplus - charge_kw
+                    wind_curtail_hr = min(wind_surplus, curtail_total)
+                    pv_curtail_hr = curtail_total - wind_curtail_hr
+
+                    total_pv_curtail += pv_curtail_hr
+                    total_wind_curtail += wind_curtail_hr
+                    day_pv_curtail.append(pv_curtail_hr)
+                    day_wind_curtail.append(wind_curtail_hr)
+                else:
+                    # 没有储能或没有剩余可再生能源时，全部弃电
+                    wind_curtail_hr = wind_surplus
+                    pv_curtail_hr = pv_surplus
+                    total_pv_curtail += pv_curtail_hr
+                    total_wind_curtail += wind_curtail_hr
+                    day_pv_curtail.append(pv_curtail_hr)
+                    day_wind_curtail.append(wind_curtail_hr)
+
+                # 5. 如果负荷仍有剩余，尝试从储能放电
+                if load_remain > 0 and ess_capacity > 0:
+                    # 计算最大放电功率
+                    soc_min_kwh = ess_params['soc_min'] / 100 * ess_capacity
+                    max_discharge_kw = min(
+                        ess_power,
+                        (soc_kwh - soc_min_kwh) * ess_params['efficiency']
+                    )
+                    discharge_kw = min(load_remain, max_discharge_kw)
+                    discharge_actual = discharge_kw / ess_params['efficiency']
+
+                    # 更新SOC
+                    soc_kwh -= discharge_actual
+                    load_remain -= discharge_kw
+
+                # 6. 剩余负荷由电网补充
+                grid_cost_hr = load_remain * grid_price
+                total_grid_cost += grid_cost_hr
+                day_grid_cost.append(grid_cost_hr)
+
+                # 7. 在低谷时段，如果有储能容量，从电网充电，以0.4的价格购入，即使考虑充电效率成本也只是0.49
+                if grid_price == 0.4 and ess_capacity > 0:
+                    # 计算最大充电功率
+                    soc_max_kwh = ess_params['soc_max'] / 100 * ess_capacity
+                    max_charge_kw = min(
+                        ess_power,
+                        (soc_max_kwh - soc_kwh) / ess_params['efficiency']
+                    )
+                    if max_charge_kw > 0:
+                        charge_kw = max_charge_kw
+                        charge_actual = charge_kw * ess_params['efficiency']
+
+                        # 更新SOC
+                        soc_kwh += charge_actual
+                        total_grid_cost += charge_kw * grid_price
+                        day_grid_cost.append(charge_kw * grid_price)
+
+                # 更新储能状态
+                if ess_capacity > 0:
+                    storage_soc = soc_kwh / ess_capacity * 100
+                    # 确保SOC在范围内
+                    storage_soc = max(ess_params['soc_min'], min(ess_params['soc_max'], storage_soc))
+
+            day_records.append((day_renew_used, day_pv_used, day_wind_used, day_grid_cost,
+                                day_pv_curtail, day_wind_curtail))
+
+    return (total_renew_used, total_pv_used, total_wind_used, total_grid_cost,
+            total_pv_curtail, total_wind_curtail)
+
+
+# 配置枚举
+def area_configs(area):
+    """
+    指定园区的候选配置，按原遍历顺序排列（跳过无效组合）
+    :return: [(光伏容量, 风电容量, 储能功率, 储能容量)]
+    """
     # 获取初始容量
     pv_cap_init = initial_capacities[area]['pv']
     wind_cap_init = initial_capacities[area]['wind']
@@ -101,14 +299,7 @@ def optimize_area_full_year(area):
     ess_power_options = [0, 50, 100]
     ess_capacity_options = [0, 100, 200]
 
-    best_cost = float('inf')
-    best_config = {}
-    best_results = {}
-
-    # 预计算该园区的日负荷总和
-    daily_load_total = load_data[f'园区{area}负荷(kW)'].sum()
-
-    # 遍历所有可能的配置组合
+    configs = []
     for pv_cap in pv_options:
         for wind_cap in wind_options:
             # 跳过无效组合
@@ -120,192 +311,134 @@ def optimize_area_full_year(area):
                     # 跳过无效储能配置
                     if ess_power > 0 and ess_capacity == 0:
                         continue
+                    configs.append((pv_cap, wind_cap, ess_power, ess_capacity))
+    return configs
 
-                    # 计算投资成本
-                    investment_cost = (
-                            pv_cap * cost_params['pv'] +
-                            wind_cap * cost_params['wind'] +
-                            ess_power * cost_params['ess_power'] +
-                            ess_capacity * cost_params['ess_energy']
-                    )
 
-                    # 初始化运行结果
-                    total_renew_used = 0
-                    total_pv_used = 0
-                    total_wind_used = 0
-                    total_grid_cost = 0
-                    total_pv_curtail = 0
-                    total_wind_curtail = 0
-
-                    # 全年模拟
-                    for month in range(12):
-                        # 初始化储能状态（每月第一天从90%开始）
-                        storage_soc = 90.0
-
-                        # 获取当月的典型日风光数据
-                        if area == 'A':
-                            pv_data = area_data[area]['pv'][month]
-                            wind_data = np.zeros(24)
-                        elif area == 'B':
-                            pv_data = np.zeros(24)
-                            wind_data = area_data[area]['wind'][month]
-                        else:  # 园区C
-                            pv_data = area_data[area]['pv'][month]
-                            wind_data = area_data[area]['wind'][month]
-
-                        # 模拟该月每天运行
-                        for day in range(month_days[month]):
-                            # 模拟24小时运行
-                            for hour in range(24):
-                                # 获取当前小时负荷
-                                load = load_data.iloc[hour][f'园区{area}负荷(kW)']
-
-                                # 计算可再生能源出力
-                                pv_gen = pv_cap * pv_data[hour]
-                                wind_gen = wind_cap * wind_data[hour]
-
-                                # 当前储能状态 (kWh)
-                                soc_kwh = storage_soc / 100 * ess_capacity if ess_capacity > 0 else 0
-
-                                # 获取当前电价
-                                grid_price = get_grid_price(hour)
-
-                                # 1. 优先使用光伏发电
-                                pv_used_hr = min(pv_gen, load)
-                                load_after_pv = load - pv_used_hr
-
-                                # 2. 然后使用风电
-                                wind_used_hr = min(wind_gen, load_after_pv)
-                                load_remain = load_after_pv - wind_used_hr
-
-                                # 更新可再生能源利用量
-                                total_renew_used += pv_used_hr + wind_used_hr
-                                total_pv_used += pv_used_hr
-                                total_wind_used += wind_used_hr
-
-                                # 3. 计算剩余可再生能源
-                                pv_surplus = pv_gen - pv_used_hr
-                                wind_surplus = wind_gen - wind_used_hr
-                                total_surplus = pv_surplus + wind_surplus
-
-                                # 4. 如果有剩余可再生能源，尝试存入储能
-                                if total_surplus > 0 and ess_capacity > 0:
-                                    # 计算最大充电功率
-                                    soc_max_kwh = ess_params['soc_max'] / 100 * ess_capacity
-                                    max_charge_kw = min(
-                                        ess_power,
-                                        (soc_max_kwh - soc_kwh) / ess_params['efficiency']
-                                    )
-                                    charge_kw = min(total_surplus, max_charge_kw)
-                                    charge_actual = charge_kw * ess_params['efficiency']
-
-                                    # 更新SOC
-                                    soc_kwh += charge_actual
-
-                                    # 计算弃电（优先弃风，因为风电成本更高）
-                                    curtail_total = total_surplus - charge_kw
-                                    wind_curtail_hr = min(wind_surplus, curtail_total)
-                                    pv_curtail_hr = curtail_total - wind_curtail_hr
-
-                                    total_pv_curtail += pv_curtail_hr
-                                    total_wind_curtail += wind_curtail_hr
-                                else:
-                                    # 没有储能或没有剩余可再生能源时，全部弃电
-                                    wind_curtail_hr = wind_surplus
-                                    pv_curtail_hr = pv_surplus
-                                    total_pv_curtail += pv_curtail_hr
-                                    total_wind_curtail += wind_curtail_hr
-
-                                # 5. 如果负荷仍有剩余，尝试从储能放电
-                                if load_remain > 0 and ess_capacity > 0:
-                                    # 计算最大放电功率
-                                    soc_min_kwh = ess_params['soc_min'] / 100 * ess_capacity
-                                    max_discharge_kw = min(
-                                        ess_power,
-                                        (soc_kwh - soc_min_kwh) * ess_params['efficiency']
-                                    )
-                                    discharge_kw = min(load_remain, max_discharge_kw)
-                                    discharge_actual = discharge_kw / ess_params['efficiency']
-
-                                    # 更新SOC
-                                    soc_kwh -= discharge_actual
-                                    load_remain -= discharge_kw
-
-                                # 6. 剩余负荷由电网补充
-                                grid_cost_hr = load_remain * grid_price
-                                total_grid_cost += grid_cost_hr
-
-                                # 7. 在低谷时段，如果有储能容量，从电网充电，以0.4的价格购入，即使考虑充电效率成本也只是0.49
-                                if grid_price == 0.4 and ess_capacity > 0:
-                                    # 计算最大充电功率
-                                    soc_max_kwh = ess_params['soc_max'] / 100 * ess_capacity
-                                    max_charge_kw = min(
-                                        ess_power,
-                                        (soc_max_kwh - soc_kwh) / ess_params['efficiency']
-                                    )
-                                    if max_charge_kw > 0:
-                                        charge_kw = max_charge_kw
-                                        charge_actual = charge_kw * ess_params['efficiency']
-
-                                        # 更新SOC
-                                        soc_kwh += charge_actual
-                                        total_grid_cost += charge_kw * grid_price
-
-                                # 更新储能状态
-                                if ess_capacity > 0:
-                                    storage_soc = soc_kwh / ess_capacity * 100
-                                    # 确保SOC在范围内
-                                    storage_soc = max(ess_params['soc_min'], min(ess_params['soc_max'], storage_soc))
-
-                    # 计算可再生能源成本（按实际使用量）
-                    renew_cost = (total_pv_used * electricity_prices['pv'] +
-                                  total_wind_used * electricity_prices['wind'])
-
-                    # 总运行成本（全年）
-                    annual_operation_cost = renew_cost + total_grid_cost
-
-                    # 计算5年总成本
-                    total_cost = investment_cost + annual_operation_cost * payback_period
-
-                    # 计算单位电量成本 (元/kWh)
-                    total_energy_supplied = daily_load_total * 365 * payback_period
-                    if total_energy_supplied > 0:
-                        cost_per_kwh = total_cost / total_energy_supplied
-                    else:
-                        cost_per_kwh = 0
-
-                    # 更新最优配置
-                    if total_cost < best_cost:
-                        best_cost = total_cost
-                        best_config = {
-                            'pv_capacity': pv_cap,
-                            'wind_capacity': wind_cap,
-                            'ess_power': ess_power,
-                            'ess_capacity': ess_capacity
-                        }
-                        best_results = {
-                            'investment_cost': investment_cost,
-                            'annual_operation_cost': annual_operation_cost,
-                            'total_cost': total_cost,
-                            'annual_renew_used': total_renew_used,
-                            'annual_pv_used': total_pv_used,
-                            'annual_wind_used': total_wind_used,
-                            'annual_grid_cost': total_grid_cost,
-                            'annual_pv_curtail': total_pv_curtail,
-                            'annual_wind_curtail': total_wind_curtail,
-                            'cost_per_kwh': cost_per_kwh
-                        }
+# 优化函数
+def search_configs(configs, load_profile, area_pv, area_wind):
+    """
+    在给定配置列表中搜索总成本最低的配置（成本相同时保留先遍历到的配置）
+    :return: (最优配置在列表中的下标, 最优总成本, (最优配置, 最优结果))
+    """
+    best_index = -1
+    best_cost = float('inf')
+    best_config = {}
+    best_results = {}
 
+    # 预计算该园区的日负荷总和
+    daily_load_total = load_profile.sum()
+
+    for index, (pv_cap, wind_cap, ess_power, ess_capacity) in enumerate(configs):
+        # 计算投资成本
+        investment_cost = (
+                pv_cap * cost_params['pv'] +
+                wind_cap * cost_params['wind'] +
+                ess_power * cost_params['ess_power'] +
+                ess_capacity * cost_params['ess_energy']
+        )
+
+        (total_renew_used, total_pv_used, total_wind_used, total_grid_cost,
+         total_pv_curtail, total_wind_curtail) = simulate_full_year(
+            load_profile, area_pv, area_wind, pv_cap, wind_cap, ess_power, ess_capacity)
+
+        # 计算可再生能源成本（按实际使用量）
+        renew_cost = (total_pv_used * electricity_prices['pv'] +
+                      total_wind_used * electricity_prices['wind'])
+
+        # 总运行成本（全年）
+        annual_operation_cost = renew_cost + total_grid_cost
+
+        # 计算5年总成本
+        total_cost = investment_cost + annual_operation_cost * payback_period
+
+        # 计算单位电量成本 (元/kWh)
+        total_energy_supplied = daily_load_total * 365 * payback_period
+        if total_energy_supplied > 0:
+            cost_per_kwh = total_cost / total_energy_supplied
+        else:
+            cost_per_kwh = 0
+
+        # 更新最优配置
+        if total_cost < best_cost:
+            best_index = index
+            best_cost = total_cost
+            best_config = {
+                'pv_capacity': pv_cap,
+                'wind_capacity': wind_cap,
+                'ess_power': ess_power,
+                'ess_capacity': ess_capacity
+            }
+            best_results = {
+                'investment_cost': investment_cost,
+                'annual_operation_cost': annual_operation_cost,
+                'total_cost': total_cost,
+                'annual_renew_used': total_renew_used,
+                'annual_pv_used': total_pv_used,
+                'annual_wind_used': total_wind_used,
+                'annual_grid_cost': total_grid_cost,
+                'annual_pv_curtail': total_pv_curtail,
+                'annual_wind_curtail': total_wind_curtail,
+                'cost_per_kwh': cost_per_kwh
+            }
+
+    return best_index, best_cost, (best_config, best_results)
+
+
+def optimize_area_full_year(area, load_data, area_data):
+    """为指定园区优化风光储配置（全年分时电价，单进程顺序遍历）"""
+    _, _, (best_config, best_results) = search_configs(
+        area_configs(area), load_data[f'园区{area}负荷(kW)'].values, area_data[area]['pv'], area_data[area]['wind'])
     return best_config, best_results
 
 
+# ===================== 并行优化 =====================
+def evaluate_slice(task):
+    """
+    工作进程任务：在一段连续配置中搜索最优，园区数据从共享内存读取
+    :param task: (园区, 段起点下标, 配置列表)
+    :return: [(园区, 全局遍历下标, 总成本, (最优配置, 最优结果))]
+    """
+    area, start, configs = task
+    index, cost, result = search_configs(configs, shared_array(f'{area}_load'),
+                                         shared_array(f'{area}_pv'), shared_array(f'{area}_wind'))
+    return [(area, start + index, cost, result)]
+
+
+def optimize_all_parallel(load_data, area_data, workers=None):
+    """
+    多进程并行优化全部园区：按园区和配置段拆分任务，负荷与风光数据放入共享内存只读挂载，
+    归约时按 (总成本, 遍历下标) 取最优，结果与逐个园区顺序遍历完全一致
+    :param workers: 进程数，默认为CPU核数
+    :return: {园区: (最优配置, 最优结果)}
+    """
+    workers = workers or os.cpu_count() or 1
+    arrays = {}
+    for area in areas:
+        arrays[f'{area}_load'] = load_data[f'园区{area}负荷(kW)'].values
+        arrays[f'{area}_pv'] = area_data[area]['pv']
+        arrays[f'{area}_wind'] = area_data[area]['wind']
+
+    # 每个园区切成与进程数相同的段，三个园区的任务一起分发
+    tasks = []
+    for area in areas:
+        for start, configs in split_tasks(area_configs(area), workers):
+            tasks.append((area, start, configs))
+
+    with SharedArrays(arrays) as shared:
+        best = parallel_best(evaluate_slice, tasks, shared, workers=workers)
+    return {area: best[area][2] for area in areas}
+
+
 # 主程序
 if __name__ == "__main__":
+    load_data, area_data = load_input_data()
     results = {}
 
-    # 优化所有三个园区
+    # 优化所有三个园区（多进程并行，结果与顺序遍历一致）
+    best = optimize_all_parallel(load_data, area_data)
     for area in ['A', 'B', 'C']:
-        config, res = optimize_area_full_year(area)
+        config, res = best[area]
         results[area] = {'config': config, 'results': res}
 
     for area in ['A', 'B', 'C']:
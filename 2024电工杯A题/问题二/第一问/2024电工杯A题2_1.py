@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import os
+import sys
+
+# 共享的能源分配模块位于上级目录（2024电工杯A题/park_allocation.py）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from park_allocation import allocate_energy
 
 # 定义联合园区总装机容量
 total_capacities = {
@@ -34,42 +40,14 @@ date['总光伏(kW)'] = date['A_pv'] * total_capacities['pv']  # 光伏归一化
 date['总风电(kW)'] = date['B_wind'] * total_capacities['wind']  # 风电归一化值乘以总装机容量
 date['总发电(kW)'] = date['总光伏(kW)'] + date['总风电(kW)']
 
-# 初始化联合园区结果列
-date['总弃电量(kW)'] = 0.0
-date['总网购电量(kW)'] = 0.0
-date['弃光(kW)'] = 0.0
-date['弃风(kW)'] = 0.0
-date['光伏利用量(kW)'] = 0.0
-date['风电利用量(kW)'] = 0.0
-
-# 计算每个时刻的能源分配（优先使用光伏策略）
-for i, row in date.iterrows():
-    total_load = row['总负荷(kW)']
-    pv_gen = row['总光伏(kW)']
-    wind_gen = row['总风电(kW)']
-
-    # 1. 优先使用光伏发电
-    pv_used = min(pv_gen, total_load)
-    load_after_pv = total_load - pv_used
-
-    # 2. 然后使用风电
-    wind_used = min(wind_gen, load_after_pv)
-    load_remain = load_after_pv - wind_used
-
-    # 3. 剩余负荷需要网购
-    grid_purchase = max(0, load_remain)
-
-    # 4. 计算弃电
-    pv_curtail = pv_gen - pv_used
-    wind_curtail = wind_gen - wind_used
-
-    # 记录结果
-    date.at[i, '光伏利用量(kW)'] = pv_used
-    date.at[i, '风电利用量(kW)'] = wind_used
-    date.at[i, '弃光(kW)'] = pv_curtail
-    date.at[i, '弃风(kW)'] = wind_curtail
-    date.at[i, '总弃电量(kW)'] = pv_curtail + wind_curtail
-    date.at[i, '总网购电量(kW)'] = grid_purchase
+# 计算每个时刻的能源分配（优先使用光伏策略，按数组一次计算）
+allocation = allocate_energy(date['总负荷(kW)'].values, date['总光伏(kW)'].values, date['总风电(kW)'].values)
+date['光伏利用量(kW)'] = allocation['pv_used']
+date['风电利用量(kW)'] = allocation['wind_used']
+date['弃光(kW)'] = allocation['pv_curtail']
+date['弃风(kW)'] = allocation['wind_curtail']
+date['总弃电量(kW)'] = allocation['curtailment']
+date['总网购电量(kW)'] = allocation['grid_purchase']
 
 # 计算总量（按小时累加）
 total_load_energy = date['总负荷(kW)'].sum()  # 总负荷电量(kWh)
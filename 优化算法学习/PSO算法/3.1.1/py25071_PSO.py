@@ -4,23 +4,29 @@ import matplotlib.pyplot as plt
 
 # 定义Rastrigin函数
 def rastrigin(x, A=10):
-    """计算Rastrigin函数值"""
-    return A * len(x) + np.sum(x ** 2 - A * np.cos(2 * np.pi * x))
+    """计算Rastrigin函数值（x 为二维数组时按行计算，返回每个粒子的函数值）"""
+    x = np.asarray(x)
+    return A * x.shape[-1] + np.sum(x ** 2 - A * np.cos(2 * np.pi * x), axis=-1)
 
 
 # PSO算法实现
-def pso_rastrigin(dimensions, num_particles, max_iter, bounds, w=0.5, c1=1, c2=1):
+def pso_rastrigin(dimensions, num_particles, max_iter, bounds, w=0.5, c1=1, c2=1, mode='sync'):
     """
     dimensions ： 问题维度
     num_particles ： 粒子数量
     max_iter ： 最大迭代次数
     bounds ： 变量边界 [min, max]
+    mode ： 'sync' 同步更新（整个粒子群一次更新、一次计算适应度，迭代结束后更新全局最优）；
+            'async' 异步更新（逐个粒子更新，每个粒子改进后立即更新全局最优）
     """
+    if mode not in ('sync', 'async'):
+        raise ValueError(f"mode 只能为 'sync' 或 'async'，当前为 {mode!r}")
+
     # 初始化粒子群
     particles_p = np.random.uniform(bounds[0], bounds[1], (num_particles, dimensions))
     particles_v = np.random.uniform(-1, 1, (num_particles, dimensions))
     pbest_p = particles_p.copy()
-    pbest_v = np.array([rastrigin(p) for p in particles_p])
+    pbest_v = rastrigin(particles_p)
 
     # 全局最优初始化
     gbest_idx = np.argmin(pbest_v)
@@ -32,31 +38,53 @@ def pso_rastrigin(dimensions, num_particles, max_iter, bounds, w=0.5, c1=1, c2=1
 
     # PSO主循环
     for i in range(max_iter):
-        for n in range(num_particles):
-            # 更新粒子速度
-            r1, r2 = np.random.rand(2)
-            cognitive = c1 * r1 * (pbest_p[n] - particles_p[n])
-            social = c2 * r2 * (gbest_p - particles_p[n])
-            particles_v[n] = w * particles_v[n] + cognitive + social
-
-            # 更新粒子位置
-            particles_p[n] += particles_v[n]
-
-            # 边界处理
-            particles_p[n] = np.clip(particles_p[n], bounds[0], bounds[1])
-
-            # 计算适应度
-            fitness = rastrigin(particles_p[n])
-
-            # 更新个体最优
-            if fitness < pbest_v[n]:
-                pbest_p[n] = particles_p[n].copy()
-                pbest_v[n] = fitness
-
-                # 更新全局最优
-                if fitness < gbest_v:
-                    gbest_p = particles_p[n].copy()
-                    gbest_v = fitness
+        if mode == 'sync':
+            # 更新粒子速度（每个粒子一组随机数，与异步更新相同）
+            r1 = np.random.rand(num_particles, 1)
+            r2 = np.random.rand(num_particles, 1)
+            particles_v = w * particles_v + c1 * r1 * (pbest_p - particles_p) + c2 * r2 * (gbest_p - particles_p)
+
+            # 更新粒子位置并做边界处理
+            particles_p = np.clip(particles_p + particles_v, bounds[0], bounds[1])
+
+            # 整个粒子群一次计算适应度，更新个体最优
+            fitness = rastrigin(particles_p)
+            improved = fitness < pbest_v
+            pbest_p[improved] = particles_p[improved]
+            pbest_v[improved] = fitness[improved]
+
+            # 更新全局最优
+            best = np.argmin(pbest_v)
+            if pbest_v[best] < gbest_v:
+                gbest_p = pbest_p[best].copy()
+                gbest_v = pbest_v[best]
+
+        else:
+            for n in range(num_particles):
+                # 更新粒子速度
+                r1, r2 = np.random.rand(2)
+                cognitive = c1 * r1 * (pbest_p[n] - particles_p[n])
+                social = c2 * r2 * (gbest_p - particles_p[n])
+                particles_v[n] = w * particles_v[n] + cognitive + social
+
+                # 更新粒子位置
+                particles_p[n] += particles_v[n]
+
+                # 边界处理
+                particles_p[n] = np.clip(particles_p[n], bounds[0], bounds[1])
+
+                # 计算适应度
+                fitness = rastrigin(particles_p[n])
+
+                # 更新个体最优
+                if fitness < pbest_v[n]:
+                    pbest_p[n] = particles_p[n].copy()
+                    pbest_v[n] = fitness
+
+                    # 更新全局最优
+                    if fitness < gbest_v:
+                        gbest_p = particles_p[n].copy()
+                        gbest_v = fitness
 
         convergence_curve[i] = gbest_v
 
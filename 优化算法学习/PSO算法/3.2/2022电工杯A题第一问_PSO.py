@@ -4,6 +4,13 @@ from matplotlib.font_manager import FontProperties
 import math
 import pandas as pd
 import random
+import os
+import sys
+
+# 共享的机组模块位于 2022电工杯A题 目录（2022电工杯A题/unit_fleet.py）
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))), '2022电工杯A题'))
+from unit_fleet import UnitFleet, as_fleet
 
 # 设置中文字体
 font = FontProperties(fname=r"C:\Windows\Fonts\simhei.ttf", size=12)
@@ -28,23 +35,62 @@ def load_demand_data():
     return load_demand.tolist()
 
 
+# ===================== 可行域投影 =====================
+def project_to_feasible(particles_p, loads, P_min, P_max):
+    """
+    将粒子投影到可行域 {ΣP = load, P_min ≤ P ≤ P_max}（欧氏距离最近点）
+    投影结果为 P = clip(x - μ, P_min, P_max)，总出力 S(μ) 是μ的分段线性单调不增函数，
+    断点为各机组到达上下限时的μ；按断点排序并累加斜率得到各断点处的总出力，再线性插值解出μ
+    :param particles_p: 粒子位置 (..., 机组数)，如 (粒子数, 机组数) 或 (T, 粒子数, 机组数)
+    :param loads: 负荷，形状与 particles_p 去掉最后一维后可广播
+    :param P_min: 机组出力下限 (机组数,)
+    :param P_max: 机组出力上限 (机组数,)
+    :return: 投影后的粒子位置，形状与 particles_p 相同（负荷超出总出力范围时取全部上限或下限）
+    """
+    x = np.asarray(particles_p, dtype=float)
+    loads = np.broadcast_to(np.asarray(loads, dtype=float), x.shape[:-1])
+    num_units = x.shape[-1]
+
+    # μ 增大越过 x - P_max 时机组离开上限（斜率 -1），越过 x - P_min 时到达下限（斜率 +1）
+    breakpoints = np.concatenate([x - P_max, x - P_min], axis=-1)
+    order = np.argsort(breakpoints, axis=-1)
+    breakpoints = np.take_along_axis(breakpoints, order, axis=-1)
+    slope_change = np.concatenate([-np.ones(num_units), np.ones(num_units)])[order]
+    slope = np.cumsum(slope_change, axis=-1)[..., :-1]
+    outputs = P_max.sum() + np.concatenate(
+        [np.zeros(x.shape[:-1] + (1,)), np.cumsum(slope * np.diff(breakpoints, axis=-1), axis=-1)], axis=-1)
+
+    # 负荷所在区间（总出力单调不增）及区间内线性插值
+    k = np.clip(np.sum(outputs >= loads[..., None], axis=-1) - 1, 0, 2 * num_units - 2)[..., None]
+    S_low = np.take_along_axis(outputs, k, axis=-1)[..., 0]
+    S_high = np.take_along_axis(outputs, k + 1, axis=-1)[..., 0]
+    mu_low = np.take_along_axis(breakpoints, k, axis=-1)[..., 0]
+    mu_high = np.take_along_axis(breakpoints, k + 1, axis=-1)[..., 0]
+    span = np.where(S_low > S_high, S_low - S_high, 1.0)
+    ratio = np.clip((S_low - loads) / span, 0, 1)
+    mu = mu_low + ratio * (mu_high - mu_low)
+    return np.clip(x - mu[..., None], P_min, P_max)
+
+
 # ===================== PSO算法实现 =====================
-def pso_economic_dispatch(load, units, max_iter=100, num_particles=50, w=0.5, c1=1.5, c2=1.5):
+def pso_economic_dispatch(load, units, max_iter=100, num_particles=50, w=0.5, c1=1.5, c2=1.5, repair=False):
     """
     使用PSO算法求解经济调度问题
     :param load: 当前时刻的负荷需求(MW)
-    :param units: 机组列表
+    :param units: 机组列表或 UnitFleet
     :param max_iter: 最大迭代次数
     :param num_particles: 粒子数量
     :param w: 惯性权重
     :param c1: 个体学习因子
     :param c2: 群体学习因子
+    :param repair: 是否在每次更新位置后将粒子投影到可行域（功率平衡且不越限），投影后惩罚项恒为0
     :return: 各机组最优出力(MW)
     """
-    num_units = len(units)
+    fleet = as_fleet(units)
+    num_units = len(fleet)
 
     # 获取机组出力上下限
-    bounds = np.array([[u['P_min'], u['P_max']] for u in units])
+    bounds = np.column_stack([fleet.P_min, fleet.P_max])
 
     # 初始化粒子群
     particles_p = np.zeros((num_particles, num_units))
@@ -55,6 +101,8 @@ def pso_economic_dispatch(load, units, max_iter=100, num_particles=50, w=0.5, c1
         for j in range(num_units):
             particles_p[i, j] = random.uniform(bounds[j, 0], bounds[j, 1])
             particles_v[i, j] = random.uniform(-1, 1) * (bounds[j, 1] - bounds[j, 0]) / 10.0
+    if repair:
+        particles_p = project_to_feasible(particles_p, load, bounds[:, 0], bounds[:, 1])
 
     # 初始化个体最优位置和适应度
     pbest_p = particles_p.copy()
@@ -77,22 +125,17 @@ def pso_economic_dispatch(load, units, max_iter=100, num_particles=50, w=0.5, c1
             imbalance_penalty = 10000 * abs(total_power - load) ** 2
 
             # 计算约束惩罚（出力越限惩罚）
-            constraint_penalty = 0
-            for j in range(num_units):
-                if particles_p[i, j] < bounds[j, 0]:
-                    constraint_penalty += 10000 * (bounds[j, 0] - particles_p[i, j]) ** 2
-                elif particles_p[i, j] > bounds[j, 1]:
-                    constraint_penalty += 10000 * (particles_p[i, j] - bounds[j, 1]) ** 2
+            below = np.maximum(bounds[:, 0] - particles_p[i], 0)
+            above = np.maximum(particles_p[i] - bounds[:, 1], 0)
+            constraint_penalty = 10000 * np.sum(below ** 2 + above ** 2)
 
             # 计算总煤耗成本（目标函数）
-            total_cost = 0
-            for j, unit in enumerate(units):
-                # 计算煤耗量（kg/h）
-                F_hourly = unit['a'] * particles_p[i, j] ** 2 + unit['b'] * particles_p[i, j] + unit['c']
-                # 15分钟的煤耗成本（元）
-                fuel_cost = F_hourly * 0.25 * coal_price
-                # 总运行成本 = 1.5 * 煤耗成本（包括运行维护成本）
-                total_cost += 1.5 * fuel_cost
+            # 煤耗量（kg/h）
+            F_hourly = fleet.a * particles_p[i] ** 2 + fleet.b * particles_p[i] + fleet.c
+            # 15分钟的煤耗成本（元）
+            fuel_cost = F_hourly * 0.25 * coal_price
+            # 总运行成本 = 1.5 * 煤耗成本（包括运行维护成本）
+            total_cost = np.sum(1.5 * fuel_cost)
 
             # 总适应度 = 总成本 + 惩罚项
             fitness = total_cost + imbalance_penalty + constraint_penalty
@@ -123,59 +166,241 @@ def pso_economic_dispatch(load, units, max_iter=100, num_particles=50, w=0.5, c1
                 # 边界处理
                 particles_p[i, j] = max(bounds[j, 0], min(particles_p[i, j], bounds[j, 1]))
 
+        # 可行域修复（整个粒子群一次投影）
+        if repair:
+            particles_p = project_to_feasible(particles_p, load, bounds[:, 0], bounds[:, 1])
+
     return gbest_p.tolist()
 
 
+def pso_economic_dispatch_batch(loads, units, max_iter=100, num_particles=50, w=0.5, c1=1.5, c2=1.5, seed=None,
+                                repair=False):
+    """
+    全部时段同时求解的PSO经济调度
+    各时段的粒子群相互独立，位置和速度存放在 (T, 粒子数, 机组数) 数组中一起更新，
+    适应度（成本 + 功率不平衡惩罚 + 越限惩罚）按数组表达式一次算出
+    :param loads: 各时刻负荷数组 (MW)
+    :param units: 机组列表或 UnitFleet
+    :param max_iter: 最大迭代次数
+    :param num_particles: 粒子数量
+    :param w: 惯性权重
+    :param c1: 个体学习因子
+    :param c2: 群体学习因子
+    :param seed: 随机种子
+    :param repair: 是否在每次更新位置后将粒子投影到可行域（功率平衡且不越限）
+    :return: 各机组最优出力矩阵 (T, 机组数) 单位：MW
+    """
+    fleet = as_fleet(units)
+    loads = np.asarray(loads, dtype=float)
+    rng = np.random.default_rng(seed)
+    T, num_units = len(loads), len(fleet)
+    P_min, P_max = fleet.P_min, fleet.P_max
+
+    # 煤价（元/kg）
+    coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
+
+    def fitness(particles_p):
+        # 总运行成本 = 1.5 * 15分钟煤耗成本
+        F_hourly = fleet.a * particles_p ** 2 + fleet.b * particles_p + fleet.c
+        total_cost = 1.5 * np.sum(F_hourly, axis=-1) * 0.25 * coal_price
+        # 功率不平衡惩罚和出力越限惩罚
+        imbalance_penalty = 10000 * (np.sum(particles_p, axis=-1) - loads[:, None]) ** 2
+        below = np.maximum(P_min - particles_p, 0)
+        above = np.maximum(particles_p - P_max, 0)
+        constraint_penalty = 10000 * np.sum(below ** 2 + above ** 2, axis=-1)
+        return total_cost + imbalance_penalty + constraint_penalty
+
+    # 初始化位置和速度 (T, 粒子数, 机组数)
+    shape = (T, num_particles, num_units)
+    particles_p = P_min + rng.random(shape) * (P_max - P_min)
+    particles_v = rng.uniform(-1, 1, shape) * (P_max - P_min) / 10.0
+    if repair:
+        particles_p = project_to_feasible(particles_p, loads[:, None], P_min, P_max)
+
+    # 初始化个体最优和全局最优（每个时段一个全局最优）
+    pbest_p = particles_p.copy()
+    pbest_fitness = np.full((T, num_particles), np.inf)
+    gbest_p = np.zeros((T, num_units))
+    gbest_fitness = np.full(T, np.inf)
+    periods = np.arange(T)
+
+    for _ in range(max_iter):
+        current = fitness(particles_p)
+
+        # 更新个体最优
+        improved = current < pbest_fitness
+        pbest_fitness = np.where(improved, current, pbest_fitness)
+        pbest_p = np.where(improved[..., None], particles_p, pbest_p)
+
+        # 更新全局最优
+        best = np.argmin(current, axis=1)
+        best_fitness = current[periods, best]
+        better = best_fitness < gbest_fitness
+        gbest_fitness = np.where(better, best_fitness, gbest_fitness)
+        gbest_p = np.where(better[:, None], particles_p[periods, best], gbest_p)
+
+        # 更新粒子速度和位置，并做边界处理
+        r1 = rng.random(shape)
+        r2 = rng.random(shape)
+        particles_v = w * particles_v + c1 * r1 * (pbest_p - particles_p) + c2 * r2 * (gbest_p[:, None, :] - particles_p)
+        particles_p = np.clip(particles_p + particles_v, P_min, P_max)
+        if repair:
+            particles_p = project_to_feasible(particles_p, loads[:, None], P_min, P_max)
+
+    return gbest_p
+
+
+def pso_economic_dispatch_sequential(loads, units, max_iter=100, num_particles=50, w=0.5, c1=1.5, c2=1.5,
+                                     tol=1e-6, patience=5, warm_start=True, seed=None):
+    """
+    逐时段热启动的PSO经济调度
+    相邻15分钟的负荷变化很小，上一时段的最优解按负荷比例缩放后已接近本时段最优解：
+    本时段的粒子群由上一时段的个体最优位置缩放并投影到可行域后得到，
+    全局最优的相对改善连续 patience 次迭代小于 tol 时提前结束
+    :param loads: 各时刻负荷数组 (MW)
+    :param units: 机组列表或 UnitFleet
+    :param max_iter: 每个时段的最大迭代次数
+    :param num_particles: 粒子数量
+    :param w: 惯性权重
+    :param c1: 个体学习因子
+    :param c2: 群体学习因子
+    :param tol: 提前结束的相对改善阈值
+    :param patience: 连续多少次迭代改善小于阈值时结束
+    :param warm_start: 是否由上一时段热启动（False 时每个时段随机初始化，用于对比；上一时段负荷不为正时也随机初始化）
+    :param seed: 随机种子
+    :return: (各机组最优出力矩阵 (T, 机组数) 单位：MW, 各时段迭代次数数组)
+    """
+    fleet = as_fleet(units)
+    loads = np.asarray(loads, dtype=float)
+    rng = np.random.default_rng(seed)
+    T, num_units = len(loads), len(fleet)
+    P_min, P_max = fleet.P_min, fleet.P_max
+
+    # 煤价（元/kg）
+    coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
+
+    def fitness(particles_p):
+        # 粒子已投影到可行域，适应度只含运行成本 = 1.5 * 15分钟煤耗成本
+        F_hourly = fleet.a * particles_p ** 2 + fleet.b * particles_p + fleet.c
+        return 1.5 * np.sum(F_hourly, axis=-1) * 0.25 * coal_price
+
+    shape = (num_particles, num_units)
+    P_results = np.zeros((T, num_units))
+    iterations = np.zeros(T, dtype=int)
+    pbest_p = None
+
+    for t, load in enumerate(loads):
+        # 上一时段负荷不为正时无法按比例缩放，改为随机初始化
+        if warm_start and pbest_p is not None and loads[t - 1] > 0:
+            # 上一时段的个体最优位置按负荷比例缩放，叠加与负荷变化量相当的扰动以保持多样性，速度沿用上一时段
+            spread = max(abs(load - loads[t - 1]), 1e-3 * np.sum(P_max - P_min)) / num_units
+            particles_p = pbest_p * (load / loads[t - 1]) + rng.normal(0, spread, shape)
+        else:
+            particles_p = P_min + rng.random(shape) * (P_max - P_min)
+            particles_v = rng.uniform(-1, 1, shape) * (P_max - P_min) / 10.0
+        particles_p = project_to_feasible(particles_p, load, P_min, P_max)
+
+        pbest_p = particles_p.copy()
+        pbest_fitness = fitness(particles_p)
+        best = np.argmin(pbest_fitness)
+        gbest_p, gbest_fitness = pbest_p[best].copy(), pbest_fitness[best]
+
+        stall = 0
+        iteration = 0  # max_iter 为0时直接取初始粒子群的最优位置
+        for iteration in range(1, max_iter + 1):
+            # 更新粒子速度和位置，并投影到可行域
+            r1 = rng.random(shape)
+            r2 = rng.random(shape)
+            particles_v = w * particles_v + c1 * r1 * (pbest_p - particles_p) + c2 * r2 * (gbest_p - particles_p)
+            particles_p = project_to_feasible(np.clip(particles_p + particles_v, P_min, P_max), load, P_min, P_max)
+
+            # 更新个体最优和全局最优
+            current = fitness(particles_p)
+            improved = current < pbest_fitness
+            pbest_fitness = np.where(improved, current, pbest_fitness)
+            pbest_p = np.where(improved[:, None], particles_p, pbest_p)
+
+            best = np.argmin(pbest_fitness)
+            improvement = (gbest_fitness - pbest_fitness[best]) / max(abs(gbest_fitness), 1e-12)
+            gbest_p, gbest_fitness = pbest_p[best].copy(), pbest_fitness[best]
+
+            # 提前结束判断
+            stall = stall + 1 if improvement < tol else 0
+            if stall >= patience:
+                break
+
+        P_results[t] = gbest_p
+        iterations[t] = iteration
+
+    return P_results, iterations
+
+
 # ===================== 火电成本计算函数 =====================
 def calculate_thermal_cost(units, P_results, carbon_price):
     """
     计算火电总成本（包括运行成本和碳捕集成本）
-    :param units: 机组列表
-    :param P_results: 各机组出力结果（列表的列表）
+    :param units: 机组列表或 UnitFleet
+    :param P_results: 各机组出力结果（列表的列表或 (机组数, T) 数组）
     :param carbon_price: 碳捕集单价（元/吨）
     :return: (总运行成本, 总碳捕集成本) 单位：元
     """
-    total_fuel_cost = 0.0  # 煤耗成本（元）
-    total_om_cost = 0.0  # 运行维护成本（元） om——Operation and Maintenance（运行和维护）
-    total_carbon_cost = 0.0  # 碳捕集成本（元）
+    fleet = as_fleet(units)
+    P = np.asarray(P_results, dtype=float)  # (机组数, T)，单位MW
 
     # 煤价（元/kg）
     coal_price = 700 / 1000  # 700元/吨 = 0.7元/kg
 
-    # 遍历每个时间点（15分钟间隔）
-    for t in range(len(P_results[0])):
-        # 遍历每台机组
-        for i, unit in enumerate(units):
-            P = P_results[i][t]  # 机组在t时刻的出力（MW）
-
-            # 计算煤耗量（kg/h）
-            F_hourly = unit['a'] * P ** 2 + unit['b'] * P + unit['c']
-
-            # 15分钟的煤耗量（kg）
-            F_15min = F_hourly * 0.25
-
-            # 煤耗成本（元）
-            fuel_cost = F_15min * coal_price
-            total_fuel_cost += fuel_cost
+    # 各机组各时刻的煤耗量（kg/h），15分钟的煤耗量为其0.25倍
+    F_hourly = fleet.a[:, None] * P ** 2 + fleet.b[:, None] * P + fleet.c[:, None]
 
-            # 运行维护成本（元）= 0.5 * 煤耗成本
-            om_cost = 0.5 * fuel_cost
-            total_om_cost += om_cost
+    # 煤耗成本（元）
+    total_fuel_cost = np.sum(F_hourly * 0.25) * coal_price
 
-            # 计算发电量（MWh）
-            generation_mwh = P * 0.25  # MW × 0.25h = MWh
+    # 运行维护成本（元）= 0.5 * 煤耗成本  om——Operation and Maintenance（运行和维护）
+    total_om_cost = 0.5 * total_fuel_cost
 
-            # 计算碳排放量（kg）
-            carbon_emission = generation_mwh * 1000 * unit['emission']  # MWh × 1000 kWh/MWh × kg/kWh
+    # 碳排放量（kg）= 发电量（MWh） × 1000 kWh/MWh × 碳排放强度（kg/kWh）
+    carbon_emission = np.sum(fleet.emission * (P * 0.25).sum(axis=1)) * 1000
 
-            # 碳捕集成本（元）
-            carbon_cost = carbon_emission * (carbon_price / 1000)  # 碳捕集单价元/吨 = 元/1000kg
-            total_carbon_cost += carbon_cost
+    # 碳捕集成本（元）：碳捕集单价元/吨 = 元/1000kg
+    total_carbon_cost = carbon_emission * (carbon_price / 1000)
 
     # 总运行成本 = 煤耗成本 + 运行维护成本
     total_operation_cost = total_fuel_cost + total_om_cost
 
-    return total_operation_cost, total_carbon_cost
+    return float(total_operation_cost), float(total_carbon_cost)
+
+
+# ===================== 输入格式校验 =====================
+def check_fleet_inputs(units, loads, max_iter=5, num_particles=10, seed=0):
+    """
+    校验各PSO入口对机组字典列表和共享模块 UnitFleet 给出相同结果（相同随机种子下逐位一致）
+    :param units: 机组字典列表
+    :param loads: 用于校验的若干时刻负荷 (MW)
+    :return: 校验通过的入口名称列表
+    :raises ValueError: 任一入口在两种输入格式下的结果不一致
+    """
+    fleet = UnitFleet.from_units(units)
+    loads = np.asarray(loads, dtype=float)
+
+    def run_single(unit_input):
+        random.seed(seed)
+        return np.array([pso_economic_dispatch(load, unit_input, max_iter, num_particles, repair=True)
+                         for load in loads])
+
+    entries = {
+        'pso_economic_dispatch': run_single,
+        'pso_economic_dispatch_batch': lambda unit_input: pso_economic_dispatch_batch(
+            loads, unit_input, max_iter, num_particles, seed=seed, repair=True),
+        'pso_economic_dispatch_sequential': lambda unit_input: pso_economic_dispatch_sequential(
+            loads, unit_input, max_iter, num_particles, seed=seed)[0],
+        'calculate_thermal_cost': lambda unit_input: np.array(calculate_thermal_cost(
+            unit_input, np.tile(loads / len(units), (len(units), 1)), 60))
+    }
+    failed = [name for name, run in entries.items() if not np.array_equal(run(units), run(fleet))]
+    if failed:
+        raise ValueError(f"机组字典列表与 UnitFleet 输入的结果不一致：{failed}")
+    return list(entries)
 
 
 # ===================== 格式化数值为三位有效数字 =====================
@@ -199,17 +424,20 @@ def main():
     units = load_units_data()
     load_demand = load_demand_data()
 
+    # 校验共享模块的 UnitFleet 可直接传入各PSO入口
+    check_fleet_inputs(units, load_demand[:4])
+
     # 准备时间轴
     time_points = [f"{i // 4:02d}:{15 * (i % 4):02d}" for i in range(96)]
 
     # 初始化结果存储
     P_results = [[] for _ in range(len(units))]
 
-    # 使用PSO算法执行经济调度
-    for i, load in enumerate(load_demand):
-        P = pso_economic_dispatch(load, units)
-        for j in range(len(units)):
-            P_results[j].append(P[j])
+    # 使用PSO算法执行经济调度（全部96个时段的粒子群一起更新）
+    # 粒子每次更新后投影到可行域，功率严格平衡，较少的粒子和迭代次数即可收敛
+    P_matrix = pso_economic_dispatch_batch(load_demand, units, max_iter=30, num_particles=20, repair=True)
+    for j in range(len(units)):
+        P_results[j] = P_matrix[:, j].tolist()
 
     print("所有时段调度完成!")
 